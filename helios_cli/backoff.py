@@ -0,0 +1,42 @@
+"""Retrying requests the manager sheds under load."""
+
+import random
+import time
+from typing import Any, Callable, Optional
+
+# Rate limited (429) or overloaded (503); both carry Retry-After
+RETRY_STATUS_CODES = (429, 503)
+
+
+def retry_delay(response: Any, attempt: int, cap: float = 60.0) -> float:
+    """Seconds to wait before retrying a shed request.
+    
+    Honours ``Retry-After`` plus up to 50% jitter, so clients rejected
+    together do not all come back at the same moment. Without the header,
+    falls back to full-jitter exponential backoff.
+    """
+    try:
+        retry_after = float(response.headers.get("Retry-After"))
+    except (AttributeError, TypeError, ValueError):
+        return random.uniform(0, min(cap, 2 ** attempt))
+    return min(cap, retry_after) * random.uniform(1.0, 1.5)
+
+
+def request_with_backoff(
+    send: Callable[[], Any],
+    attempts: int = 8,
+    on_wait: Optional[Callable[[Any, float], None]] = None
+) -> Any:
+    """Call ``send`` until the response is not 429/503 or attempts run out.
+    
+    ``send`` must be safe to repeat, e.g. rewind any file it uploads.
+    """
+    for attempt in range(attempts):
+        response = send()
+        if response.status_code not in RETRY_STATUS_CODES or attempt == attempts - 1:
+            return response
+        delay = retry_delay(response, attempt)
+        if on_wait:
+            on_wait(response, delay)
+        time.sleep(delay)
+    return response
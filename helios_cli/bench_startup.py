@@ -0,0 +1,89 @@
+"""Startup-time check for the Helios CLI.
+
+Runs ``main.py --help`` under ``python -X importtime`` and fails when the
+cumulative import time exceeds the budget or when a module that should be
+imported lazily shows up. Intended to be run in CI next to the CLI::
+
+    python helios_cli/bench_startup.py --budget-ms 250
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Modules that must only be imported on the code paths that need them
+LAZY_MODULES = ("requests", "websockets", "pipreqs", "app", "bundle", "upload", "backoff")
+
+
+def measure_imports(runs: int) -> Tuple[float, Dict[str, int]]:
+    """Return the best total import time (ms) and per-module cumulative times (us)."""
+    main_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+    best_total = None
+    best_modules: Dict[str, int] = {}
+
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", main_path, "--help"],
+            capture_output=True,
+            text=True,
+            check=True
+        )
+
+        modules: Dict[str, int] = {}
+        total_us = 0
+        for line in result.stderr.splitlines():
+            # "import time: self [us] | cumulative | imported package"
+            if not line.startswith("import time:") or "cumulative" in line:
+                continue
+            _, cumulative, name = line[len("import time:"):].split("|")
+            depth = len(name) - len(name.lstrip())
+            name = name.strip()
+            modules[name] = int(cumulative)
+            if depth == 1:
+                total_us += int(cumulative)
+
+        if best_total is None or total_us < best_total:
+            best_total = total_us
+            best_modules = modules
+
+    return best_total / 1000.0, best_modules
+
+
+def main() -> int:
+    """Run the benchmark and report violations."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="maximum cumulative import time")
+    parser.add_argument("--runs", type=int, default=5, help="take the best of this many runs")
+    parser.add_argument("--top", type=int, default=10, help="show the slowest top-level imports")
+    args = parser.parse_args()
+
+    total_ms, modules = measure_imports(args.runs)
+
+    slowest: List[Tuple[str, int]] = sorted(
+        ((name, us) for name, us in modules.items() if "." not in name),
+        key=lambda item: item[1],
+        reverse=True
+    )[:args.top]
+    print(f"CLI import time: {total_ms:.1f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, us in slowest:
+        print(f"  {us / 1000.0:8.1f} ms  {name}")
+
+    failed = False
+    eager = sorted(
+        name for name in modules
+        if name.split(".")[0] in LAZY_MODULES
+    )
+    if eager:
+        print(f"FAIL: imported eagerly: {', '.join(eager[:10])}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print("FAIL: import time over budget")
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,430 @@
+"""Project packaging for the Helios CLI.
+
+Walks the project honouring ``.gitignore`` and ``.heliosignore`` files with
+git's matching rules, then writes a zip archive to a temporary location,
+deflating files on a thread pool (zlib releases the GIL) and storing
+already-compressed formats as-is.
+"""
+
+import os
+import re
+import shutil
+import struct
+import tempfile
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import BinaryIO, Deque, Dict, List, Optional, Pattern, Tuple
+
+IGNORE_FILES = (".gitignore", ".heliosignore")
+DEFAULT_IGNORE = (".git/", "__pycache__/", "*.pyc", ".DS_Store")
+
+# Formats whose contents are already compressed; deflating them again only burns CPU
+STORED_EXTENSIONS = frozenset({
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".lz4", ".zst", ".7z", ".rar",
+    ".whl", ".jar", ".npz", ".parquet", ".feather",
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".heic",
+    ".mp3", ".mp4", ".m4a", ".mkv", ".mov", ".avi", ".webm", ".ogg", ".flac",
+    ".pdf", ".docx", ".xlsx", ".pptx",
+})
+
+READ_BLOCK = 1024 * 1024
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+
+_SIZE_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+
+
+class PackagingError(Exception):
+    """Raised when the project cannot be packaged."""
+
+
+def parse_size(value: str) -> int:
+    """Parse a size such as ``512m`` or ``2g`` into bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([bkmgt]?)i?b?\s*", value.lower())
+    if not match:
+        raise ValueError(f"Invalid size: {value}")
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[unit])
+
+
+def format_size(size: int) -> str:
+    """Format a byte count for display."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024:
+            return f"{size:.0f}{unit}" if unit == "B" else f"{size:.1f}{unit}"
+        size /= 1024
+    return f"{size:.1f}TiB"
+
+
+# ---------------------------------------------------------------------------
+# Ignore rules
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class IgnoreRule:
+    """A single compiled ignore pattern."""
+    regex: Pattern[str]
+    negate: bool
+    dir_only: bool
+    base: str  # directory of the ignore file, relative to the project root
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        """Check a project-relative path against this rule."""
+        if self.dir_only and not is_dir:
+            return False
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+        return self.regex.match(rel_path) is not None
+
+
+def _translate_glob(pattern: str) -> str:
+    """Translate a gitignore glob into a regular expression body."""
+    out = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**/", i):
+                out.append("(?:.*/)?")
+                i += 3
+                continue
+            if pattern.startswith("**", i):
+                out.append(".*")
+                i += 2
+                continue
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            j = i + 1
+            if j < n and pattern[j] == "!":
+                j += 1
+            if j < n and pattern[j] == "]":
+                j += 1
+            j = pattern.find("]", j)
+            if j == -1:
+                out.append(re.escape(c))
+            else:
+                inner = pattern[i + 1:j].replace("\\", "\\\\")
+                if inner.startswith("!"):
+                    inner = "^" + inner[1:]
+                out.append(f"[{inner}]")
+                i = j
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def parse_ignore_line(line: str, base: str = "") -> Optional[IgnoreRule]:
+    """Compile one line of an ignore file, or return ``None`` for blanks and comments."""
+    line = line.rstrip("\n").rstrip("\r")
+    # Trailing spaces are ignored unless escaped
+    stripped = line.rstrip(" ")
+    if stripped.endswith("\\") and len(stripped) < len(line):
+        stripped += " "
+    line = stripped
+    if not line or line.startswith("#"):
+        return None
+
+    negate = line.startswith("!")
+    if negate:
+        line = line[1:]
+    elif line.startswith("\\#") or line.startswith("\\!"):
+        line = line[1:]
+
+    dir_only = line.endswith("/")
+    line = line.rstrip("/")
+    if not line:
+        return None
+
+    # A slash anywhere but the end anchors the pattern to the ignore file's directory
+    anchored = "/" in line
+    line = line.lstrip("/")
+    body = _translate_glob(line)
+    if not anchored:
+        body = "(?:.*/)?" + body
+
+    return IgnoreRule(re.compile(body + r"\Z", re.DOTALL), negate, dir_only, base)
+
+
+def load_ignore_rules(directory: str, base: str) -> List[IgnoreRule]:
+    """Load the ignore files present in a project directory."""
+    rules = []
+    for name in IGNORE_FILES:
+        path = os.path.join(directory, name)
+        if not os.path.isfile(path):
+            continue
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                rule = parse_ignore_line(line, base)
+                if rule is not None:
+                    rules.append(rule)
+    return rules
+
+
+def is_ignored(rules: List[IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    """Apply rules in order; the last matching rule decides."""
+    ignored = False
+    for rule in rules:
+        if rule.matches(rel_path, is_dir):
+            ignored = not rule.negate
+    return ignored
+
+
+def collect_files(project_path: str) -> List[Tuple[str, str, os.stat_result]]:
+    """List ``(absolute path, archive name, stat)`` for every file to package."""
+    root_rules = [parse_ignore_line(line) for line in DEFAULT_IGNORE]
+    rules_by_dir: Dict[str, List[IgnoreRule]] = {project_path: root_rules}
+    files = []
+
+    for dirpath, dirnames, filenames in os.walk(project_path):
+        rel_dir = os.path.relpath(dirpath, project_path).replace(os.sep, "/")
+        rel_dir = "" if rel_dir == "." else rel_dir
+        rules = rules_by_dir.pop(dirpath) + load_ignore_rules(dirpath, rel_dir)
+
+        kept_dirs = []
+        for name in sorted(dirnames):
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if not is_ignored(rules, rel_path, True):
+                kept_dirs.append(name)
+                rules_by_dir[os.path.join(dirpath, name)] = rules
+        # Pruning in place stops os.walk descending into ignored directories
+        dirnames[:] = kept_dirs
+
+        for name in sorted(filenames):
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            if is_ignored(rules, rel_path, False):
+                continue
+            abs_path = os.path.join(dirpath, name)
+            try:
+                st = os.stat(abs_path)
+            except OSError:
+                continue
+            files.append((abs_path, rel_path, st))
+
+    return files
+
+
+# ---------------------------------------------------------------------------
+# Zip writing
+# ---------------------------------------------------------------------------
+
+ZIP64_LIMIT = 0xFFFFFFFF
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+
+
+@dataclass
+class _CompressedEntry:
+    """Result of compressing one file on the thread pool."""
+    data: Optional[BinaryIO]  # None means "store the original file"
+    crc: int
+    size: int
+    compressed_size: int
+
+
+def _compress_file(path: str, level: int) -> _CompressedEntry:
+    """Deflate a file into a spooled buffer, falling back to stored if it does not shrink."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    crc = 0
+    size = 0
+    with open(path, "rb") as f:
+        while True:
+            block = f.read(READ_BLOCK)
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            size += len(block)
+            spool.write(compressor.compress(block))
+    spool.write(compressor.flush())
+
+    compressed_size = spool.tell()
+    if compressed_size >= size:
+        spool.close()
+        return _CompressedEntry(None, crc, size, size)
+
+    spool.seek(0)
+    return _CompressedEntry(spool, crc, size, compressed_size)
+
+
+def _dos_datetime(mtime: float) -> Tuple[int, int]:
+    """Convert a timestamp into zip's DOS date and time fields."""
+    t = time.localtime(max(mtime, 315532800))  # zip cannot represent dates before 1980
+    dos_time = (t.tm_hour << 11) | (t.tm_min << 5) | (t.tm_sec // 2)
+    dos_date = ((t.tm_year - 1980) << 9) | (t.tm_mon << 5) | t.tm_mday
+    return dos_date, dos_time
+
+
+class _ZipWriter:
+    """Minimal ZIP64-capable writer accepting pre-compressed entries.
+
+    ``zipfile`` can only compress data itself, one entry at a time, so
+    entries compressed in parallel are written with this writer instead.
+    """
+
+    def __init__(self, out: BinaryIO):
+        """Wrap a seekable binary output file."""
+        self.out = out
+        self.central: List[bytes] = []
+
+    def add(self, arcname: str, st: os.stat_result, method: int, crc: int, size: int,
+            compressed_size: int, source: BinaryIO) -> int:
+        """Write one entry, copying its data from ``source``; return the stored CRC."""
+        name = arcname.encode("utf-8")
+        dos_date, dos_time = _dos_datetime(st.st_mtime)
+        offset = self.out.tell()
+        zip64 = size >= ZIP64_LIMIT or compressed_size >= ZIP64_LIMIT
+        version = 45 if zip64 else 20
+        flags = 0x800  # UTF-8 names
+
+        extra = struct.pack("<HHQQ", 0x0001, 16, size, compressed_size) if zip64 else b""
+        header = struct.pack(
+            "<IHHHHHIIIHH", 0x04034B50, version, flags, method, dos_time, dos_date, crc,
+            ZIP64_LIMIT if zip64 else compressed_size, ZIP64_LIMIT if zip64 else size,
+            len(name), len(extra)
+        )
+        self.out.write(header + name + extra)
+
+        if method == ZIP_STORED:
+            # Stored data is copied straight from the source; patch the CRC afterwards
+            crc = 0
+            copied = 0
+            while True:
+                block = source.read(READ_BLOCK)
+                if not block:
+                    break
+                crc = zlib.crc32(block, crc)
+                copied += len(block)
+                self.out.write(block)
+            if copied != size:
+                raise PackagingError(f"File changed while packaging: {arcname}")
+            end = self.out.tell()
+            self.out.seek(offset + 14)
+            self.out.write(struct.pack("<I", crc))
+            self.out.seek(end)
+        else:
+            shutil.copyfileobj(source, self.out, READ_BLOCK)
+
+        central_extra_fields = []
+        if zip64:
+            central_extra_fields += [size, compressed_size]
+        if offset >= ZIP64_LIMIT:
+            central_extra_fields.append(offset)
+        central_extra = b""
+        if central_extra_fields:
+            central_extra = struct.pack(
+                f"<HH{len(central_extra_fields)}Q", 0x0001, 8 * len(central_extra_fields),
+                *central_extra_fields
+            )
+            version = 45
+        self.central.append(struct.pack(
+            "<IHHHHHHIIIHHHHHII", 0x02014B50, (3 << 8) | version, version, flags, method,
+            dos_time, dos_date, crc,
+            ZIP64_LIMIT if zip64 else compressed_size, ZIP64_LIMIT if zip64 else size,
+            len(name), len(central_extra), 0, 0, 0, (st.st_mode & 0xFFFF) << 16,
+            min(offset, ZIP64_LIMIT)
+        ) + name + central_extra)
+        return crc
+
+    def close(self) -> None:
+        """Write the central directory and end records."""
+        cd_offset = self.out.tell()
+        for record in self.central:
+            self.out.write(record)
+        cd_size = self.out.tell() - cd_offset
+        count = len(self.central)
+
+        if count >= 0xFFFF or cd_offset >= ZIP64_LIMIT or cd_size >= ZIP64_LIMIT:
+            zip64_end = self.out.tell()
+            self.out.write(struct.pack(
+                "<IQHHIIQQQQ", 0x06064B50, 44, 45, 45, 0, 0, count, count, cd_size, cd_offset
+            ))
+            self.out.write(struct.pack("<IIQI", 0x07064B50, 0, zip64_end, 1))
+            self.out.write(struct.pack(
+                "<IHHHHIIH", 0x06054B50, 0, 0, 0xFFFF, 0xFFFF, ZIP64_LIMIT, ZIP64_LIMIT, 0
+            ))
+        else:
+            self.out.write(struct.pack(
+                "<IHHHHIIH", 0x06054B50, 0, 0, count, count, cd_size, cd_offset, 0
+            ))
+
+
+@dataclass
+class ArchiveStats:
+    """Summary of a packaged project."""
+    files: int
+    size: int
+    archive_size: int
+    stored: int
+
+
+def build_archive(
+    project_path: str,
+    max_size: Optional[int] = None,
+    workers: Optional[int] = None,
+    level: int = 6,
+    output_dir: Optional[str] = None
+) -> Tuple[str, ArchiveStats]:
+    """Package a project into a temporary zip file and return its path."""
+    files = collect_files(project_path)
+
+    total = sum(st.st_size for _, _, st in files)
+    if max_size is not None and total > max_size:
+        largest = sorted(files, key=lambda item: item[2].st_size, reverse=True)[:5]
+        details = ", ".join(f"{name} ({format_size(st.st_size)})" for _, name, st in largest)
+        raise PackagingError(
+            f"Project is {format_size(total)}, over the {format_size(max_size)} limit. "
+            f"Largest files: {details}. Add them to .heliosignore or raise --max-size."
+        )
+
+    fd, zip_path = tempfile.mkstemp(prefix="helios-", suffix=".zip", dir=output_dir)
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    stored = 0
+
+    try:
+        with os.fdopen(fd, "wb") as out, ThreadPoolExecutor(max_workers=workers) as pool:
+            writer = _ZipWriter(out)
+            # Bounded look-ahead keeps at most ~2x workers compressed files in flight
+            pending: Deque[Tuple[str, str, os.stat_result, Optional[Future]]] = deque()
+
+            def drain_one() -> None:
+                nonlocal stored
+                abs_path, arcname, st, future = pending.popleft()
+                entry = future.result() if future is not None else None
+                if entry is None or entry.data is None:
+                    stored += 1
+                    with open(abs_path, "rb") as source:
+                        writer.add(arcname, st, ZIP_STORED, 0, st.st_size, st.st_size, source)
+                else:
+                    with entry.data:
+                        writer.add(arcname, st, ZIP_DEFLATED, entry.crc, entry.size,
+                                   entry.compressed_size, entry.data)
+
+            for abs_path, arcname, st in files:
+                ext = os.path.splitext(arcname)[1].lower()
+                future = None
+                if ext not in STORED_EXTENSIONS and st.st_size > 0:
+                    future = pool.submit(_compress_file, abs_path, level)
+                pending.append((abs_path, arcname, st, future))
+                if len(pending) >= workers * 2:
+                    drain_one()
+            while pending:
+                drain_one()
+
+            writer.close()
+            archive_size = out.tell()
+    except BaseException:
+        os.remove(zip_path)
+        raise
+
+    return zip_path, ArchiveStats(len(files), total, archive_size, stored)
@@ -1,33 +1,29 @@
-"""Helios CLI - Remote command execution client."""
+"""Helios CLI - Remote command execution client.
+
+Only what ``--help`` needs is imported at module level; ``requests``,
+``websockets`` and ``pipreqs`` are imported on the code paths that use
+them so the CLI starts quickly.
+"""
 
 import json
 import os
 import sys
-import zipfile
-from pathlib import Path
-from typing import Optional
+import time
+from typing import List, Optional
 
-import requests
 import typer
-import websockets
-from pipreqs import pipreqs
-
-# Import configuration from server module
-server_path = os.path.join(os.path.dirname(__file__), "..", "helios_server")
-if server_path not in sys.path:
-    sys.path.append(server_path)
 
 try:
-    from app.core.constants import TaskPriority, TaskSignals
+    from .protocol import EnvironmentStatus, TaskPriority, TaskSignals, WebSocketPaths
 except ImportError:
-    # Fallback definitions if server module is not available
-    class TaskPriority(str):
-        HIGH = "high"
-        DEFAULT = "default"
-    
-    class TaskSignals:
-        COMPLETE = "[HELIOS_TASK_COMPLETE]"
-        FAILED_PREFIX = "[HELIOS_TASK_FAILED"
+    # Running as a script: the CLI directory is on sys.path
+    from protocol import EnvironmentStatus, TaskPriority, TaskSignals, WebSocketPaths
+
+# Bundles larger than this are sent through a resumable chunked upload session
+CHUNKED_UPLOAD_THRESHOLD = 8 * 1024 * 1024
+
+# Consecutive failed status polls after which a pipeline watch gives up
+WATCH_MAX_FAILURES = 8
 
 
 class HeliosClient:
@@ -36,12 +32,54 @@ class HeliosClient:
     def __init__(self, manager_url: str):
         """Initialize client with manager URL."""
         self.manager_url = manager_url.rstrip("/")
-        self.session = requests.Session()
+        self._session = None
+        self._status_line = ""
+        self._status_parts = {}
+    
+    @property
+    def session(self):
+        """HTTP session, created on first use."""
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+    
+    def _print_log(self, message: str, err: bool = False) -> None:
+        """Print a log line without clobbering the live status line.
+        
+        ``err`` sends CLI notes to stderr so stdout carries only task output.
+        """
+        if self._status_line:
+            sys.stderr.write("\r\033[K")
+        print(message, file=sys.stderr if err else sys.stdout, flush=True)
+        if self._status_line:
+            sys.stderr.write(self._status_line)
+            sys.stderr.flush()
+    
+    def _set_status_line(self, text: str) -> None:
+        """Redraw the live status line on stderr."""
+        self._status_line = text
+        sys.stderr.write(f"\r\033[K{text}")
+        sys.stderr.flush()
+    
+    def _set_status_part(self, key: str, text: str) -> None:
+        """Update one section of a status line shared by several live feeds."""
+        self._status_parts[key] = text
+        self._set_status_line("  ".join(self._status_parts[k] for k in sorted(self._status_parts)))
+    
+    def _clear_status_line(self) -> None:
+        """Remove the live status line."""
+        self._status_parts = {}
+        if self._status_line:
+            self._status_line = ""
+            sys.stderr.write("\r\033[K")
+            sys.stderr.flush()
     
     def discover_dependencies(self, project_path: str) -> None:
         """Automatically discover project dependencies and generate requirements.txt."""
         try:
             typer.echo("🔍 正在分析项目依赖...")
+            from pipreqs import pipreqs
             pipreqs.init(
                 project_path,
                 encoding="utf-8",
@@ -71,36 +109,58 @@ class HeliosClient:
         except Exception as e:
             typer.echo(f"⚠️ 依赖分析警告: {e}", err=True)
     
-    def create_project_zip(self, project_path: str) -> str:
-        """Create a zip file of the project directory."""
-        typer.echo("📦 项目打包中...")
+    def prepare_environment(
+        self,
+        project_path: str,
+        priority: TaskPriority = TaskPriority.DEFAULT,
+        executor: Optional[str] = None
+    ) -> None:
+        """Send requirements.txt ahead of the project so the server installs it during upload."""
+        import requests
         
-        zip_path = os.path.join(project_path, "helios_project.zip")
+        try:
+            with open(os.path.join(project_path, "requirements.txt"), "rb") as f:
+                requirements = f.read().decode("utf-8")
+        except (OSError, UnicodeDecodeError):
+            return
+        
+        try:
+            response = self.session.post(
+                f"{self.manager_url}/api/v1/environments/prepare",
+                json={"requirements": requirements, "priority": priority, "executor": executor},
+                timeout=5
+            )
+            response.raise_for_status()
+            status = response.json().get("status")
+        except (requests.exceptions.RequestException, ValueError):
+            # Best effort only: the task installs its requirements itself
+            return
         
-        # Check for .gitignore to exclude files
-        gitignore_path = os.path.join(project_path, ".gitignore")
-        exclude_patterns = {".git", "__pycache__", "*.pyc", ".DS_Store"}
+        if status == EnvironmentStatus.READY:
+            typer.echo("⚡ 依赖环境已在服务器缓存中")
+        elif status == EnvironmentStatus.PREPARING:
+            typer.echo("⚡ 服务器已开始预装依赖 (与上传并行)")
+    
+    def create_project_zip(self, project_path: str, max_size: Optional[str] = None) -> str:
+        """Package the project into a temporary zip file and return its path."""
+        try:
+            from .bundle import PackagingError, build_archive, format_size, parse_size
+        except ImportError:
+            from bundle import PackagingError, build_archive, format_size, parse_size
         
-        if os.path.exists(gitignore_path):
-            with open(gitignore_path, "r") as f:
-                exclude_patterns.update(line.strip() for line in f if line.strip() and not line.startswith("#"))
+        typer.echo("📦 项目打包中...")
         
-        with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zipf:
-            for root, dirs, files in os.walk(project_path):
-                # Skip excluded directories
-                dirs[:] = [d for d in dirs if d not in exclude_patterns]
-                
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    # Skip excluded files
-                    if any(file.endswith(pattern.replace("*", "")) for pattern in exclude_patterns):
-                        continue
-                    
-                    # Calculate relative path from project_path
-                    arcname = os.path.relpath(file_path, project_path)
-                    zipf.write(file_path, arcname)
+        try:
+            size_limit = parse_size(max_size) if max_size else None
+            zip_path, stats = build_archive(project_path, max_size=size_limit)
+        except (PackagingError, ValueError) as e:
+            typer.echo(f"❌ 打包失败: {e}")
+            raise typer.Exit(1)
         
-        typer.echo("✅ 项目打包完成")
+        typer.echo(
+            f"✅ 项目打包完成 ({stats.files} 个文件, "
+            f"{format_size(stats.size)} → {format_size(stats.archive_size)})"
+        )
         return zip_path
     
     def submit_task(
@@ -110,9 +170,14 @@ class HeliosClient:
         priority: TaskPriority = TaskPriority.DEFAULT,
         name: Optional[str] = None,
         cpu_limit: Optional[int] = None,
-        mem_limit: Optional[str] = None
+        mem_limit: Optional[str] = None,
+        upload_streams: int = 4,
+        datasets: Optional[List[str]] = None,
+        executor: Optional[str] = None
     ) -> str:
         """Submit task to Helios manager."""
+        import requests
+        
         typer.echo("📤 正在上传任务...")
         
         # Prepare metadata
@@ -120,13 +185,19 @@ class HeliosClient:
             "entrypoint": entrypoint,
             "priority": priority,
             "name": name or f"helios-task-{os.path.basename(os.getcwd())}",
-            "resources": {}
+            "resources": {},
+            "datasets": datasets or []
         }
         
         if cpu_limit is not None:
             metadata["resources"]["cpu"] = cpu_limit
         if mem_limit is not None:
             metadata["resources"]["mem"] = mem_limit
+        if executor is not None:
+            metadata["executor"] = executor
+        
+        if os.path.getsize(zip_path) > CHUNKED_UPLOAD_THRESHOLD:
+            return self._submit_chunked(zip_path, metadata, upload_streams)
         
         # Prepare files for upload
         files = {
@@ -134,21 +205,18 @@ class HeliosClient:
             "metadata": (None, json.dumps(metadata), "application/json")
         }
         
-        try:
-            response = self.session.post(
+        def send():
+            files["file"][1].seek(0)
+            return self.session.post(
                 f"{self.manager_url}/api/v1/tasks/submit",
                 files=files,
                 timeout=30
             )
+        
+        try:
+            response = self._post_with_backoff(send)
             response.raise_for_status()
-            
-            result = response.json()
-            if result.get("success"):
-                typer.echo("✅ 任务提交成功")
-                return result.get("task_id")
-            else:
-                typer.echo(f"❌ 任务提交失败: {result.get('message', 'Unknown error')}")
-                raise typer.Exit(1)
+            return self._handle_submission(response.json())
                 
         except requests.exceptions.RequestException as e:
             typer.echo(f"❌ 网络错误: {e}")
@@ -159,17 +227,352 @@ class HeliosClient:
             else:
                 files["file"].close()
     
-    async def stream_logs(self, task_id: str) -> None:
-        """Stream real-time logs from the task."""
+    def _post_with_backoff(self, send):
+        """Send a submission, waiting out 429/503 responses from admission control."""
+        try:
+            from .backoff import request_with_backoff
+        except ImportError:
+            from backoff import request_with_backoff
+        
+        def report(response, delay: float) -> None:
+            try:
+                detail = response.json().get("detail", "")
+            except ValueError:
+                detail = ""
+            typer.echo(f"⏳ 服务器繁忙 ({response.status_code} {detail})，{delay:.0f}秒后重试...")
+        
+        return request_with_backoff(send, on_wait=report)
+    
+    def _handle_submission(self, result: dict) -> str:
+        """Return the task ID from a submission response or exit."""
+        if result.get("success"):
+            typer.echo("✅ 任务提交成功")
+            return result.get("task_id")
+        
+        typer.echo(f"❌ 任务提交失败: {result.get('message', 'Unknown error')}")
+        raise typer.Exit(1)
+    
+    def upload_chunked(self, path: str, upload_streams: int) -> str:
+        """Upload a file through a resumable chunked session and return its upload ID."""
+        try:
+            from .upload import ChunkedUploader
+        except ImportError:
+            from upload import ChunkedUploader
+        
+        uploader = ChunkedUploader(self.manager_url, streams=upload_streams)
+        started = time.monotonic()
+        
+        def show_progress(done: int, total: int) -> None:
+            elapsed = max(time.monotonic() - started, 1e-6)
+            self._set_status_line(
+                f"📤 {done / total:6.1%}  {done / 2 ** 20:.0f}/{total / 2 ** 20:.0f}MiB  "
+                f"{done / elapsed / 2 ** 20:.1f}MiB/s"
+            )
+        
+        try:
+            return uploader.upload(path, show_progress)
+        finally:
+            self._clear_status_line()
+    
+    def forget_upload(self, upload_id: str) -> None:
+        """Stop remembering an upload once the manager has consumed it."""
+        try:
+            from .upload import ChunkedUploader
+        except ImportError:
+            from upload import ChunkedUploader
+        
+        ChunkedUploader(self.manager_url).forget(upload_id)
+    
+    def _submit_chunked(self, zip_path: str, metadata: dict, upload_streams: int) -> str:
+        """Upload a large bundle in resumable parallel chunks, then submit it."""
+        import requests
+        
+        try:
+            from .upload import UploadError
+        except ImportError:
+            from upload import UploadError
+        
+        try:
+            upload_id = self.upload_chunked(zip_path, upload_streams)
+            
+            response = self.session.post(
+                f"{self.manager_url}/api/v1/uploads/{upload_id}/complete",
+                json={"metadata": metadata},
+                timeout=300
+            )
+            response.raise_for_status()
+            task_id = self._handle_submission(response.json())
+            self.forget_upload(upload_id)
+            return task_id
+        
+        except (UploadError, requests.exceptions.RequestException) as e:
+            typer.echo(f"❌ 上传失败: {e}")
+            typer.echo("💡 重新运行相同命令将从已上传的分块处继续")
+            raise typer.Exit(1)
+    
+    def push_dataset(self, name: str, path: str, upload_streams: int) -> dict:
+        """Package a directory and register it as a dataset on the manager."""
+        import requests
+        
+        try:
+            from .bundle import PackagingError, build_archive, format_size
+            from .upload import UploadError
+        except ImportError:
+            from bundle import PackagingError, build_archive, format_size
+            from upload import UploadError
+        
+        typer.echo(f"📦 正在打包数据集 {name}...")
+        zip_path = None
+        try:
+            # Datasets are mostly binary; favour speed over ratio
+            zip_path, stats = build_archive(path, level=1)
+            typer.echo(f"✅ 打包完成 ({stats.files} 个文件, {format_size(stats.archive_size)})")
+            
+            upload_id = self.upload_chunked(zip_path, upload_streams)
+            response = self.session.post(
+                f"{self.manager_url}/api/v1/datasets",
+                json={"name": name, "upload_id": upload_id},
+                timeout=600
+            )
+            response.raise_for_status()
+            self.forget_upload(upload_id)
+            return response.json()
+        
+        except PackagingError as e:
+            typer.echo(f"❌ 打包失败: {e}")
+            raise typer.Exit(1)
+        except (UploadError, requests.exceptions.RequestException) as e:
+            typer.echo(f"❌ 数据集上传失败: {e}")
+            raise typer.Exit(1)
+        finally:
+            if zip_path and os.path.exists(zip_path):
+                os.remove(zip_path)
+    
+    def submit_pipeline(self, zip_path: str, spec: dict, upload_streams: int = 4) -> dict:
+        """Submit a pipeline spec with the project bundle and return its state."""
+        import requests
+        
+        try:
+            from .upload import UploadError
+        except ImportError:
+            from upload import UploadError
+        
+        typer.echo("📤 正在上传流水线...")
+        try:
+            if os.path.getsize(zip_path) > CHUNKED_UPLOAD_THRESHOLD:
+                upload_id = self.upload_chunked(zip_path, upload_streams)
+                response = self.session.post(
+                    f"{self.manager_url}/api/v1/pipelines/from-upload/{upload_id}",
+                    json={"metadata": spec},
+                    timeout=300
+                )
+                response.raise_for_status()
+                self.forget_upload(upload_id)
+            else:
+                with open(zip_path, "rb") as f:
+                    def send():
+                        f.seek(0)
+                        return self.session.post(
+                            f"{self.manager_url}/api/v1/pipelines",
+                            files={
+                                "file": (os.path.basename(zip_path), f, "application/zip"),
+                                "metadata": (None, json.dumps(spec), "application/json")
+                            },
+                            timeout=60
+                        )
+                    
+                    response = self._post_with_backoff(send)
+                response.raise_for_status()
+        except UploadError as e:
+            typer.echo(f"❌ 上传失败: {e}")
+            typer.echo("💡 重新运行相同命令将从已上传的分块处继续")
+            raise typer.Exit(1)
+        except requests.exceptions.RequestException as e:
+            detail = e.response.text if getattr(e, "response", None) is not None else e
+            typer.echo(f"❌ 流水线提交失败: {detail}")
+            raise typer.Exit(1)
+        
+        pipeline = response.json()
+        typer.echo(f"✅ 流水线提交成功 (Pipeline ID: {pipeline['pipeline_id']})")
+        return pipeline
+    
+    def print_log_tail(self, task_id: str, lines: int = 20) -> None:
+        """Print the last lines of a task's archived log."""
+        try:
+            response = self.session.get(
+                f"{self.manager_url}/api/v1/tasks/{task_id}/logs",
+                params={"from_line": -lines},
+                timeout=30
+            )
+            response.raise_for_status()
+            for line in response.json()["lines"]:
+                typer.echo(f"    {line['text']}")
+        except Exception as e:
+            typer.echo(f"    (无法获取日志: {e})")
+    
+    def watch_pipeline(self, pipeline_id: str, interval: float = 2.0, stall_timeout: float = 0.0) -> str:
+        """Report stage transitions until the pipeline finishes; return its final status.
+        
+        Returns ``"stalled"`` when no stage changed for ``stall_timeout``
+        seconds (0 waits indefinitely), for example because a worker died
+        mid-stage, and ``"unknown"`` when the manager stays unreachable.
+        """
+        import requests
+        
+        try:
+            from .backoff import request_with_backoff, retry_delay
+        except ImportError:
+            from backoff import request_with_backoff, retry_delay
+        
+        labels = {
+            "pending": "⏳ {name} 排队中",
+            "running": "▶️  {name} 运行中 (节点 {node})",
+            "succeeded": "✅ {name} 完成",
+            "failed": "❌ {name} 失败",
+            "blocked": "⛔ {name} 已跳过 (上游阶段失败)",
+        }
+        seen = {}
+        failures = 0
+        last_change = time.monotonic()
+        
+        def fetch():
+            return self.session.get(f"{self.manager_url}/api/v1/pipelines/{pipeline_id}", timeout=30)
+        
+        while True:
+            try:
+                response = request_with_backoff(fetch)
+                response.raise_for_status()
+                pipeline = response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                status_code = getattr(getattr(e, "response", None), "status_code", None)
+                failures += 1
+                # Client errors such as 404 will not go away by asking again
+                if (status_code is not None and status_code < 500) or failures >= WATCH_MAX_FAILURES:
+                    typer.echo(f"❌ 无法获取流水线状态: {e}")
+                    return "unknown"
+                delay = retry_delay(None, failures)
+                typer.echo(f"⚠️ 获取流水线状态失败 ({e})，{delay:.0f}秒后重试...")
+                time.sleep(delay)
+                continue
+            failures = 0
+            
+            for stage in pipeline["stages"]:
+                key = (stage["status"], stage["task_id"])
+                if seen.get(stage["name"]) == key or stage["status"] not in labels:
+                    continue
+                seen[stage["name"]] = key
+                last_change = time.monotonic()
+                typer.echo(labels[stage["status"]].format(name=stage["name"], node=stage["node"] or "-"))
+                if stage["status"] == "failed" and stage["task_id"]:
+                    self.print_log_tail(stage["task_id"])
+            
+            if pipeline["status"] != "running":
+                return pipeline["status"]
+            if stall_timeout and time.monotonic() - last_change > stall_timeout:
+                typer.echo(f"⚠️ 已有{stall_timeout:.0f}秒没有阶段状态变化, 可能有Worker异常退出")
+                return "stalled"
+            time.sleep(interval)
+    
+    def _websocket_url(self, path: str) -> str:
+        """Build a WebSocket URL on the manager."""
+        websocket_url = self.manager_url.replace("http://", "ws://").replace("https://", "wss://")
+        return f"{websocket_url}{path}"
+    
+    @staticmethod
+    def format_resource_sample(sample: dict) -> str:
+        """Render a resource sample as a single status line."""
+        mem_mb = sample.get("mem_bytes", 0) / (1024 * 1024)
+        mem = f"{mem_mb:.0f}MiB"
+        if sample.get("mem_limit_bytes"):
+            mem += f"/{sample['mem_limit_bytes'] / (1024 * 1024):.0f}MiB"
+        io_mb = (sample.get("io_read_bytes", 0) + sample.get("io_write_bytes", 0)) / (1024 * 1024)
+        line = f"📈 CPU {sample.get('cpu_percent', 0):.0f}% | 内存 {mem} | IO {io_mb:.1f}MiB"
+        if sample.get("throttled_periods"):
+            line += f" | 限流 {sample['throttled_periods']:.0f}次"
+        return line
+    
+    async def stream_stats(self, task_id: str) -> None:
+        """Show live container resource samples on the status line."""
+        import websockets
+        
+        try:
+            async with websockets.connect(self._websocket_url(f"{WebSocketPaths.STATS}{task_id}")) as websocket:
+                async for message in websocket:
+                    self._set_status_part("resources", self.format_resource_sample(json.loads(message)))
+        except Exception:
+            # Resource display is best effort and must not disturb the logs
+            pass
+    
+    @staticmethod
+    def format_progress(progress: Optional[dict], latest: dict) -> str:
+        """Render task progress and the latest metric values as a status line."""
+        parts = []
+        if progress:
+            current = progress.get("current", 0)
+            total = progress.get("total")
+            if total:
+                fraction = max(0.0, min(1.0, current / total))
+                filled = int(fraction * 20)
+                parts.append(f"⏳ [{'█' * filled}{'░' * (20 - filled)}] {fraction:6.1%} {current:g}/{total:g}")
+            else:
+                parts.append(f"⏳ {current:g}")
+            if progress.get("message"):
+                parts.append(progress["message"])
+        # Only the most recently updated metrics fit on one line
+        for name in list(latest)[-3:]:
+            parts.append(f"{name}={latest[name]:.4g}")
+        return " | ".join(parts)
+    
+    async def stream_metrics(self, task_id: str) -> None:
+        """Show progress and metrics reported by the task on the status line."""
+        import websockets
+        
+        progress = None
+        latest = {}
+        try:
+            async with websockets.connect(self._websocket_url(f"{WebSocketPaths.METRICS}{task_id}")) as websocket:
+                async for message in websocket:
+                    event = json.loads(message)
+                    if event.get("type") == "progress":
+                        progress = event
+                    elif event.get("type") == "metric":
+                        latest.pop(event["name"], None)
+                        latest[event["name"]] = event["value"]
+                    self._set_status_part("progress", self.format_progress(progress, latest))
+        except Exception:
+            # Progress display is best effort and must not disturb the logs
+            pass
+    
+    async def stream_logs(
+        self,
+        task_id: str,
+        show_resources: bool = False,
+        started_at: Optional[float] = None
+    ) -> None:
+        """Stream real-time logs from the task.
+        
+        With ``started_at`` (a ``time.monotonic()`` reading taken when the
+        command started), the time until the task's first output is shown.
+        """
+        import asyncio
+        import websockets
+        
         typer.echo(f"🔄 连接到实时日志流 (Task ID: {task_id})...")
         
+        metrics_task = asyncio.create_task(self.stream_metrics(task_id))
+        stats_task = None
+        if show_resources:
+            stats_task = asyncio.create_task(self.stream_stats(task_id))
+        
         try:
-            websocket_url = self.manager_url.replace("http://", "ws://").replace("https://", "wss://")
-            async with websockets.connect(f"{websocket_url}/ws/logs/{task_id}") as websocket:
+            async with websockets.connect(self._websocket_url(f"{WebSocketPaths.LOGS}{task_id}")) as websocket:
                 typer.echo("✅ 已连接到日志流")
                 typer.echo("=" * 50)
                 
                 async for message in websocket:
+                    if message == TaskSignals.COMPLETE or message.startswith(TaskSignals.FAILED_PREFIX):
+                        self._clear_status_line()
+                    
                     if message == TaskSignals.COMPLETE:
                         typer.echo("=" * 50)
                         typer.echo("✅ 任务执行完成")
@@ -179,12 +582,20 @@ class HeliosClient:
                         typer.echo(f"❌ 任务执行失败: {message}")
                         break
                     else:
-                        print(message)
+                        if started_at is not None:
+                            self._print_log(f"⏱️ 首次输出耗时 {time.monotonic() - started_at:.1f} 秒", err=True)
+                            started_at = None
+                        self._print_log(message)
                         
         except websockets.exceptions.ConnectionClosed:
             typer.echo("🔌 连接已断开")
         except Exception as e:
             typer.echo(f"❌ 日志流错误: {e}")
+        finally:
+            metrics_task.cancel()
+            if stats_task is not None:
+                stats_task.cancel()
+            self._clear_status_line()
 
 
 app = typer.Typer(
@@ -232,6 +643,34 @@ def remote_run(
         "--manager-url",
         "-u",
         help="Helios Manager URL"
+    ),
+    upload_streams: int = typer.Option(
+        4,
+        "--upload-streams",
+        help="大项目分块上传的并行连接数"
+    ),
+    max_size: str = typer.Option(
+        "2g",
+        "--max-size",
+        help="项目打包前的最大总大小 (例如: 500m, 2g)"
+    ),
+    show_resources: bool = typer.Option(
+        False,
+        "--show-resources",
+        "-r",
+        help="实时显示容器资源占用 (CPU、内存、IO、限流)"
+    ),
+    datasets: Optional[List[str]] = typer.Option(
+        None,
+        "--dataset",
+        "-d",
+        help="挂载已注册的数据集 (只读, 位于 /datasets/<名称>)，可重复指定"
+    ),
+    executor: Optional[str] = typer.Option(
+        None,
+        "--executor",
+        "-e",
+        help="执行方式: docker 或 subprocess (缓存虚拟环境, 启动更快, 仅限可信任务)，默认由队列决定"
     )
 ):
     """在远程服务器上执行指定的脚本."""
@@ -241,13 +680,17 @@ def remote_run(
     
     # Get current working directory
     project_path = os.getcwd()
+    zip_path = None
+    
+    started_at = time.monotonic()
     
     try:
-        # Step 1: Discover dependencies
+        # Step 1: Discover dependencies and let the server start installing them
         client.discover_dependencies(project_path)
+        client.prepare_environment(project_path, priority, executor)
         
         # Step 2: Create project zip
-        zip_path = client.create_project_zip(project_path)
+        zip_path = client.create_project_zip(project_path, max_size)
         
         # Step 3: Submit task
         task_id = client.submit_task(
@@ -256,12 +699,15 @@ def remote_run(
             priority,
             name,
             cpu_limit,
-            mem_limit
+            mem_limit,
+            upload_streams,
+            datasets,
+            executor
         )
         
         # Step 4: Stream logs
         import asyncio
-        asyncio.run(client.stream_logs(task_id))
+        asyncio.run(client.stream_logs(task_id, show_resources, started_at))
         
     except KeyboardInterrupt:
         typer.echo("\n👋 用户中断操作")
@@ -271,9 +717,156 @@ def remote_run(
         raise typer.Exit(1)
     finally:
         # Clean up zip file
-        if os.path.exists(zip_path):
+        if zip_path and os.path.exists(zip_path):
             os.remove(zip_path)
 
 
+def _finish_pipeline(client: HeliosClient, pipeline_id: str, stall_timeout: float) -> None:
+    """Follow a pipeline to completion and exit non-zero if it failed."""
+    status = client.watch_pipeline(pipeline_id, stall_timeout=stall_timeout)
+    typer.echo("=" * 50)
+    if status == "succeeded":
+        typer.echo("✅ 流水线执行完成")
+        return
+    if status in ("stalled", "unknown"):
+        typer.echo("⚠️ 已停止跟踪, 流水线可能仍在服务器上执行")
+        typer.echo(f"💡 确认卡住的阶段已失败后可重跑: remote-run pipeline-retry {pipeline_id}")
+        raise typer.Exit(1)
+    typer.echo("❌ 流水线执行失败")
+    typer.echo(f"💡 修复后可只重跑失败阶段及其下游: remote-run pipeline-retry {pipeline_id}")
+    raise typer.Exit(1)
+
+
+@app.command("pipeline")
+def run_pipeline(
+    spec_path: str = typer.Argument("helios-pipeline.json", help="流水线定义文件 (JSON)"),
+    manager_url: str = typer.Option(
+        "http://localhost:8000",
+        "--manager-url",
+        "-u",
+        help="Helios Manager URL"
+    ),
+    upload_streams: int = typer.Option(
+        4,
+        "--upload-streams",
+        help="大项目分块上传的并行连接数"
+    ),
+    max_size: str = typer.Option(
+        "2g",
+        "--max-size",
+        help="项目打包前的最大总大小 (例如: 500m, 2g)"
+    ),
+    wait: bool = typer.Option(
+        True,
+        "--wait/--no-wait",
+        help="等待流水线执行完成"
+    ),
+    stall_timeout: float = typer.Option(
+        7200.0,
+        "--stall-timeout",
+        help="阶段状态超过该秒数无变化时停止跟踪 (0 表示一直等待)"
+    )
+):
+    """提交多阶段流水线, 各阶段共享同一工作目录."""
+    
+    try:
+        with open(spec_path, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+    except (OSError, ValueError) as e:
+        typer.echo(f"❌ 无法读取流水线定义: {e}")
+        raise typer.Exit(1)
+    spec.setdefault("name", f"helios-pipeline-{os.path.basename(os.getcwd())}")
+    
+    client = HeliosClient(manager_url)
+    project_path = os.getcwd()
+    zip_path = None
+    
+    try:
+        client.discover_dependencies(project_path)
+        zip_path = client.create_project_zip(project_path, max_size)
+        pipeline = client.submit_pipeline(zip_path, spec, upload_streams)
+    finally:
+        if zip_path and os.path.exists(zip_path):
+            os.remove(zip_path)
+    
+    if wait:
+        try:
+            _finish_pipeline(client, pipeline["pipeline_id"], stall_timeout)
+        except KeyboardInterrupt:
+            typer.echo("\n👋 已停止跟踪, 流水线仍在服务器上继续执行")
+            raise typer.Exit(1)
+
+
+@app.command("pipeline-retry")
+def retry_pipeline(
+    pipeline_id: str = typer.Argument(..., help="流水线ID"),
+    manager_url: str = typer.Option(
+        "http://localhost:8000",
+        "--manager-url",
+        "-u",
+        help="Helios Manager URL"
+    ),
+    stall_timeout: float = typer.Option(
+        7200.0,
+        "--stall-timeout",
+        help="阶段状态超过该秒数无变化时停止跟踪 (0 表示一直等待)"
+    )
+):
+    """重新执行流水线中失败的阶段及其下游阶段."""
+    
+    client = HeliosClient(manager_url)
+    response = client.session.post(f"{client.manager_url}/api/v1/pipelines/{pipeline_id}/retry", timeout=60)
+    if response.status_code != 200:
+        typer.echo(f"❌ 重试失败: {response.json().get('detail', response.text)}")
+        raise typer.Exit(1)
+    
+    typer.echo("🔁 正在重新执行失败的阶段...")
+    _finish_pipeline(client, pipeline_id, stall_timeout)
+
+
+@app.command("dataset-push")
+def dataset_push(
+    name: str = typer.Argument(..., help="数据集名称"),
+    path: str = typer.Argument(..., help="数据集目录"),
+    manager_url: str = typer.Option(
+        "http://localhost:8000",
+        "--manager-url",
+        "-u",
+        help="Helios Manager URL"
+    ),
+    upload_streams: int = typer.Option(
+        4,
+        "--upload-streams",
+        help="分块上传的并行连接数"
+    )
+):
+    """上传并注册数据集, 之后可通过 --dataset 挂载到任务中."""
+    
+    client = HeliosClient(manager_url)
+    dataset = client.push_dataset(name, os.path.abspath(path), upload_streams)
+    typer.echo(f"✅ 数据集 {dataset['name']} 已注册 (版本 {dataset['version']})")
+
+
+@app.command("datasets")
+def list_datasets(
+    manager_url: str = typer.Option(
+        "http://localhost:8000",
+        "--manager-url",
+        "-u",
+        help="Helios Manager URL"
+    )
+):
+    """列出已注册的数据集."""
+    
+    client = HeliosClient(manager_url)
+    response = client.session.get(f"{client.manager_url}/api/v1/datasets", timeout=30)
+    response.raise_for_status()
+    
+    for dataset in response.json():
+        size_gb = dataset["size"] / 1024 ** 3
+        nodes = ", ".join(dataset["nodes"]) or "-"
+        typer.echo(f"{dataset['name']:<24} {dataset['version']:<14} {size_gb:8.2f}GiB  缓存节点: {nodes}")
+
+
 if __name__ == "__main__":
     app()
\ No newline at end of file
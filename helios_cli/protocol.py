@@ -0,0 +1,35 @@
+"""Protocol constants shared with the Helios manager.
+
+Kept as a standalone copy of the relevant parts of
+``helios_server/app/core/constants.py`` so the CLI never imports server
+code. Keep both in sync when the wire protocol changes.
+"""
+
+from enum import Enum
+
+
+class TaskPriority(str, Enum):
+    """Task priority enumeration."""
+    HIGH = "high"
+    DEFAULT = "default"
+
+
+class EnvironmentStatus(str, Enum):
+    """State of a requested environment prefetch."""
+    EMPTY = "empty"
+    READY = "ready"
+    PREPARING = "preparing"
+    SKIPPED = "skipped"
+
+
+class TaskSignals:
+    """Task completion signals."""
+    COMPLETE = "[HELIOS_TASK_COMPLETE]"
+    FAILED_PREFIX = "[HELIOS_TASK_FAILED"
+
+
+class WebSocketPaths:
+    """Manager WebSocket endpoints."""
+    LOGS = "/ws/logs/"
+    STATS = "/ws/stats/"
+    METRICS = "/ws/metrics/"
@@ -0,0 +1,7 @@
+"""Shared setup for Helios CLI tests."""
+
+import sys
+from pathlib import Path
+
+# Add the CLI directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -0,0 +1,155 @@
+"""Tests for project packaging: ignore rules and the zip writer."""
+
+import io
+import os
+import zipfile
+
+import pytest
+
+from bundle import (
+    PackagingError,
+    ZIP_STORED,
+    _ZipWriter,
+    build_archive,
+    collect_files,
+    format_size,
+    is_ignored,
+    parse_ignore_line,
+    parse_size,
+)
+
+
+def rules(*lines, base=""):
+    """Compile ignore file lines, dropping blanks and comments."""
+    return [rule for rule in (parse_ignore_line(line, base) for line in lines) if rule is not None]
+
+
+def write(root, rel_path, data=b"x"):
+    """Create a file under the project root."""
+    path = root / rel_path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+
+
+@pytest.mark.parametrize("line, rel_path, is_dir, ignored", [
+    ("*.log", "app.log", False, True),
+    ("*.log", "deep/dir/app.log", False, True),
+    ("*.log", "app.log.txt", False, False),
+    ("build/", "build", True, True),
+    ("build/", "build", False, False),
+    ("build/", "src/build", True, True),
+    ("/build", "src/build", True, False),
+    ("docs/*.md", "docs/a.md", False, True),
+    ("docs/*.md", "docs/sub/a.md", False, False),
+    ("docs/*.md", "x/docs/a.md", False, False),
+    ("**/cache", "a/b/cache", True, True),
+    ("data/**", "data/a/b.csv", False, True),
+    ("a/**/b", "a/b", False, True),
+    ("a/**/b", "a/x/y/b", False, True),
+    ("file?.txt", "file1.txt", False, True),
+    ("file?.txt", "file10.txt", False, False),
+    ("[!a]bc", "xbc", False, True),
+    ("[!a]bc", "abc", False, False),
+    ("\\#notes", "#notes", False, True),
+    ("trailing   ", "trailing", False, True),
+])
+def test_ignore_patterns(line, rel_path, is_dir, ignored):
+    assert is_ignored(rules(line), rel_path, is_dir) is ignored
+
+
+def test_blank_lines_and_comments_are_skipped():
+    assert rules("", "   ", "# comment", "/") == []
+
+
+def test_last_matching_rule_wins():
+    compiled = rules("*.log", "!keep.log")
+    assert is_ignored(compiled, "drop.log", False)
+    assert not is_ignored(compiled, "keep.log", False)
+    assert is_ignored(compiled + rules("keep.log"), "keep.log", False)
+
+
+def test_nested_rules_apply_below_their_directory():
+    compiled = rules("/out", base="pkg")
+    assert is_ignored(compiled, "pkg/out", True)
+    assert not is_ignored(compiled, "out", True)
+    assert not is_ignored(compiled, "pkg/sub/out", True)
+
+
+def test_collect_files_honours_ignore_files(tmp_path):
+    write(tmp_path, ".gitignore", b"*.log\nbuild/\n")
+    write(tmp_path, ".heliosignore", b"!keep.log\n")
+    write(tmp_path, "main.py")
+    write(tmp_path, "drop.log")
+    write(tmp_path, "keep.log")
+    write(tmp_path, "build/out.bin")
+    write(tmp_path, "__pycache__/main.cpython-311.pyc")
+    write(tmp_path, "pkg/.gitignore", b"/local.txt\n")
+    write(tmp_path, "pkg/local.txt")
+    write(tmp_path, "pkg/sub/local.txt")
+
+    names = [name for _, name, _ in collect_files(str(tmp_path))]
+    assert names == [".gitignore", ".heliosignore", "keep.log", "main.py", "pkg/.gitignore", "pkg/sub/local.txt"]
+
+
+def test_build_archive_round_trip(tmp_path):
+    project = tmp_path / "project"
+    write(project, "main.py", b"print('hi')\n" * 1000)
+    write(project, "image.png", os.urandom(2048))
+    write(project, "empty.txt", b"")
+    write(project, "data/noise.bin", os.urandom(4096))
+    write(project, "名前.txt", "unicode".encode("utf-8"))
+
+    zip_path, stats = build_archive(str(project), workers=2, output_dir=str(tmp_path))
+    try:
+        with zipfile.ZipFile(zip_path) as zf:
+            assert zf.testzip() is None
+            for name in ("main.py", "image.png", "empty.txt", "data/noise.bin", "名前.txt"):
+                assert zf.read(name) == (project / name).read_bytes()
+            assert zf.getinfo("main.py").compress_type == zipfile.ZIP_DEFLATED
+            assert zf.getinfo("image.png").compress_type == zipfile.ZIP_STORED
+        assert stats.files == 5
+        # png by extension; empty, random and tiny files do not shrink when deflated
+        assert stats.stored == 4
+        assert stats.archive_size == os.path.getsize(zip_path)
+    finally:
+        os.remove(zip_path)
+
+
+def test_build_archive_over_max_size(tmp_path):
+    write(tmp_path, "big.bin", b"x" * 100)
+    with pytest.raises(PackagingError, match="big.bin"):
+        build_archive(str(tmp_path), max_size=10)
+
+
+def test_zip64_end_records_for_many_entries(tmp_path):
+    write(tmp_path, "f")
+    st = os.stat(tmp_path / "f")
+    out = io.BytesIO()
+    writer = _ZipWriter(out)
+    count = 0xFFFF + 1
+    for index in range(count):
+        writer.add(f"{index}", st, ZIP_STORED, 0, 0, 0, io.BytesIO())
+    writer.close()
+
+    out.seek(0)
+    with zipfile.ZipFile(out) as zf:
+        assert len(zf.infolist()) == count
+        assert zf.read("65535") == b""
+
+
+def test_stored_entry_detects_changed_file(tmp_path):
+    write(tmp_path, "f", b"abc")
+    st = os.stat(tmp_path / "f")
+    writer = _ZipWriter(io.BytesIO())
+    with pytest.raises(PackagingError):
+        writer.add("f", st, ZIP_STORED, 0, 5, 5, io.BytesIO(b"abc"))
+
+
+def test_sizes():
+    assert parse_size("512m") == 512 * 1024 ** 2
+    assert parse_size("1.5GiB") == int(1.5 * 1024 ** 3)
+    assert parse_size("100") == 100
+    with pytest.raises(ValueError):
+        parse_size("lots")
+    assert format_size(512) == "512B"
+    assert format_size(1536) == "1.5KiB"
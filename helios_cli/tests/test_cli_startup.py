@@ -0,0 +1,26 @@
+"""Startup-time checks for the CLI, run through ``bench_startup``."""
+
+import pytest
+
+from bench_startup import LAZY_MODULES, measure_imports
+
+# Same budget as the documented ``bench_startup.py`` default
+BUDGET_MS = 250.0
+
+
+@pytest.fixture(scope="module")
+def imports():
+    """Best-of-three import profile of ``main.py --help``."""
+    pytest.importorskip("typer")
+    return measure_imports(3)
+
+
+def test_heavy_modules_are_imported_lazily(imports):
+    _, modules = imports
+    eager = sorted(name for name in modules if name.split(".")[0] in LAZY_MODULES)
+    assert eager == []
+
+
+def test_import_time_within_budget(imports):
+    total_ms, _ = imports
+    assert total_ms <= BUDGET_MS
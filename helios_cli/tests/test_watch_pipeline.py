@@ -0,0 +1,94 @@
+"""Tests for following a pipeline until it finishes, stalls or is lost."""
+
+import pytest
+import requests
+
+import main
+from main import HeliosClient
+
+
+class FakeResponse:
+    """Minimal stand-in for a ``requests`` response."""
+
+    def __init__(self, status_code, body=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} Error", response=self)
+
+    def json(self):
+        return self.body
+
+
+class FakeSession:
+    """Session replaying one scripted result per GET."""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.calls = 0
+
+    def get(self, url, timeout=None):
+        self.calls += 1
+        result = self.results.pop(0) if len(self.results) > 1 else self.results[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def pipeline(status, *stages):
+    """Pipeline response body with ``(name, status)`` stages."""
+    return FakeResponse(200, {
+        "status": status,
+        "stages": [
+            {"name": name, "status": stage_status, "task_id": None, "node": None}
+            for name, stage_status in stages
+        ],
+    })
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Client whose sleeps return immediately."""
+    monkeypatch.setattr(main.time, "sleep", lambda seconds: None)
+    return HeliosClient("http://manager")
+
+
+def test_returns_final_status(client):
+    client._session = FakeSession([
+        pipeline("running", ("a", "running")),
+        pipeline("succeeded", ("a", "succeeded")),
+    ])
+    assert client.watch_pipeline("p1") == "succeeded"
+
+
+def test_request_errors_are_retried(client):
+    client._session = FakeSession([
+        requests.exceptions.ConnectionError("refused"),
+        FakeResponse(502),
+        FakeResponse(503),
+        pipeline("failed", ("a", "failed")),
+    ])
+    assert client.watch_pipeline("p1") == "failed"
+    assert client._session.calls == 4
+
+
+def test_gives_up_when_manager_stays_unreachable(client):
+    client._session = FakeSession([requests.exceptions.ConnectionError("refused")])
+    assert client.watch_pipeline("p1") == "unknown"
+    assert client._session.calls == main.WATCH_MAX_FAILURES
+
+
+def test_client_errors_are_not_retried(client):
+    client._session = FakeSession([FakeResponse(404)])
+    assert client.watch_pipeline("p1") == "unknown"
+    assert client._session.calls == 1
+
+
+def test_stalled_stage_stops_watch(client, monkeypatch):
+    clock = iter(range(0, 10000, 100))
+    monkeypatch.setattr(main.time, "monotonic", lambda: next(clock))
+    client._session = FakeSession([pipeline("running", ("a", "running"))])
+    assert client.watch_pipeline("p1", stall_timeout=250) == "stalled"
@@ -0,0 +1,189 @@
+"""Resumable, parallel chunked uploads to the Helios manager."""
+
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, Optional
+
+import requests
+
+try:
+    from .backoff import RETRY_STATUS_CODES, request_with_backoff, retry_delay
+except ImportError:
+    from backoff import RETRY_STATUS_CODES, request_with_backoff, retry_delay
+
+DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+STATE_PATH = os.path.join(os.path.expanduser("~"), ".helios", "uploads.json")
+
+
+class UploadError(Exception):
+    """Raised when an upload cannot be completed."""
+
+
+def file_sha256(path: str) -> str:
+    """Hash a file in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ChunkedUploader:
+    """Uploads a file in fixed-size chunks over several parallel streams.
+
+    The upload ID is remembered in ``~/.helios/uploads.json`` keyed by the
+    file's SHA-256, so re-running after an interruption only sends the
+    chunks the manager has not acknowledged yet.
+    """
+
+    def __init__(
+        self,
+        manager_url: str,
+        streams: int = 4,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        retries: int = 5,
+        state_path: str = STATE_PATH
+    ):
+        """Initialize uploader for a manager."""
+        self.manager_url = manager_url.rstrip("/")
+        self.streams = max(1, streams)
+        self.chunk_size = chunk_size
+        self.retries = retries
+        self.state_path = state_path
+        self._local = threading.local()
+        self._state_lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """Per-thread HTTP session; ``requests.Session`` is not thread-safe."""
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def _load_state(self) -> Dict[str, str]:
+        """Read remembered upload IDs."""
+        try:
+            with open(self.state_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state: Dict[str, str]) -> None:
+        """Persist remembered upload IDs."""
+        os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+        tmp_path = f"{self.state_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.state_path)
+
+    def _state_key(self, sha256: str) -> str:
+        """Key identifying a file on this manager."""
+        return f"{self.manager_url}|{sha256}"
+
+    def remember(self, sha256: str, upload_id: str) -> None:
+        """Store the upload ID used for a file."""
+        with self._state_lock:
+            state = self._load_state()
+            state[self._state_key(sha256)] = upload_id
+            self._save_state(state)
+
+    def forget(self, upload_id: str) -> None:
+        """Drop a remembered upload once it has been submitted."""
+        with self._state_lock:
+            state = self._load_state()
+            remaining = {key: value for key, value in state.items() if value != upload_id}
+            if len(remaining) != len(state):
+                self._save_state(remaining)
+
+    def _open_session(self, path: str, sha256: str) -> dict:
+        """Resume the remembered upload session for a file or create a new one."""
+        upload_id = self._load_state().get(self._state_key(sha256))
+        if upload_id:
+            response = self.session.get(f"{self.manager_url}/api/v1/uploads/{upload_id}", timeout=30)
+            if response.status_code == 200:
+                return response.json()
+
+        # Creating a session is admission controlled; wait out 429/503
+        response = request_with_backoff(lambda: self.session.post(
+            f"{self.manager_url}/api/v1/uploads",
+            json={
+                "filename": os.path.basename(path),
+                "total_size": os.path.getsize(path),
+                "chunk_size": self.chunk_size,
+            },
+            timeout=30
+        ))
+        response.raise_for_status()
+        session = response.json()
+        self.remember(sha256, session["upload_id"])
+        return session
+
+    def _send_chunk(self, path: str, upload_id: str, index: int, chunk_size: int) -> int:
+        """Send one chunk, retrying transient failures with jittered backoff."""
+        with open(path, "rb") as f:
+            f.seek(index * chunk_size)
+            data = f.read(chunk_size)
+        checksum = hashlib.sha256(data).hexdigest()
+
+        for attempt in range(self.retries + 1):
+            try:
+                response = self.session.put(
+                    f"{self.manager_url}/api/v1/uploads/{upload_id}/chunks/{index}",
+                    data=data,
+                    headers={
+                        "Content-Type": "application/octet-stream",
+                        "X-Chunk-SHA256": checksum,
+                    },
+                    timeout=(10, 300)
+                )
+                if response.status_code in RETRY_STATUS_CODES and attempt < self.retries:
+                    time.sleep(retry_delay(response, attempt))
+                    continue
+                # 4xx other than 429 will not succeed on retry
+                if 400 <= response.status_code < 500 and response.status_code != 429:
+                    raise UploadError(f"Chunk {index} rejected: {response.text}")
+                response.raise_for_status()
+                return len(data)
+            except requests.exceptions.RequestException as e:
+                if attempt == self.retries:
+                    raise UploadError(f"Chunk {index} failed after {attempt + 1} attempts: {e}")
+                time.sleep(random.uniform(0, min(30.0, 2 ** attempt)))
+        return 0
+
+    def upload(self, path: str, progress: Optional[Callable[[int, int], None]] = None) -> str:
+        """Upload a file and return its upload ID, ready to be completed."""
+        sha256 = file_sha256(path)
+        session = self._open_session(path, sha256)
+
+        upload_id = session["upload_id"]
+        chunk_size = session["chunk_size"]
+        total_size = session["total_size"]
+        received = set(session["received_chunks"])
+        missing: List[int] = [i for i in range(session["total_chunks"]) if i not in received]
+
+        done = sum(min(chunk_size, total_size - i * chunk_size) for i in received)
+        if progress:
+            progress(done, total_size)
+
+        with ThreadPoolExecutor(max_workers=self.streams) as pool:
+            futures = [
+                pool.submit(self._send_chunk, path, upload_id, index, chunk_size)
+                for index in missing
+            ]
+            try:
+                for future in as_completed(futures):
+                    done += future.result()
+                    if progress:
+                        progress(done, total_size)
+            except BaseException:
+                # Acknowledged chunks stay on the manager; the next run resumes from there
+                for future in futures:
+                    future.cancel()
+                raise
+
+        return upload_id
@@ -0,0 +1,92 @@
+"""Dataset registry API endpoints."""
+
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import List
+
+import redis
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.models import DatasetCreateRequest, DatasetInfo
+from app.api.uploads import take_assembled_bundle
+from app.core.config import get_settings
+from app.core.datasets import get_dataset
+from app.core.redis import get_redis_client
+
+router = APIRouter()
+
+
+def dataset_info(name: str, redis_client: redis.Redis) -> DatasetInfo:
+    """Load a registered dataset or raise 404."""
+    record = get_dataset(redis_client, name)
+    if record is None:
+        raise HTTPException(status_code=404, detail=f"Dataset not found: {name}")
+    return DatasetInfo(**record)
+
+
+@router.post("", response_model=DatasetInfo)
+async def create_dataset(
+    request: DatasetCreateRequest,
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> DatasetInfo:
+    """Register (or replace) a dataset from a completed chunked upload."""
+    
+    settings = get_settings()
+    version = uuid.uuid4().hex[:12]
+    archive = Path(settings.dataset_storage_path) / request.name / f"{version}.zip"
+    
+    # Shared storage is usually another filesystem, so this is a full copy
+    await run_in_threadpool(take_assembled_bundle, request.upload_id, redis_client, archive)
+    
+    previous = redis_client.hget(f"dataset:{request.name}", "version")
+    redis_client.hset(f"dataset:{request.name}", mapping={
+        "version": version,
+        "size": archive.stat().st_size,
+        "created_at": time.time(),
+    })
+    redis_client.sadd("datasets", request.name)
+    
+    # Tasks queued before the replacement pinned the old version, so it
+    # stays on shared storage; worker caches age it out through LRU.
+    if previous:
+        print(f"Dataset {request.name} replaced: {previous} -> {version}")
+    
+    return dataset_info(request.name, redis_client)
+
+
+@router.get("", response_model=List[DatasetInfo])
+async def list_datasets(
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> List[DatasetInfo]:
+    """List registered datasets."""
+    
+    return [dataset_info(name, redis_client) for name in sorted(redis_client.smembers("datasets"))]
+
+
+@router.get("/{name}", response_model=DatasetInfo)
+async def read_dataset(
+    name: str,
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> DatasetInfo:
+    """Get a registered dataset."""
+    
+    return dataset_info(name, redis_client)
+
+
+@router.delete("/{name}")
+async def delete_dataset(
+    name: str,
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> dict:
+    """Unregister a dataset and remove its archives from shared storage."""
+    
+    settings = get_settings()
+    dataset_info(name, redis_client)
+    
+    redis_client.delete(f"dataset:{name}")
+    redis_client.srem("datasets", name)
+    shutil.rmtree(Path(settings.dataset_storage_path) / name, ignore_errors=True)
+    return {"name": name, "deleted": True}
@@ -0,0 +1,81 @@
+"""Task environment prefetch API endpoints."""
+
+import logging
+
+import redis
+from fastapi import APIRouter, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from rq import Queue
+
+from app.api.models import EnvironmentPrepareRequest, EnvironmentPrepareResponse
+from app.api.tasks import check_executor
+from app.core.config import get_settings
+from app.core.constants import EnvironmentStatus, QueueNames
+from app.core.environments import (
+    environment_digest,
+    environment_nodes_key,
+    environment_preparing_key,
+    priority_executor,
+)
+from app.core.redis import get_redis_client
+
+router = APIRouter()
+
+
+@router.post("/prepare", response_model=EnvironmentPrepareResponse)
+async def prepare_environment(
+    request: EnvironmentPrepareRequest,
+    http_request: Request,
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> EnvironmentPrepareResponse:
+    """Start installing a task's requirements while its project uploads.
+
+    Speculative and idempotent: at most one prefetch per environment is in
+    flight, nothing is queued when a node already has the environment, and
+    prefetching is skipped while the manager sheds load.
+    """
+    settings = get_settings()
+    check_executor(request.executor)
+    executor = priority_executor(request.executor, request.priority)
+    requirements = request.requirements.encode("utf-8")
+    digest = environment_digest(requirements)
+    nodes_key = environment_nodes_key(executor, digest)
+
+    def response(status: EnvironmentStatus) -> EnvironmentPrepareResponse:
+        return EnvironmentPrepareResponse(
+            environment=digest,
+            executor=executor,
+            status=status,
+            nodes=sorted(redis_client.smembers(nodes_key))
+        )
+
+    if not requirements.strip():
+        return response(EnvironmentStatus.EMPTY)
+    if redis_client.scard(nodes_key):
+        return response(EnvironmentStatus.READY)
+
+    if settings.admission_enabled:
+        try:
+            overload = await run_in_threadpool(http_request.app.state.admission.overload)
+        except Exception as e:
+            # Like admission control, a failing check must not block the prefetch
+            logging.getLogger(__name__).warning(f"Admission check failed: {e}")
+            overload = None
+        if overload is not None:
+            return response(EnvironmentStatus.SKIPPED)
+
+    # Claim the prefetch; concurrent announcements of the same environment share it
+    preparing_key = environment_preparing_key(executor, digest)
+    if redis_client.set(preparing_key, 1, nx=True, ex=settings.environment_prepare_ttl):
+        try:
+            Queue(QueueNames.PREPARE, connection=redis_client).enqueue(
+                "app.worker.tasks.prepare_environment",
+                request.requirements,
+                executor,
+                job_timeout=settings.docker_timeout,
+                result_ttl=0
+            )
+        except Exception:
+            redis_client.delete(preparing_key)
+            raise
+    return response(EnvironmentStatus.PREPARING)
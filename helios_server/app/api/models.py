@@ -1,7 +1,7 @@
 """Data models for Helios API."""
 
 import uuid
-from typing import Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -12,6 +12,8 @@ class TaskMetadata(BaseModel):
     priority: str = Field("default", description="Task priority")
     name: str = Field(..., description="Human-readable task name")
     resources: Dict[str, str] = Field(default_factory=dict, description="Resource limits")
+    datasets: List[str] = Field(default_factory=list, description="Registered datasets to mount read-only")
+    executor: Optional[str] = Field(None, pattern=r"^(docker|subprocess)$", description="Executor backend, defaults to the queue's")
 
 
 class TaskSubmissionRequest(BaseModel):
@@ -34,9 +36,143 @@ class TaskInfo(BaseModel):
     priority: str
     name: str
     resources: Dict[str, str]
+    datasets: Dict[str, str] = Field(default_factory=dict, description="Dataset name to pinned version")
+    pipeline_id: Optional[str] = Field(None, description="Pipeline this task runs a stage of")
+    stage: Optional[str] = Field(None, description="Pipeline stage name")
+    executor: Optional[str] = Field(None, description="Executor backend, defaults to the queue's")
 
 
 class TaskStatusResponse(BaseModel):
     """Task status response model."""
     task_id: str
-    status: str
\ No newline at end of file
+    status: str
+
+
+class TaskStatsResponse(BaseModel):
+    """Task resource telemetry response model."""
+    task_id: str
+    interval: float
+    bucket: int
+    samples: int
+    overhead_seconds: float
+    overhead_ratio: float
+    points: List[Dict[str, Any]]
+
+
+class TaskMetricSummary(BaseModel):
+    """Aggregates and downsampled history of one task metric."""
+    count: int
+    last: float
+    min: float
+    max: float
+    bucket: int
+    points: List[Dict[str, float]]
+
+
+class TaskMetricsResponse(BaseModel):
+    """Metrics and progress reported by task code."""
+    task_id: str
+    progress: Optional[Dict[str, Any]] = None
+    dropped_events: int = 0
+    metrics: Dict[str, TaskMetricSummary]
+
+
+class TaskLogLine(BaseModel):
+    """Single archived log line."""
+    number: int
+    text: str
+
+
+class TaskLogsResponse(BaseModel):
+    """Archived task log slice or search result."""
+    task_id: str
+    total_lines: int
+    complete: bool
+    lines: List[TaskLogLine]
+
+
+class UploadSessionRequest(BaseModel):
+    """Chunked upload session creation request."""
+    filename: str = Field(..., description="Bundle filename, must end with .zip")
+    total_size: int = Field(..., ge=1, description="Bundle size in bytes")
+    chunk_size: Optional[int] = Field(None, ge=1, description="Requested chunk size in bytes")
+
+
+class UploadSessionResponse(BaseModel):
+    """Chunked upload session state."""
+    upload_id: str
+    total_size: int
+    chunk_size: int
+    total_chunks: int
+    received_chunks: List[int]
+
+
+class DatasetCreateRequest(BaseModel):
+    """Register a dataset from a completed chunked upload."""
+    name: str = Field(..., pattern=r"^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$", description="Dataset name")
+    upload_id: str = Field(..., description="Upload session holding the dataset archive")
+
+
+class DatasetInfo(BaseModel):
+    """Registered dataset model."""
+    name: str
+    version: str
+    size: int
+    created_at: float
+    nodes: List[str] = Field(default_factory=list, description="Worker nodes caching this version")
+
+
+class EnvironmentPrepareRequest(BaseModel):
+    """Announce the requirements of a task about to be submitted."""
+    requirements: str = Field("", max_length=64 * 1024, description="Contents of requirements.txt")
+    priority: str = Field("default", description="Priority the task will be submitted with")
+    executor: Optional[str] = Field(None, pattern=r"^(docker|subprocess)$", description="Executor backend, defaults to the queue's")
+
+
+class EnvironmentPrepareResponse(BaseModel):
+    """Prefetch state of a task environment."""
+    environment: str = Field(..., description="Environment digest the task will be bound to")
+    executor: str
+    status: str = Field(..., description="empty, ready, preparing or skipped")
+    nodes: List[str] = Field(default_factory=list, description="Worker nodes with the environment ready or building")
+
+
+class PipelineStage(BaseModel):
+    """Single stage of a pipeline submission."""
+    name: str = Field(..., pattern=r"^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$", description="Stage name")
+    entrypoint: str = Field(..., description="Entry script filename")
+    depends_on: List[str] = Field(default_factory=list, description="Stages that must succeed first")
+    resources: Dict[str, str] = Field(default_factory=dict, description="Resource limits")
+    datasets: List[str] = Field(default_factory=list, description="Registered datasets to mount read-only")
+    executor: Optional[str] = Field(None, pattern=r"^(docker|subprocess)$", description="Executor backend, defaults to the queue's")
+
+
+class PipelineMetadata(BaseModel):
+    """Pipeline metadata model."""
+    name: str = Field(..., description="Human-readable pipeline name")
+    priority: str = Field("default", description="Priority of every stage")
+    stages: List[PipelineStage] = Field(..., min_length=1, description="Stages sharing one workspace")
+
+
+class PipelineSubmissionRequest(BaseModel):
+    """Pipeline submission request model."""
+    metadata: PipelineMetadata
+
+
+class PipelineStageInfo(BaseModel):
+    """State of one pipeline stage."""
+    name: str
+    status: str
+    depends_on: List[str]
+    task_id: Optional[str] = None
+    node: Optional[str] = None
+    attempts: int = 0
+
+
+class PipelineInfo(BaseModel):
+    """Pipeline state model."""
+    pipeline_id: str
+    name: str
+    status: str
+    created_at: float
+    stages: List[PipelineStageInfo]
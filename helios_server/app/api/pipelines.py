@@ -0,0 +1,219 @@
+"""Pipeline submission API endpoints."""
+
+import json
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict
+
+import redis
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.models import (
+    PipelineInfo,
+    PipelineMetadata,
+    PipelineStageInfo,
+    PipelineSubmissionRequest,
+)
+from app.api.tasks import check_executor, extract_project, resolve_datasets
+from app.api.uploads import take_assembled_bundle
+from app.core.config import get_settings
+from app.core.constants import StorageDirs, TaskStatus
+from app.core.pipelines import (
+    create_pipeline,
+    load_stages,
+    pipeline_key,
+    pipeline_lock,
+    retry_pipeline,
+    stage_nodes_key,
+    topological_order,
+)
+from app.core.redis import get_redis_client
+
+router = APIRouter()
+
+
+def pipeline_dir(pipeline_id: str) -> Path:
+    """Return the shared workspace of a pipeline."""
+    settings = get_settings()
+    return Path(settings.task_storage_path) / StorageDirs.PIPELINES / pipeline_id
+
+
+def pipeline_info(pipeline_id: str, redis_client: redis.Redis) -> PipelineInfo:
+    """Load a pipeline and its stages or raise 404."""
+    record = redis_client.hgetall(pipeline_key(pipeline_id))
+    if not record:
+        raise HTTPException(status_code=404, detail="Pipeline not found")
+    
+    stages = load_stages(redis_client, pipeline_id)
+    return PipelineInfo(
+        pipeline_id=pipeline_id,
+        name=record["name"],
+        status=record["status"],
+        created_at=float(record["created_at"]),
+        stages=[
+            PipelineStageInfo(
+                name=name,
+                status=stages[name]["status"],
+                depends_on=stages[name]["depends_on"],
+                task_id=stages[name]["task_id"],
+                node=stages[name]["node"],
+                attempts=stages[name]["attempts"]
+            )
+            for name in json.loads(record["order"])
+        ]
+    )
+
+
+def resolve_stages(metadata: PipelineMetadata, redis_client: redis.Redis) -> Dict[str, dict]:
+    """Validate a pipeline's stages and resolve their datasets or raise 400."""
+    names = [stage.name for stage in metadata.stages]
+    if len(set(names)) != len(names):
+        raise HTTPException(status_code=400, detail="Stage names must be unique")
+    try:
+        topological_order({stage.name: stage.depends_on for stage in metadata.stages})
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    stages = {}
+    for stage in metadata.stages:
+        check_executor(stage.executor)
+        datasets = resolve_datasets(redis_client, stage.datasets)
+        stages[stage.name] = {
+            "entrypoint": stage.entrypoint,
+            "depends_on": stage.depends_on,
+            "resources": stage.resources,
+            "executor": stage.executor,
+            "datasets": {
+                name: {"version": record["version"], "size": record["size"]}
+                for name, record in datasets.items()
+            },
+        }
+    return stages
+
+
+def extract_and_start(
+    pipeline_id: str,
+    workspace: Path,
+    metadata: PipelineMetadata,
+    redis_client: redis.Redis
+) -> None:
+    """Extract ``workspace/project.zip`` and enqueue the pipeline's first stages.
+    
+    Blocking; call through ``run_in_threadpool`` from request handlers.
+    """
+    stages = resolve_stages(metadata, redis_client)
+    extract_project(workspace)
+    create_pipeline(redis_client, pipeline_id, metadata.name, metadata.priority, str(workspace), stages)
+
+
+async def start_pipeline(
+    pipeline_id: str,
+    workspace: Path,
+    metadata: PipelineMetadata,
+    redis_client: redis.Redis
+) -> PipelineInfo:
+    """Start a pipeline from a bundle saved at ``workspace/project.zip``."""
+    try:
+        await run_in_threadpool(extract_and_start, pipeline_id, workspace, metadata, redis_client)
+    except HTTPException:
+        shutil.rmtree(workspace, ignore_errors=True)
+        raise
+    except Exception as e:
+        shutil.rmtree(workspace, ignore_errors=True)
+        raise HTTPException(status_code=500, detail=f"Failed to submit pipeline: {str(e)}")
+    
+    return pipeline_info(pipeline_id, redis_client)
+
+
+@router.post("", response_model=PipelineInfo)
+async def submit_pipeline(
+    file: UploadFile = File(...),
+    metadata: str = Form(...),
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> PipelineInfo:
+    """Submit a pipeline whose stages share one workspace."""
+    
+    pipeline_metadata = PipelineMetadata(**json.loads(metadata))
+    if not file.filename.endswith('.zip'):
+        raise HTTPException(status_code=400, detail="Only .zip files are allowed")
+    
+    pipeline_id = str(uuid.uuid4())
+    workspace = pipeline_dir(pipeline_id)
+    workspace.mkdir(parents=True, exist_ok=True)
+    with open(workspace / "project.zip", "wb") as zip_file:
+        shutil.copyfileobj(file.file, zip_file)
+    
+    return await start_pipeline(pipeline_id, workspace, pipeline_metadata, redis_client)
+
+
+@router.post("/from-upload/{upload_id}", response_model=PipelineInfo)
+async def submit_pipeline_from_upload(
+    upload_id: str,
+    request: PipelineSubmissionRequest,
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> PipelineInfo:
+    """Submit a pipeline from a completed chunked upload."""
+    
+    pipeline_id = str(uuid.uuid4())
+    workspace = pipeline_dir(pipeline_id)
+    await run_in_threadpool(
+        take_assembled_bundle,
+        upload_id,
+        redis_client,
+        workspace / "project.zip",
+        lambda bundle: resolve_stages(request.metadata, redis_client)
+    )
+    
+    return await start_pipeline(pipeline_id, workspace, request.metadata, redis_client)
+
+
+@router.get("/{pipeline_id}", response_model=PipelineInfo)
+async def get_pipeline(
+    pipeline_id: str,
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> PipelineInfo:
+    """Get the status of a pipeline and its stages."""
+    return pipeline_info(pipeline_id, redis_client)
+
+
+@router.post("/{pipeline_id}/retry", response_model=PipelineInfo)
+def retry_failed_stages(
+    pipeline_id: str,
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> PipelineInfo:
+    """Re-run failed stages and everything downstream of them in the kept workspace."""
+    
+    pipeline_info(pipeline_id, redis_client)
+    if not pipeline_dir(pipeline_id).exists():
+        raise HTTPException(status_code=409, detail="Pipeline workspace no longer exists")
+    
+    try:
+        retry_pipeline(redis_client, pipeline_id)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return pipeline_info(pipeline_id, redis_client)
+
+
+@router.delete("/{pipeline_id}")
+def delete_pipeline(
+    pipeline_id: str,
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> dict:
+    """Remove a finished pipeline and its workspace."""
+    
+    info = pipeline_info(pipeline_id, redis_client)
+    if info.status == TaskStatus.RUNNING:
+        raise HTTPException(status_code=409, detail="Pipeline still has running stages")
+    
+    with pipeline_lock(redis_client, pipeline_id):
+        shutil.rmtree(pipeline_dir(pipeline_id), ignore_errors=True)
+        redis_client.delete(
+            pipeline_key(pipeline_id),
+            f"{pipeline_key(pipeline_id)}:stages",
+            *[stage_nodes_key(pipeline_id, stage.name) for stage in info.stages]
+        )
+    
+    return {"pipeline_id": pipeline_id, "deleted": True}
@@ -2,24 +2,140 @@
 
 import json
 import os
+import posixpath
 import shutil
 import uuid
 import zipfile
 from pathlib import Path
-from typing import Dict
+from typing import Dict, List, Optional
 
 import redis
-from fastapi import APIRouter, Depends, File, Form, UploadFile, HTTPException
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from rq import Queue
 
-from app.api.models import TaskInfo, TaskMetadata, TaskSubmissionResponse, TaskStatusResponse
+from app.api.models import (
+    TaskInfo,
+    TaskLogLine,
+    TaskLogsResponse,
+    TaskMetadata,
+    TaskMetricsResponse,
+    TaskStatsResponse,
+    TaskStatusResponse,
+    TaskSubmissionResponse,
+)
 from app.core.config import get_settings
-from app.core.constants import QueueNames, TaskStatus, TaskPriority
+from app.core.constants import TaskExecutor, TaskStatus
+from app.core.datasets import dataset_nodes_key, get_dataset
+from app.core.environments import environment_digest, environment_nodes_key, priority_executor
+from app.core.log_archive import open_archive
+from app.core.placement import choose_queue
 from app.core.redis import get_redis_client
 
 router = APIRouter()
 
 
+def resolve_datasets(redis_client: redis.Redis, names: List[str]) -> Dict[str, dict]:
+    """Pin requested datasets to their current versions or raise 400."""
+    datasets = {}
+    for dataset_name in names:
+        record = get_dataset(redis_client, dataset_name)
+        if record is None:
+            raise HTTPException(status_code=400, detail=f"Unknown dataset: {dataset_name}")
+        datasets[dataset_name] = record
+    return datasets
+
+
+def check_executor(executor: Optional[str]) -> None:
+    """Reject executors the deployment does not allow with 400."""
+    settings = get_settings()
+    if executor == TaskExecutor.SUBPROCESS and not settings.allow_subprocess_executor:
+        raise HTTPException(status_code=400, detail="Subprocess executor is disabled")
+
+
+def validate_task(
+    zip_path: Path,
+    task_metadata: TaskMetadata,
+    redis_client: redis.Redis
+) -> Dict[str, dict]:
+    """Check a task can run from the bundle at ``zip_path`` or raise 400.
+    
+    Returns the resolved datasets. Only reads the zip's directory, so it
+    is cheap enough to run before a bundle is committed to a task.
+    """
+    check_executor(task_metadata.executor)
+    datasets = resolve_datasets(redis_client, task_metadata.datasets)
+    
+    entrypoint = posixpath.normpath(task_metadata.entrypoint.replace("\\", "/"))
+    try:
+        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+            names = {posixpath.normpath(name) for name in zip_ref.namelist()}
+    except zipfile.BadZipFile:
+        raise HTTPException(status_code=400, detail="Invalid zip file")
+    if entrypoint not in names:
+        raise HTTPException(status_code=400, detail=f"Entrypoint not found in project: {task_metadata.entrypoint}")
+    return datasets
+
+
+def extract_project(task_dir: Path) -> None:
+    """Extract ``task_dir/project.zip`` in place and remove the zip."""
+    zip_path = task_dir / "project.zip"
+    with zipfile.ZipFile(zip_path, 'r') as zip_ref:
+        zip_ref.extractall(task_dir)
+    zip_path.unlink()
+
+
+def extract_and_enqueue(
+    task_id: str,
+    task_dir: Path,
+    task_metadata: TaskMetadata,
+    redis_client: redis.Redis
+) -> None:
+    """Extract ``task_dir/project.zip`` in place and enqueue the task.
+    
+    Blocking; call through ``run_in_threadpool`` from request handlers.
+    """
+    settings = get_settings()
+    
+    datasets = validate_task(task_dir / "project.zip", task_metadata, redis_client)
+    extract_project(task_dir)
+    
+    # Create task info
+    task_info = TaskInfo(
+        task_id=task_id,
+        task_path=str(task_dir),
+        entrypoint=task_metadata.entrypoint,
+        priority=task_metadata.priority,
+        name=task_metadata.name,
+        resources=task_metadata.resources,
+        datasets={name: record["version"] for name, record in datasets.items()},
+        executor=task_metadata.executor
+    )
+    
+    # Initialize task status in Redis
+    redis_client.set(f"task:{task_id}:status", TaskStatus.PENDING)
+    
+    # Prefer a node that already caches the datasets or has the environment
+    # prepared (possibly prefetched during upload), else the shared priority queue
+    holders = [(dataset_nodes_key(name, record["version"]), record["size"]) for name, record in datasets.items()]
+    requirements_path = task_dir / "requirements.txt"
+    requirements = requirements_path.read_bytes() if requirements_path.exists() else b""
+    if requirements.strip():
+        executor = priority_executor(task_metadata.executor, task_metadata.priority)
+        holders.append((
+            environment_nodes_key(executor, environment_digest(requirements)),
+            settings.environment_affinity_weight
+        ))
+    queue_name = choose_queue(redis_client, task_metadata.priority, holders)
+    queue = Queue(queue_name, connection=redis_client)
+    queue.enqueue(
+        "app.worker.tasks.run_task",
+        task_info.dict(),
+        job_id=task_id,
+        job_timeout=settings.docker_timeout
+    )
+
+
 @router.post("/submit", response_model=TaskSubmissionResponse)
 async def submit_task(
     file: UploadFile = File(...),
@@ -51,35 +167,7 @@ async def submit_task(
         with open(zip_path, "wb") as zip_file:
             shutil.copyfileobj(file.file, zip_file)
         
-        # Extract zip file
-        with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-            zip_ref.extractall(task_dir)
-        
-        # Remove zip file after extraction
-        zip_path.unlink()
-        
-        # Create task info
-        task_info = TaskInfo(
-            task_id=task_id,
-            task_path=str(task_dir),
-            entrypoint=task_metadata.entrypoint,
-            priority=task_metadata.priority,
-            name=task_metadata.name,
-            resources=task_metadata.resources
-        )
-        
-        # Initialize task status in Redis
-        redis_client.set(f"task:{task_id}:status", TaskStatus.PENDING)
-        
-        # Enqueue task to appropriate priority queue
-        queue_name = QueueNames.HIGH if task_metadata.priority == TaskPriority.HIGH else QueueNames.DEFAULT
-        queue = Queue(queue_name, connection=redis_client)
-        queue.enqueue(
-            "app.worker.tasks.run_task_in_docker",
-            task_info.dict(),
-            job_id=task_id,
-            job_timeout=settings.docker_timeout
-        )
+        await run_in_threadpool(extract_and_enqueue, task_id, task_dir, task_metadata, redis_client)
         
         return TaskSubmissionResponse(
             success=True,
@@ -87,6 +175,10 @@ async def submit_task(
             message="Task submitted successfully."
         )
         
+    except HTTPException:
+        if 'task_dir' in locals() and task_dir.exists():
+            shutil.rmtree(task_dir)
+        raise
     except Exception as e:
         # Clean up on error
         if 'task_dir' in locals() and task_dir.exists():
@@ -109,4 +201,67 @@ async def get_task_status(
     return TaskStatusResponse(
         task_id=task_id,
         status=status
+    )
+
+
+@router.get("/{task_id}/stats", response_model=TaskStatsResponse)
+async def get_task_stats(
+    task_id: str,
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> TaskStatsResponse:
+    """Get the downsampled resource series recorded for a finished task."""
+    
+    stats = redis_client.get(f"task:{task_id}:stats")
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No telemetry recorded for task")
+    
+    return TaskStatsResponse(task_id=task_id, **json.loads(stats))
+
+
+@router.get("/{task_id}/metrics", response_model=TaskMetricsResponse)
+async def get_task_metrics(
+    task_id: str,
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> TaskMetricsResponse:
+    """Get the metrics and last progress reported by a finished task."""
+    
+    metrics = redis_client.get(f"task:{task_id}:metrics")
+    if metrics is None:
+        raise HTTPException(status_code=404, detail="No metrics reported by task")
+    
+    return TaskMetricsResponse(task_id=task_id, **json.loads(metrics))
+
+
+@router.get("/{task_id}/logs", response_model=TaskLogsResponse)
+def get_task_logs(
+    task_id: str,
+    from_line: Optional[int] = Query(None, description="First line (0-based, negative counts from the end)"),
+    to_line: Optional[int] = Query(None, description="End line, exclusive"),
+    grep: Optional[str] = Query(None, description="Only return lines containing this literal text"),
+    limit: int = Query(1000, ge=1, le=10000, description="Maximum number of lines returned")
+) -> TaskLogsResponse:
+    """Serve a slice or search of a task's archived log.
+    
+    Defined as a plain function so the blocking file reads run in the
+    threadpool instead of the event loop.
+    """
+    
+    settings = get_settings()
+    archive = open_archive(task_id, settings.log_archive_path)
+    if archive is None:
+        raise HTTPException(status_code=404, detail="No log archive for task")
+    
+    if grep:
+        lines = archive.grep(grep, from_line, to_line, limit)
+    elif from_line is not None and from_line < 0 and to_line is None:
+        # Tail request: return the last lines rather than the first ``limit`` of the range
+        lines = archive.read_lines(max(from_line, -limit), None)
+    else:
+        lines = archive.read_lines(from_line, to_line, limit)
+    
+    return TaskLogsResponse(
+        task_id=task_id,
+        total_lines=archive.total_lines,
+        complete=archive.complete,
+        lines=[TaskLogLine(number=number, text=text) for number, text in lines]
     )
\ No newline at end of file
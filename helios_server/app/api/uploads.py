@@ -0,0 +1,299 @@
+"""Resumable chunked upload API endpoints."""
+
+import asyncio
+import hashlib
+import logging
+import shutil
+import time
+import uuid
+from pathlib import Path
+from typing import Callable, Optional
+
+import redis
+from fastapi import APIRouter, Depends, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+
+from app.api.models import (
+    TaskSubmissionRequest,
+    TaskSubmissionResponse,
+    UploadSessionRequest,
+    UploadSessionResponse,
+)
+from app.api.tasks import extract_and_enqueue, validate_task
+from app.core.config import get_settings
+from app.core.constants import StorageDirs
+from app.core.redis import get_redis_client
+
+router = APIRouter()
+
+# Chunk bodies are written to disk in batches of about this size
+WRITE_BATCH_BYTES = 1024 * 1024
+
+
+def upload_dir(upload_id: str) -> Path:
+    """Return the staging directory of an upload session.
+    
+    Upload IDs come from URLs; anything but a UUID is rejected with 404
+    so it can never address a path outside the staging area.
+    """
+    settings = get_settings()
+    try:
+        uuid.UUID(upload_id)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Upload session not found or expired")
+    return Path(settings.task_storage_path) / StorageDirs.UPLOADS / upload_id
+
+
+def get_upload_session(upload_id: str, redis_client: redis.Redis) -> dict:
+    """Load an upload session or raise 404."""
+    session = redis_client.hgetall(f"upload:{upload_id}")
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload session not found or expired")
+    return {
+        "total_size": int(session["total_size"]),
+        "chunk_size": int(session["chunk_size"]),
+        "total_chunks": int(session["total_chunks"]),
+    }
+
+
+def session_response(upload_id: str, session: dict, redis_client: redis.Redis) -> UploadSessionResponse:
+    """Build the session state returned to clients."""
+    received = sorted(int(index) for index in redis_client.smembers(f"upload:{upload_id}:chunks"))
+    return UploadSessionResponse(upload_id=upload_id, received_chunks=received, **session)
+
+
+def take_assembled_bundle(
+    upload_id: str,
+    redis_client: redis.Redis,
+    destination: Path,
+    validate: Optional[Callable[[Path], object]] = None
+) -> None:
+    """Check an upload is complete and move its assembled file to ``destination``.
+    
+    ``validate`` is called with the assembled file before the session is
+    consumed; if it raises, the upload stays intact so the client can
+    fix its request and complete again. Blocking; call through
+    ``run_in_threadpool`` from request handlers.
+    """
+    staging = upload_dir(upload_id)
+    session = get_upload_session(upload_id, redis_client)
+    received = redis_client.scard(f"upload:{upload_id}:chunks")
+    if received != session["total_chunks"]:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Upload incomplete: {received}/{session['total_chunks']} chunks received"
+        )
+    if validate is not None:
+        validate(staging / "bundle.part")
+    
+    # Claim the session atomically; of concurrent completions only one moves the file
+    if not redis_client.delete(f"upload:{upload_id}"):
+        raise HTTPException(status_code=409, detail="Upload already completed")
+    redis_client.delete(f"upload:{upload_id}:chunks")
+    
+    try:
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(staging / "bundle.part"), str(destination))
+    except OSError as e:
+        raise HTTPException(status_code=500, detail=f"Failed to assemble upload: {e}")
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def cleanup_stale_uploads(redis_client: redis.Redis) -> int:
+    """Remove staging directories whose Redis session has expired.
+    
+    Only directories idle for the whole session TTL are considered: every
+    chunk refreshes both the TTL and the file, so such a session cannot
+    be completing concurrently.
+    """
+    settings = get_settings()
+    root = Path(settings.task_storage_path) / StorageDirs.UPLOADS
+    if not root.exists():
+        return 0
+    
+    removed = 0
+    for path in root.iterdir():
+        try:
+            modified = max(entry.stat().st_mtime for entry in (path, *path.iterdir()))
+        except OSError:
+            # Claimed and removed by a completion meanwhile
+            continue
+        if time.time() - modified < settings.upload_session_ttl:
+            continue
+        if not redis_client.exists(f"upload:{path.name}"):
+            shutil.rmtree(path, ignore_errors=True)
+            removed += 1
+    return removed
+
+
+async def sweep_stale_uploads(redis_client: redis.Redis, interval: float) -> None:
+    """Run ``cleanup_stale_uploads`` now and then every ``interval`` seconds (0 runs once)."""
+    logger = logging.getLogger(__name__)
+    while True:
+        try:
+            removed = await run_in_threadpool(cleanup_stale_uploads, redis_client)
+            if removed:
+                logger.info(f"Removed {removed} expired upload sessions")
+        except Exception as e:
+            logger.warning(f"Failed to clean up expired uploads: {e}")
+        if interval <= 0:
+            return
+        await asyncio.sleep(interval)
+
+
+@router.post("", response_model=UploadSessionResponse)
+async def create_upload(
+    request: UploadSessionRequest,
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> UploadSessionResponse:
+    """Open a chunked upload session and preallocate its file."""
+    
+    settings = get_settings()
+    
+    if not request.filename.endswith('.zip'):
+        raise HTTPException(status_code=400, detail="Only .zip files are allowed")
+    if request.total_size > settings.upload_max_size:
+        raise HTTPException(status_code=413, detail="Upload exceeds maximum size")
+    
+    chunk_size = min(request.chunk_size or settings.upload_chunk_size, settings.upload_max_chunk_size)
+    total_chunks = (request.total_size + chunk_size - 1) // chunk_size
+    upload_id = str(uuid.uuid4())
+    
+    # Chunks are written in place at their offsets, so size the file up front
+    staging = upload_dir(upload_id)
+    staging.mkdir(parents=True, exist_ok=True)
+    with open(staging / "bundle.part", "wb") as f:
+        f.truncate(request.total_size)
+    
+    session = {
+        "total_size": request.total_size,
+        "chunk_size": chunk_size,
+        "total_chunks": total_chunks,
+    }
+    redis_client.hset(f"upload:{upload_id}", mapping={**session, "filename": request.filename})
+    redis_client.expire(f"upload:{upload_id}", settings.upload_session_ttl)
+    
+    return UploadSessionResponse(upload_id=upload_id, received_chunks=[], **session)
+
+
+@router.get("/{upload_id}", response_model=UploadSessionResponse)
+async def get_upload(
+    upload_id: str,
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> UploadSessionResponse:
+    """Get upload session state, including the chunks already received."""
+    
+    session = get_upload_session(upload_id, redis_client)
+    return session_response(upload_id, session, redis_client)
+
+
+@router.put("/{upload_id}/chunks/{index}")
+async def put_chunk(
+    upload_id: str,
+    index: int,
+    request: Request,
+    x_chunk_sha256: str = Header(..., description="Hex SHA-256 of the chunk body"),
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> dict:
+    """Store one chunk at its offset after verifying its checksum."""
+    
+    settings = get_settings()
+    session = get_upload_session(upload_id, redis_client)
+    
+    if not 0 <= index < session["total_chunks"]:
+        raise HTTPException(status_code=400, detail="Chunk index out of range")
+    
+    offset = index * session["chunk_size"]
+    expected_size = min(session["chunk_size"], session["total_size"] - offset)
+    
+    # Stream the body to its place in the file while hashing it; disk
+    # writes and hashing run in the threadpool in batches
+    digest = hashlib.sha256()
+    written = 0
+    f = await run_in_threadpool(open, upload_dir(upload_id) / "bundle.part", "r+b")
+    
+    def write_batch(data: bytes) -> None:
+        digest.update(data)
+        f.write(data)
+    
+    try:
+        await run_in_threadpool(f.seek, offset)
+        batch = []
+        batch_bytes = 0
+        async for piece in request.stream():
+            written += len(piece)
+            if written > expected_size:
+                raise HTTPException(status_code=400, detail="Chunk larger than expected")
+            batch.append(piece)
+            batch_bytes += len(piece)
+            if batch_bytes >= WRITE_BATCH_BYTES:
+                await run_in_threadpool(write_batch, b"".join(batch))
+                batch = []
+                batch_bytes = 0
+        if batch:
+            await run_in_threadpool(write_batch, b"".join(batch))
+    finally:
+        await run_in_threadpool(f.close)
+    
+    if written != expected_size:
+        raise HTTPException(status_code=400, detail=f"Chunk size {written} != {expected_size}")
+    if digest.hexdigest() != x_chunk_sha256.lower():
+        raise HTTPException(status_code=400, detail="Chunk checksum mismatch")
+    
+    # Only mark the chunk once its bytes are verified; a retry simply overwrites them
+    redis_client.sadd(f"upload:{upload_id}:chunks", index)
+    redis_client.expire(f"upload:{upload_id}", settings.upload_session_ttl)
+    redis_client.expire(f"upload:{upload_id}:chunks", settings.upload_session_ttl)
+    
+    return {"upload_id": upload_id, "index": index, "size": written}
+
+
+@router.post("/{upload_id}/complete", response_model=TaskSubmissionResponse)
+async def complete_upload(
+    upload_id: str,
+    request: TaskSubmissionRequest,
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> TaskSubmissionResponse:
+    """Assemble an uploaded bundle into a task and enqueue it."""
+    
+    settings = get_settings()
+    task_id = str(uuid.uuid4())
+    task_dir = Path(settings.task_storage_path) / task_id
+    
+    await run_in_threadpool(
+        take_assembled_bundle,
+        upload_id,
+        redis_client,
+        task_dir / "project.zip",
+        lambda bundle: validate_task(bundle, request.metadata, redis_client)
+    )
+    
+    try:
+        await run_in_threadpool(extract_and_enqueue, task_id, task_dir, request.metadata, redis_client)
+    except HTTPException:
+        shutil.rmtree(task_dir, ignore_errors=True)
+        raise
+    except Exception as e:
+        shutil.rmtree(task_dir, ignore_errors=True)
+        raise HTTPException(status_code=500, detail=f"Failed to submit task: {str(e)}")
+    
+    return TaskSubmissionResponse(
+        success=True,
+        task_id=task_id,
+        message="Task submitted successfully."
+    )
+
+
+@router.delete("/{upload_id}")
+async def abort_upload(
+    upload_id: str,
+    redis_client: redis.Redis = Depends(get_redis_client)
+) -> dict:
+    """Abort an upload session and discard its data."""
+    
+    staging = upload_dir(upload_id)
+    get_upload_session(upload_id, redis_client)
+    redis_client.delete(f"upload:{upload_id}", f"upload:{upload_id}:chunks")
+    shutil.rmtree(staging, ignore_errors=True)
+    return {"upload_id": upload_id, "aborted": True}
@@ -0,0 +1,111 @@
+"""Admission control for new work submitted to the Helios manager."""
+
+import shutil
+import threading
+import time
+from typing import Optional
+
+import redis
+from rq import Queue
+
+from app.core.config import get_settings
+
+# Token bucket per client, evaluated atomically in Redis so several
+# manager processes share one limit. Uses the Redis clock to avoid skew.
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class Rejection:
+    """Reason a request was not admitted."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: float):
+        """Initialize rejection."""
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """Decides whether the manager accepts new submissions.
+
+    Overload signals (queue depth, free disk, Redis memory) are shared by
+    every client and answered with 503; they are refreshed at most every
+    ``admission_cache_seconds`` so a submit storm does not turn into a
+    storm of INFO and LLEN calls. The per-client rate limit is answered
+    with 429 and is checked on every request.
+    """
+
+    def __init__(self, redis_client: redis.Redis):
+        """Initialize controller on a Redis connection."""
+        self.redis_client = redis_client
+        self._token_bucket = redis_client.register_script(TOKEN_BUCKET_LUA)
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._overload: Optional[Rejection] = None
+
+    def _check_overload(self) -> Optional[Rejection]:
+        """Check shared resources, returning a rejection if any is exhausted."""
+        settings = get_settings()
+        retry_after = settings.admission_retry_after
+
+        queued = sum(queue.count for queue in Queue.all(connection=self.redis_client))
+        if queued >= settings.admission_max_queued:
+            return Rejection(503, f"Too many queued tasks ({queued})", retry_after)
+
+        free = shutil.disk_usage(settings.task_storage_path).free
+        if free < settings.admission_min_free_disk:
+            return Rejection(503, f"Task storage almost full ({free} bytes free)", retry_after)
+
+        memory = self.redis_client.info("memory")
+        limit = memory.get("maxmemory") or settings.admission_redis_max_memory
+        if limit and memory["used_memory"] >= limit * settings.admission_max_redis_memory_ratio:
+            return Rejection(503, f"Redis memory almost full ({memory['used_memory']}/{limit} bytes)", retry_after)
+
+        return None
+
+    def overload(self) -> Optional[Rejection]:
+        """Return the cached overload state, refreshing it when stale."""
+        settings = get_settings()
+        with self._lock:
+            now = time.monotonic()
+            if now - self._checked_at >= settings.admission_cache_seconds:
+                self._overload = self._check_overload()
+                self._checked_at = now
+            return self._overload
+
+    def rate_limit(self, client_id: str) -> Optional[Rejection]:
+        """Take one token from a client's bucket, or reject if it is empty."""
+        settings = get_settings()
+        if settings.admission_rate <= 0:
+            return None
+
+        wait = float(self._token_bucket(
+            keys=[f"admission:client:{client_id}"],
+            args=[settings.admission_rate, settings.admission_burst]
+        ))
+        if wait > 0:
+            return Rejection(429, "Submission rate limit exceeded", wait)
+        return None
+
+    def admit(self, client_id: str) -> Optional[Rejection]:
+        """Check a new submission; ``None`` means it may proceed."""
+        # Overload first: shed load without spending the client's tokens
+        return self.overload() or self.rate_limit(client_id)
@@ -1,9 +1,11 @@
 """Configuration management for Helios project."""
 
 import os
+import socket
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, Optional
 
+from pydantic import Field
 from pydantic_settings import BaseSettings
 
 
@@ -19,6 +21,36 @@ class Settings(BaseSettings):
     # Task storage settings
     task_storage_path: str = "/var/helios/tasks"
     
+    # Dataset settings
+    dataset_storage_path: str = "/var/helios/datasets"  # shared registry storage
+    dataset_cache_path: str = "/var/helios/cache/datasets"  # per-node extracted cache
+    dataset_cache_budget: int = 100 * 1024 * 1024 * 1024  # bytes per node, LRU evicted
+    
+    # Placement settings
+    worker_node: str = Field(default_factory=socket.gethostname)  # shared by workers on one host
+    locality_max_backlog: int = 4  # queued jobs before a node loses locality preference
+    pipeline_affinity_weight: int = 1024 * 1024 * 1024  # a warm pipeline workspace counts like this many cached bytes
+    
+    # Autoscaling settings (supervisor.py)
+    autoscale_min_workers: int = 1
+    autoscale_max_workers: int = 8
+    autoscale_interval: float = 5.0  # seconds between scaling decisions
+    autoscale_target_wait: float = 10.0  # queue wait that triggers an extra worker
+    autoscale_scale_down_delay: float = 60.0  # idle seconds before retiring workers
+    autoscale_worker_memory: int = 2 * 1024 * 1024 * 1024  # free memory needed per added worker
+    autoscale_max_load: float = 1.5  # load average per CPU above which no workers are added
+    
+    # Chunked upload settings
+    upload_chunk_size: int = 8 * 1024 * 1024
+    upload_max_chunk_size: int = 64 * 1024 * 1024
+    upload_max_size: int = 50 * 1024 * 1024 * 1024
+    upload_session_ttl: int = 24 * 3600  # seconds an idle upload session is kept
+    upload_cleanup_interval: float = 3600.0  # seconds between sweeps of expired uploads, 0 sweeps at startup only
+    
+    # Log archive settings
+    log_archive_path: str = "/var/helios/logs"
+    log_archive_chunk_bytes: int = 1024 * 1024  # uncompressed bytes per chunk
+    
     # API settings
     api_host: str = "0.0.0.0"
     api_port: int = 8000
@@ -30,6 +62,37 @@ class Settings(BaseSettings):
     # Docker settings
     docker_timeout: int = 3600  # 1 hour default timeout
     
+    # Executor settings
+    queue_executors: Dict[str, str] = Field(default_factory=dict)  # queue name to executor for tasks that name none
+    allow_subprocess_executor: bool = False  # run trusted tasks as host processes without Docker
+    venv_cache_path: str = "/var/helios/cache/venvs"  # per-node virtualenvs for the subprocess executor
+    venv_cache_budget: int = 20 * 1024 * 1024 * 1024  # bytes per node, LRU evicted
+    environment_cache_path: str = "/var/helios/cache/environments"  # per-node installed requirements for Docker tasks
+    environment_cache_budget: int = 20 * 1024 * 1024 * 1024  # bytes per node, LRU evicted
+    environment_affinity_weight: int = 256 * 1024 * 1024  # a prepared environment counts like this many cached bytes
+    environment_prepare_ttl: int = 600  # seconds a prefetch is assumed in flight before it may be retried
+    subprocess_cgroup_root: str = "/sys/fs/cgroup/helios"  # delegated cgroup v2 subtree, rlimits if not writable
+    
+    # Telemetry settings
+    telemetry_interval: float = 2.0  # seconds between samples, 0 disables
+    telemetry_max_points: int = 240  # stored series is downsampled to this size
+    
+    # Admission control settings (new submissions only)
+    admission_enabled: bool = True
+    admission_max_queued: int = 1000  # queued tasks across all queues
+    admission_min_free_disk: int = 5 * 1024 * 1024 * 1024  # bytes free in task storage
+    admission_max_redis_memory_ratio: float = 0.9  # of Redis maxmemory
+    admission_redis_max_memory: int = 0  # limit to assume when Redis has no maxmemory, 0 = unchecked
+    admission_rate: float = 1.0  # sustained submissions per second per client, 0 disables
+    admission_burst: int = 20  # submissions a client may make at once
+    admission_retry_after: float = 15.0  # seconds suggested to clients when overloaded
+    admission_cache_seconds: float = 1.0  # how long overload checks are reused
+    
+    # Task metrics settings
+    metrics_max_series: int = 64  # distinct metric names kept per task
+    metrics_max_points: int = 240  # each stored metric series is downsampled to this size
+    metrics_publish_interval: float = 0.5  # minimum seconds between live updates of one metric
+    
     # Logging settings
     log_level: str = "INFO"
     log_format: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
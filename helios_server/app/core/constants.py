@@ -1,6 +1,7 @@
 """Constants for Helios project."""
 
 from enum import Enum
+from typing import List, Optional
 
 
 class TaskStatus(str, Enum):
@@ -11,21 +12,82 @@ class TaskStatus(str, Enum):
     FAILED = "failed"
 
 
+class StageStatus(str, Enum):
+    """Pipeline stage status enumeration."""
+    WAITING = "waiting"
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    BLOCKED = "blocked"
+
+
 class TaskPriority(str, Enum):
     """Task priority enumeration."""
     HIGH = "high"
     DEFAULT = "default"
 
 
+class TaskExecutor(str, Enum):
+    """Backend that runs a task's entrypoint."""
+    DOCKER = "docker"
+    SUBPROCESS = "subprocess"
+
+
+class EnvironmentStatus(str, Enum):
+    """State of a requested environment prefetch."""
+    EMPTY = "empty"
+    READY = "ready"
+    PREPARING = "preparing"
+    SKIPPED = "skipped"
+
+
 class QueueNames:
     """RQ queue names."""
     HIGH = "high"
     DEFAULT = "default"
+    PREPARE = "prepare"
+    NODE_PREFIX = "node:"
+    
+    @classmethod
+    def for_priority(cls, priority: str) -> str:
+        """Shared queue for a task priority."""
+        return cls.HIGH if priority == TaskPriority.HIGH else cls.DEFAULT
+    
+    @classmethod
+    def for_node(cls, node: str, queue_name: str) -> str:
+        """Queue only consumed by workers on one node."""
+        return f"{cls.NODE_PREFIX}{node}:{queue_name}"
+    
+    @classmethod
+    def for_worker(cls, node: str) -> List[str]:
+        """Queues a worker on ``node`` consumes, in priority order.
+        
+        Node queues carry tasks placed there for locality; each is checked
+        before the shared queue of the same priority. Environment prefetch
+        jobs come first, since a task is usually about to need them.
+        """
+        return [
+            cls.PREPARE,
+            cls.for_node(node, cls.HIGH),
+            cls.HIGH,
+            cls.for_node(node, cls.DEFAULT),
+            cls.DEFAULT,
+        ]
+    
+    @classmethod
+    def node_of(cls, queue_name: str) -> Optional[str]:
+        """Return the node a node-specific queue belongs to, or ``None``."""
+        if not queue_name.startswith(cls.NODE_PREFIX):
+            return None
+        return queue_name[len(cls.NODE_PREFIX):].rsplit(":", 1)[0]
 
 
 class RedisChannels:
     """Redis Pub/Sub channel patterns."""
     LOGS_PREFIX = "logs:"
+    STATS_PREFIX = "stats:"
+    METRICS_PREFIX = "metrics:"
 
 
 class TaskSignals:
@@ -34,8 +96,26 @@ class TaskSignals:
     FAILED_PREFIX = "[HELIOS_TASK_FAILED"
 
 
+class MetricsProtocol:
+    """Reserved stdout protocol for structured metrics emitted by task code."""
+    LINE_PREFIX = "@@helios "
+    HELPER_DIR = ".helios"
+    MAX_LINE_BYTES = 64 * 1024
+
+
+class StorageDirs:
+    """Reserved subdirectories of the task storage path."""
+    UPLOADS = ".uploads"
+    PIPELINES = ".pipelines"
+
+
 class DockerSettings:
     """Docker-related settings."""
     CONTAINER_WORK_DIR = "/app"
     MOUNT_POINT = "/app"
+    DATASETS_MOUNT_POINT = "/datasets"
+    # Python user base kept in a reused workspace (relative to the mount point)
+    USER_BASE_DIR = ".helios/userbase"
+    # Cached Python user base with a task's requirements, mounted read-only
+    ENV_MOUNT_POINT = "/helios-env"
     AUTO_REMOVE = True
\ No newline at end of file
@@ -0,0 +1,26 @@
+"""Dataset registry records in Redis."""
+
+from typing import Any, Dict, Optional
+
+import redis
+
+
+def dataset_nodes_key(name: str, version: str) -> str:
+    """Redis set of nodes holding a dataset version in their cache."""
+    return f"dataset:{name}:{version}:nodes"
+
+
+def get_dataset(redis_client: redis.Redis, name: str) -> Optional[Dict[str, Any]]:
+    """Load a registered dataset record, or ``None`` if it does not exist."""
+    record = redis_client.hgetall(f"dataset:{name}")
+    if not record:
+        return None
+    
+    version = record["version"]
+    return {
+        "name": name,
+        "version": version,
+        "size": int(record["size"]),
+        "created_at": float(record["created_at"]),
+        "nodes": sorted(redis_client.smembers(dataset_nodes_key(name, version))),
+    }
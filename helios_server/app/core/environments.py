@@ -0,0 +1,49 @@
+"""Prepared task environment records in Redis.
+
+A task's environment is identified by the executor that runs it and the
+hash of its ``requirements.txt``. Workers advertise the environments in
+their node-local cache in ``environment:<executor>:<digest>:nodes``, so
+tasks can be placed where their dependencies are already installed.
+"""
+
+import hashlib
+from typing import Optional
+
+from app.core.config import get_settings
+from app.core.constants import QueueNames, TaskExecutor
+
+
+def environment_digest(requirements: bytes) -> str:
+    """Identify an environment by the contents of ``requirements.txt``."""
+    return hashlib.sha256(requirements).hexdigest()[:16]
+
+
+def environment_nodes_key(executor: str, digest: str) -> str:
+    """Redis set of nodes with an environment ready or being built in their cache."""
+    return f"environment:{executor}:{digest}:nodes"
+
+
+def environment_preparing_key(executor: str, digest: str) -> str:
+    """Redis flag set while a prefetch job for an environment is queued or running."""
+    return f"environment:{executor}:{digest}:preparing"
+
+
+def queue_executor(task_executor: Optional[str], queue_name: Optional[str]) -> str:
+    """Executor a task runs with: its own choice, else its queue's, else Docker.
+
+    Node queues use the executor configured for their shared queue.
+    """
+    settings = get_settings()
+    if task_executor:
+        return task_executor
+    if queue_name:
+        base_queue = queue_name.rsplit(":", 1)[-1]
+        executor = settings.queue_executors.get(queue_name) or settings.queue_executors.get(base_queue)
+        if executor:
+            return executor
+    return TaskExecutor.DOCKER.value
+
+
+def priority_executor(task_executor: Optional[str], priority: str) -> str:
+    """Executor a task submitted with ``priority`` will run with."""
+    return queue_executor(task_executor, QueueNames.for_priority(priority))
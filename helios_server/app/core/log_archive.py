@@ -0,0 +1,288 @@
+"""Compressed, indexed archive of task logs.
+
+A task's log is stored as a directory holding:
+
+* ``log.gz``    - one gzip member per chunk, concatenated (valid for ``zcat``)
+* ``index.bin`` - one fixed-size record per chunk locating it by line number
+* ``bloom.bin`` - one fixed-size trigram Bloom filter per chunk for ``grep``
+* ``meta.json`` - written when the task finishes
+
+Chunk records are appended after their data, so a reader can serve a
+running task's log up to the last flushed chunk.
+"""
+
+import gzip
+import json
+import struct
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+# first_line, raw_offset, comp_offset, comp_length, line_count
+INDEX_RECORD = struct.Struct("<QQQII")
+BLOOM_BYTES = 8192
+BLOOM_BITS = BLOOM_BYTES * 8
+BLOOM_HASHES = 3
+
+# Maps every byte outside [A-Za-z0-9_] to a space so words split in C
+_WORD_BYTES = b"ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789_"
+_NON_WORD_TO_SPACE = bytes(b if b in _WORD_BYTES else 0x20 for b in range(256))
+
+
+def _trigrams(data: bytes) -> set:
+    """Collect trigrams of every non-numeric word in ``data``.
+
+    Only words are indexed, which keeps the filter cheap to build; any
+    literal search term is split the same way, and every word piece of a
+    term occurring in a line lies inside one of that line's words. Purely
+    numeric words (counters, timestamps) are skipped on both sides since
+    they would flood the filter without helping typical searches.
+    """
+    grams = set()
+    for word in set(data.translate(_NON_WORD_TO_SPACE).split()):
+        if word.isdigit():
+            continue
+        for i in range(len(word) - 2):
+            grams.add(word[i:i + 3])
+    return grams
+
+
+def _bloom_positions(gram: bytes) -> Iterator[int]:
+    """Yield the bit positions of a trigram using double hashing."""
+    h1 = zlib.crc32(gram)
+    h2 = zlib.adler32(gram) | 1
+    for i in range(BLOOM_HASHES):
+        yield (h1 + i * h2) % BLOOM_BITS
+
+
+def _build_bloom(data: bytes) -> bytes:
+    """Build the Bloom filter for a chunk."""
+    bits = bytearray(BLOOM_BYTES)
+    for gram in _trigrams(data):
+        for pos in _bloom_positions(gram):
+            bits[pos >> 3] |= 1 << (pos & 7)
+    return bytes(bits)
+
+
+class LogArchiveWriter:
+    """Append-only writer used by the worker while a task runs."""
+
+    def __init__(self, path: Path, chunk_bytes: int = 1024 * 1024):
+        """Create the archive directory and open its files."""
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.chunk_bytes = chunk_bytes
+
+        self._log = open(self.path / "log.gz", "wb")
+        self._index = open(self.path / "index.bin", "wb")
+        self._bloom = open(self.path / "bloom.bin", "wb")
+
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+        self.total_lines = 0
+        self.total_bytes = 0
+        self._comp_offset = 0
+        self._chunks = 0
+
+    def write_line(self, text: str) -> None:
+        """Buffer a log line, flushing a chunk when it is full.
+
+        Text spanning several lines is stored as that many lines, keeping
+        the index's line numbers in step with the stored data.
+        """
+        if "\n" in text:
+            for piece in text.split("\n"):
+                self.write_line(piece)
+            return
+
+        line = text.encode("utf-8", errors="replace") + b"\n"
+        self._pending.append(line)
+        self._pending_bytes += len(line)
+        if self._pending_bytes >= self.chunk_bytes:
+            self.flush()
+
+    def flush(self) -> None:
+        """Compress and index buffered lines as one chunk."""
+        if not self._pending:
+            return
+
+        data = b"".join(self._pending)
+        compressed = gzip.compress(data, compresslevel=6, mtime=0)
+
+        self._log.write(compressed)
+        self._log.flush()
+        self._bloom.write(_build_bloom(data))
+        self._bloom.flush()
+        self._index.write(INDEX_RECORD.pack(
+            self.total_lines,
+            self.total_bytes,
+            self._comp_offset,
+            len(compressed),
+            len(self._pending)
+        ))
+        self._index.flush()
+
+        self.total_lines += len(self._pending)
+        self.total_bytes += len(data)
+        self._comp_offset += len(compressed)
+        self._chunks += 1
+        self._pending = []
+        self._pending_bytes = 0
+
+    def close(self) -> None:
+        """Flush remaining lines and mark the archive complete."""
+        self.flush()
+        for f in (self._log, self._index, self._bloom):
+            f.close()
+
+        meta = {
+            "total_lines": self.total_lines,
+            "total_bytes": self.total_bytes,
+            "compressed_bytes": self._comp_offset,
+            "chunks": self._chunks,
+            "complete": True
+        }
+        with open(self.path / "meta.json", "w") as f:
+            json.dump(meta, f)
+
+
+class LogArchiveReader:
+    """Random-access reader serving line ranges and searches."""
+
+    def __init__(self, path: Path):
+        """Load the chunk index of an archive."""
+        self.path = Path(path)
+        if not (self.path / "index.bin").exists():
+            raise FileNotFoundError(f"No log archive at {self.path}")
+
+        index = (self.path / "index.bin").read_bytes()
+        # Ignore a torn trailing record from a writer still running
+        self._index = index[:len(index) - len(index) % INDEX_RECORD.size]
+        self.chunks = len(self._index) // INDEX_RECORD.size
+        self.complete = (self.path / "meta.json").exists()
+
+    def _record(self, chunk: int) -> Tuple[int, int, int, int, int]:
+        """Return the index record of a chunk."""
+        return INDEX_RECORD.unpack_from(self._index, chunk * INDEX_RECORD.size)
+
+    @property
+    def total_lines(self) -> int:
+        """Number of lines flushed to the archive."""
+        if not self.chunks:
+            return 0
+        first_line, _, _, _, line_count = self._record(self.chunks - 1)
+        return first_line + line_count
+
+    def _find_chunk(self, line: int) -> int:
+        """Binary search the chunk containing a line number."""
+        lo, hi = 0, self.chunks - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self._record(mid)[0] <= line:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo
+
+    def _read_chunk(self, log_file, chunk: int) -> List[bytes]:
+        """Decompress a single chunk into its lines."""
+        _, _, comp_offset, comp_length, _ = self._record(chunk)
+        log_file.seek(comp_offset)
+        data = zlib.decompress(log_file.read(comp_length), 16 + zlib.MAX_WBITS)
+        return data.split(b"\n")[:-1]
+
+    def _chunk_may_contain(self, bloom_file, chunk: int, grams: set) -> bool:
+        """Check a chunk's Bloom filter for all trigrams of a search term."""
+        if not grams:
+            return True
+        bloom_file.seek(chunk * BLOOM_BYTES)
+        bits = bloom_file.read(BLOOM_BYTES)
+        for gram in grams:
+            for pos in _bloom_positions(gram):
+                if not bits[pos >> 3] & (1 << (pos & 7)):
+                    return False
+        return True
+
+    def _clamp(self, from_line: Optional[int], to_line: Optional[int]) -> Tuple[int, int]:
+        """Resolve a half-open line range, allowing negative offsets from the end."""
+        total = self.total_lines
+        start = 0 if from_line is None else from_line
+        end = total if to_line is None else to_line
+        if start < 0:
+            start += total
+        if end < 0:
+            end += total
+        return max(0, min(start, total)), max(0, min(end, total))
+
+    def read_lines(
+        self,
+        from_line: Optional[int] = None,
+        to_line: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Tuple[int, str]]:
+        """Return ``(line_number, text)`` pairs for ``[from_line, to_line)``."""
+        start, end = self._clamp(from_line, to_line)
+        if limit is not None:
+            end = min(end, start + limit)
+        if start >= end:
+            return []
+
+        result = []
+        with open(self.path / "log.gz", "rb") as log_file:
+            chunk = self._find_chunk(start)
+            while chunk < self.chunks:
+                first_line = self._record(chunk)[0]
+                if first_line >= end:
+                    break
+                for offset, line in enumerate(self._read_chunk(log_file, chunk)):
+                    number = first_line + offset
+                    if start <= number < end:
+                        result.append((number, line.decode("utf-8", errors="replace")))
+                chunk += 1
+        return result
+
+    def grep(
+        self,
+        pattern: str,
+        from_line: Optional[int] = None,
+        to_line: Optional[int] = None,
+        limit: int = 1000
+    ) -> List[Tuple[int, str]]:
+        """Return lines containing a literal substring, skipping chunks by Bloom filter."""
+        start, end = self._clamp(from_line, to_line)
+        if start >= end:
+            return []
+
+        needle = pattern.encode("utf-8")
+        grams = _trigrams(needle)
+
+        result = []
+        with open(self.path / "log.gz", "rb") as log_file, \
+                open(self.path / "bloom.bin", "rb") as bloom_file:
+            chunk = self._find_chunk(start)
+            while chunk < self.chunks and len(result) < limit:
+                first_line = self._record(chunk)[0]
+                if first_line >= end:
+                    break
+                if self._chunk_may_contain(bloom_file, chunk, grams):
+                    for offset, line in enumerate(self._read_chunk(log_file, chunk)):
+                        number = first_line + offset
+                        if start <= number < end and needle in line:
+                            result.append((number, line.decode("utf-8", errors="replace")))
+                            if len(result) >= limit:
+                                break
+                chunk += 1
+        return result
+
+
+def archive_path(task_id: str, root: str) -> Path:
+    """Return the archive directory of a task."""
+    return Path(root) / task_id
+
+
+def open_archive(task_id: str, root: str) -> Optional[LogArchiveReader]:
+    """Open a task's log archive, or return ``None`` if it does not exist."""
+    try:
+        return LogArchiveReader(archive_path(task_id, root))
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,265 @@
+"""Pipeline stage scheduling shared by the manager and workers.
+
+A pipeline is a set of stages with dependencies that share one
+workspace directory. Its state lives in Redis:
+
+* ``pipeline:<id>``          - hash with name, priority, status, workspace
+* ``pipeline:<id>:stages``   - hash of stage name to JSON stage state
+* ``pipeline:<id>:stage:<name>:nodes`` - nodes that ran the stage
+
+Every state change goes through ``pipeline_lock``. Workers advance the
+pipeline when a stage finishes, so no scheduler process is needed.
+"""
+
+import json
+import shutil
+import time
+import uuid
+from typing import Any, Dict, List
+
+import redis
+from rq import Queue
+from rq.exceptions import NoSuchJobError
+from rq.job import Job
+
+from app.api.models import TaskInfo
+from app.core.config import get_settings
+from app.core.constants import StageStatus, TaskStatus
+from app.core.datasets import dataset_nodes_key
+from app.core.placement import choose_queue
+
+ACTIVE_STAGE_STATUSES = (StageStatus.WAITING, StageStatus.PENDING, StageStatus.RUNNING)
+
+
+def pipeline_key(pipeline_id: str) -> str:
+    """Redis hash holding a pipeline record."""
+    return f"pipeline:{pipeline_id}"
+
+
+def stage_nodes_key(pipeline_id: str, stage: str) -> str:
+    """Redis set of nodes whose workspace copy a stage last ran in."""
+    return f"pipeline:{pipeline_id}:stage:{stage}:nodes"
+
+
+def pipeline_lock(redis_client: redis.Redis, pipeline_id: str):
+    """Lock serializing state changes of one pipeline."""
+    return redis_client.lock(f"pipeline:{pipeline_id}:lock", timeout=60, blocking_timeout=60)
+
+
+def topological_order(dependencies: Dict[str, List[str]]) -> List[str]:
+    """Order stages so every stage follows its dependencies.
+
+    Raises ``ValueError`` for unknown dependencies and cycles.
+    """
+    for name, depends_on in dependencies.items():
+        for dependency in depends_on:
+            if dependency not in dependencies:
+                raise ValueError(f"Stage {name} depends on unknown stage {dependency}")
+
+    order: List[str] = []
+    remaining = dict(dependencies)
+    while remaining:
+        ready = [name for name, depends_on in remaining.items() if all(d not in remaining for d in depends_on)]
+        if not ready:
+            raise ValueError(f"Dependency cycle between stages: {', '.join(sorted(remaining))}")
+        for name in ready:
+            order.append(name)
+            del remaining[name]
+    return order
+
+
+def load_stages(redis_client: redis.Redis, pipeline_id: str) -> Dict[str, Dict[str, Any]]:
+    """Load the state of every stage of a pipeline."""
+    raw = redis_client.hgetall(f"{pipeline_key(pipeline_id)}:stages")
+    return {name: json.loads(state) for name, state in raw.items()}
+
+
+def save_stage(redis_client: redis.Redis, pipeline_id: str, name: str, state: Dict[str, Any]) -> None:
+    """Store the state of one stage."""
+    redis_client.hset(f"{pipeline_key(pipeline_id)}:stages", name, json.dumps(state))
+
+
+def create_pipeline(
+    redis_client: redis.Redis,
+    pipeline_id: str,
+    name: str,
+    priority: str,
+    workspace: str,
+    stages: Dict[str, Dict[str, Any]]
+) -> None:
+    """Register a pipeline whose workspace is already extracted and start it.
+
+    ``stages`` maps stage names to ``entrypoint``, ``depends_on``,
+    ``resources``, ``executor`` and ``datasets`` (name to
+    ``{"version", "size"}``).
+    """
+    order = topological_order({stage: spec["depends_on"] for stage, spec in stages.items()})
+
+    redis_client.hset(pipeline_key(pipeline_id), mapping={
+        "name": name,
+        "priority": priority,
+        "status": TaskStatus.RUNNING,
+        "workspace": workspace,
+        "order": json.dumps(order),
+        "created_at": time.time(),
+    })
+    for stage, spec in stages.items():
+        save_stage(redis_client, pipeline_id, stage, {
+            **spec,
+            "status": StageStatus.WAITING,
+            "task_id": None,
+            "node": None,
+            "attempts": 0,
+        })
+
+    with pipeline_lock(redis_client, pipeline_id):
+        advance_pipeline(redis_client, pipeline_id)
+
+
+def _enqueue_stage(
+    redis_client: redis.Redis,
+    pipeline_id: str,
+    pipeline: Dict[str, str],
+    name: str,
+    state: Dict[str, Any]
+) -> None:
+    """Enqueue one stage as a task running in the pipeline workspace."""
+    settings = get_settings()
+    task_id = str(uuid.uuid4())
+
+    task_info = TaskInfo(
+        task_id=task_id,
+        task_path=pipeline["workspace"],
+        entrypoint=state["entrypoint"],
+        priority=pipeline["priority"],
+        name=f"{pipeline['name']}/{name}",
+        resources=state["resources"],
+        datasets={dataset: record["version"] for dataset, record in state["datasets"].items()},
+        pipeline_id=pipeline_id,
+        stage=name,
+        executor=state.get("executor")
+    )
+
+    # Follow the workspace: prefer the nodes that ran the dependencies,
+    # where the page cache and installed environment are still warm
+    holders = [
+        (stage_nodes_key(pipeline_id, dependency), settings.pipeline_affinity_weight)
+        for dependency in state["depends_on"]
+    ]
+    holders += [
+        (dataset_nodes_key(dataset, record["version"]), record["size"])
+        for dataset, record in state["datasets"].items()
+    ]
+    queue_name = choose_queue(redis_client, pipeline["priority"], holders)
+
+    state.update(status=StageStatus.PENDING, task_id=task_id, node=None, attempts=state["attempts"] + 1)
+    save_stage(redis_client, pipeline_id, name, state)
+    redis_client.set(f"task:{task_id}:status", TaskStatus.PENDING)
+
+    Queue(queue_name, connection=redis_client).enqueue(
+        "app.worker.tasks.run_task",
+        task_info.dict(),
+        job_id=task_id,
+        job_timeout=settings.docker_timeout
+    )
+
+
+def advance_pipeline(redis_client: redis.Redis, pipeline_id: str) -> str:
+    """Enqueue stages whose dependencies succeeded and update the pipeline status.
+
+    Stages downstream of a failure are marked blocked. Once no stage can
+    run any more, the pipeline succeeds (and its workspace is removed) or
+    fails (and its workspace is kept for a retry). Call with the pipeline
+    lock held; returns the pipeline status.
+    """
+    pipeline = redis_client.hgetall(pipeline_key(pipeline_id))
+    stages = load_stages(redis_client, pipeline_id)
+
+    for name in json.loads(pipeline["order"]):
+        state = stages[name]
+        if state["status"] != StageStatus.WAITING:
+            continue
+        upstream = [stages[dependency]["status"] for dependency in state["depends_on"]]
+        if any(status in (StageStatus.FAILED, StageStatus.BLOCKED) for status in upstream):
+            state["status"] = StageStatus.BLOCKED
+            save_stage(redis_client, pipeline_id, name, state)
+        elif all(status == StageStatus.SUCCEEDED for status in upstream):
+            _enqueue_stage(redis_client, pipeline_id, pipeline, name, state)
+
+    statuses = [state["status"] for state in stages.values()]
+    if any(status in ACTIVE_STAGE_STATUSES for status in statuses):
+        status = TaskStatus.RUNNING
+    elif all(status == StageStatus.SUCCEEDED for status in statuses):
+        status = TaskStatus.SUCCEEDED
+    else:
+        status = TaskStatus.FAILED
+
+    if status != pipeline["status"]:
+        redis_client.hset(pipeline_key(pipeline_id), "status", status)
+        print(f"Pipeline {pipeline_id} {status}")
+    if status == TaskStatus.SUCCEEDED:
+        shutil.rmtree(pipeline["workspace"], ignore_errors=True)
+
+    return status
+
+
+def start_stage(redis_client: redis.Redis, pipeline_id: str, name: str, node: str) -> None:
+    """Record that a worker on ``node`` started a stage."""
+    with pipeline_lock(redis_client, pipeline_id):
+        state = load_stages(redis_client, pipeline_id)[name]
+        state.update(status=StageStatus.RUNNING, node=node)
+        save_stage(redis_client, pipeline_id, name, state)
+
+
+def finish_stage(
+    redis_client: redis.Redis,
+    pipeline_id: str,
+    name: str,
+    succeeded: bool,
+    node: str
+) -> str:
+    """Record a finished stage and enqueue whatever it unblocked."""
+    with pipeline_lock(redis_client, pipeline_id):
+        state = load_stages(redis_client, pipeline_id)[name]
+        state.update(status=StageStatus.SUCCEEDED if succeeded else StageStatus.FAILED, node=node)
+        save_stage(redis_client, pipeline_id, name, state)
+
+        nodes_key = stage_nodes_key(pipeline_id, name)
+        redis_client.delete(nodes_key)
+        redis_client.sadd(nodes_key, node)
+
+        return advance_pipeline(redis_client, pipeline_id)
+
+
+def _reconcile_lost_stages(redis_client: redis.Redis, pipeline_id: str) -> None:
+    """Mark stages failed whose job died without reporting back (e.g. a timeout)."""
+    for name, state in load_stages(redis_client, pipeline_id).items():
+        if state["status"] not in (StageStatus.PENDING, StageStatus.RUNNING):
+            continue
+        try:
+            job_status = Job.fetch(state["task_id"], connection=redis_client).get_status()
+        except NoSuchJobError:
+            job_status = "failed"
+        if job_status in ("failed", "stopped", "canceled"):
+            state["status"] = StageStatus.FAILED
+            save_stage(redis_client, pipeline_id, name, state)
+
+
+def retry_pipeline(redis_client: redis.Redis, pipeline_id: str) -> str:
+    """Re-run failed stages and the stages they blocked.
+
+    Raises ``ValueError`` while stages are still running.
+    """
+    with pipeline_lock(redis_client, pipeline_id):
+        _reconcile_lost_stages(redis_client, pipeline_id)
+        stages = load_stages(redis_client, pipeline_id)
+        # Waiting stages only wait on others, so they do not keep a retry out
+        if any(state["status"] in (StageStatus.PENDING, StageStatus.RUNNING) for state in stages.values()):
+            raise ValueError("Pipeline still has running stages")
+
+        for name, state in stages.items():
+            if state["status"] in (StageStatus.FAILED, StageStatus.BLOCKED):
+                state["status"] = StageStatus.WAITING
+                save_stage(redis_client, pipeline_id, name, state)
+
+        return advance_pipeline(redis_client, pipeline_id)
@@ -0,0 +1,63 @@
+"""Locality-aware queue selection for Helios tasks."""
+
+from typing import Dict, List, Optional, Set, Tuple
+
+import redis
+from rq import Queue, Worker
+
+from app.core.config import get_settings
+from app.core.constants import QueueNames
+
+
+def live_nodes(redis_client: redis.Redis) -> Set[str]:
+    """Nodes with at least one registered worker listening on a node queue."""
+    nodes = set()
+    for worker in Worker.all(connection=redis_client):
+        for queue_name in worker.queue_names():
+            node = QueueNames.node_of(queue_name)
+            if node:
+                nodes.add(node)
+    return nodes
+
+
+def choose_queue(
+    redis_client: redis.Redis,
+    priority: str,
+    holders: List[Tuple[str, int]]
+) -> str:
+    """Pick the queue a task should be enqueued on.
+    
+    ``holders`` lists ``(redis set key, weight)`` pairs, where each set
+    holds the nodes that already have a resource the task needs (for
+    example a cached dataset) and the weight is what fetching it would
+    cost. The live node holding the most weight wins, ties going to the
+    shorter node queue. Nodes whose queue backlog exceeds
+    ``locality_max_backlog`` are skipped, and with no suitable holder the
+    task goes to the shared priority queue.
+    """
+    settings = get_settings()
+    shared_queue = QueueNames.for_priority(priority)
+    if not holders:
+        return shared_queue
+    
+    scores: Dict[str, int] = {}
+    for key, weight in holders:
+        for node in redis_client.smembers(key):
+            scores[node] = scores.get(node, 0) + weight
+    if not scores:
+        return shared_queue
+    
+    alive = live_nodes(redis_client)
+    best: Optional[Tuple[int, int, str]] = None
+    for node, score in scores.items():
+        if node not in alive:
+            continue
+        queue_name = QueueNames.for_node(node, shared_queue)
+        backlog = Queue(queue_name, connection=redis_client).count
+        if backlog > settings.locality_max_backlog:
+            continue
+        candidate = (score, -backlog, queue_name)
+        if best is None or candidate > best:
+            best = candidate
+    
+    return best[2] if best else shared_queue
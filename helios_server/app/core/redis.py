@@ -1,6 +1,7 @@
 """Redis connection management for Helios."""
 
 import redis
+import redis.asyncio
 from typing import Generator
 
 from app.core.config import get_settings
@@ -18,6 +19,18 @@ def get_redis_client() -> redis.Redis:
     )
 
 
+def get_async_redis_client() -> redis.asyncio.Redis:
+    """Get asyncio Redis client instance for use inside the event loop."""
+    settings = get_settings()
+    return redis.asyncio.Redis(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        db=settings.redis_db,
+        password=settings.redis_password,
+        decode_responses=True
+    )
+
+
 def get_redis_pubsub() -> Generator[redis.client.PubSub, None, None]:
     """Get Redis PubSub instance."""
     redis_client = get_redis_client()
@@ -1,20 +1,34 @@
 """FastAPI application for Helios Manager."""
 
+import asyncio
 import logging
+import math
 import sys
 from pathlib import Path
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
 # Add project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+from app.api.datasets import router as datasets_router
+from app.api.environments import router as environments_router
+from app.api.pipelines import router as pipelines_router
 from app.api.tasks import router as tasks_router
+from app.api.uploads import router as uploads_router, sweep_stale_uploads
+from app.core.admission import AdmissionController
 from app.core.config import get_settings
-from app.websocket.manager import websocket_endpoint
+from app.core.redis import get_redis_client
+from app.websocket.manager import (
+    metrics_websocket_endpoint,
+    stats_websocket_endpoint,
+    websocket_endpoint,
+)
 
 
 @asynccontextmanager
@@ -36,10 +50,19 @@ async def lifespan(app: FastAPI):
     import os
     os.makedirs(settings.task_storage_path, exist_ok=True)
     
+    # Drop staged uploads whose sessions expired, including while the manager was down
+    upload_sweeper = asyncio.create_task(
+        sweep_stale_uploads(get_redis_client(), settings.upload_cleanup_interval)
+    )
+    
+    # One controller per process so overload checks are shared across requests
+    app.state.admission = AdmissionController(get_redis_client())
+    
     yield
     
     # Shutdown
     logger.info("Helios Manager shutting down...")
+    upload_sweeper.cancel()
 
 
 # Create FastAPI application
@@ -50,6 +73,37 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+# Endpoints creating new work; subject to admission control
+ADMISSION_PATHS = {
+    "/api/v1/tasks/submit",
+    "/api/v1/uploads",
+    "/api/v1/pipelines",
+}
+
+
+@app.middleware("http")
+async def admission_control(request: Request, call_next):
+    """Shed new submissions before their body is read when overloaded or rate limited."""
+    settings = get_settings()
+    if settings.admission_enabled and request.method == "POST" and request.url.path in ADMISSION_PATHS:
+        client_id = request.client.host if request.client else "unknown"
+        try:
+            rejection = await run_in_threadpool(request.app.state.admission.admit, client_id)
+        except Exception as e:
+            # Admission is a safeguard; a failing check must not block submissions
+            logging.getLogger(__name__).warning(f"Admission check failed: {e}")
+            rejection = None
+        
+        if rejection is not None:
+            return JSONResponse(
+                status_code=rejection.status_code,
+                content={"detail": rejection.detail},
+                headers={"Retry-After": str(max(1, math.ceil(rejection.retry_after)))}
+            )
+    
+    return await call_next(request)
+
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -61,9 +115,15 @@ app.add_middleware(
 
 # Include API routers
 app.include_router(tasks_router, prefix="/api/v1/tasks", tags=["tasks"])
+app.include_router(uploads_router, prefix="/api/v1/uploads", tags=["uploads"])
+app.include_router(datasets_router, prefix="/api/v1/datasets", tags=["datasets"])
+app.include_router(pipelines_router, prefix="/api/v1/pipelines", tags=["pipelines"])
+app.include_router(environments_router, prefix="/api/v1/environments", tags=["environments"])
 
 # Add WebSocket route
 app.websocket("/ws/logs/{task_id}")(websocket_endpoint)
+app.websocket("/ws/stats/{task_id}")(stats_websocket_endpoint)
+app.websocket("/ws/metrics/{task_id}")(metrics_websocket_endpoint)
 
 
 @app.get("/")
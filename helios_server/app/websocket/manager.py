@@ -4,18 +4,18 @@ import asyncio
 import json
 from typing import Dict, Set
 
-import redis
 from fastapi import WebSocket, WebSocketDisconnect
 
-from app.core.config import get_settings
 from app.core.constants import RedisChannels
+from app.core.redis import get_async_redis_client
 
 
 class ConnectionManager:
-    """Manages WebSocket connections and log forwarding."""
+    """Manages WebSocket connections and forwarding of one Redis channel family."""
     
-    def __init__(self):
+    def __init__(self, channel_prefix: str = RedisChannels.LOGS_PREFIX):
         """Initialize connection manager."""
+        self.channel_prefix = channel_prefix
         self.active_connections: Dict[str, Set[WebSocket]] = {}
     
     async def connect(self, websocket: WebSocket, task_id: str):
@@ -24,11 +24,11 @@ class ConnectionManager:
         
         if task_id not in self.active_connections:
             self.active_connections[task_id] = set()
+            
+            # Start one forwarding task per task ID, shared by all its sockets
+            asyncio.create_task(self.forward_logs(task_id))
         
         self.active_connections[task_id].add(websocket)
-        
-        # Start log forwarding task
-        asyncio.create_task(self.forward_logs(task_id))
     
     def disconnect(self, websocket: WebSocket, task_id: str):
         """Disconnect WebSocket connection."""
@@ -52,61 +52,73 @@ class ConnectionManager:
         if task_id not in self.active_connections:
             return
         
-        channel_name = f"{RedisChannels.LOGS_PREFIX}{task_id}"
+        channel_name = f"{self.channel_prefix}{task_id}"
+        redis_client = get_async_redis_client()
+        pubsub = redis_client.pubsub()
         
         try:
-            settings = get_settings()
-            redis_client = redis.Redis(
-                host=settings.redis_host,
-                port=settings.redis_port,
-                db=settings.redis_db,
-                password=settings.redis_password,
-                decode_responses=True
-            )
-            pubsub = redis_client.pubsub()
-            pubsub.subscribe(channel_name)
+            await pubsub.subscribe(channel_name)
             
-            for message in pubsub.listen():
-                if message['type'] == 'message':
-                    log_line = message['data']
-                    
-                    # Send to all connected WebSockets for this task
-                    disconnected = set()
-                    for websocket in self.active_connections[task_id].copy():
-                        try:
-                            await websocket.send_text(log_line)
-                        except Exception:
-                            disconnected.add(websocket)
-                    
-                    # Remove disconnected WebSockets
-                    for websocket in disconnected:
-                        self.disconnect(websocket, task_id)
+            # Stop once no more connections remain for this task
+            while task_id in self.active_connections:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message is None or message['type'] != 'message':
+                    continue
+                
+                log_line = message['data']
                 
-                # Stop if no more connections for this task
-                if task_id not in self.active_connections:
-                    break
+                # Send to all connected WebSockets for this task
+                disconnected = set()
+                for websocket in self.active_connections.get(task_id, set()).copy():
+                    try:
+                        await websocket.send_text(log_line)
+                    except Exception:
+                        disconnected.add(websocket)
+                
+                # Remove disconnected WebSockets
+                for websocket in disconnected:
+                    self.disconnect(websocket, task_id)
                     
         except Exception as e:
-            print(f"Error forwarding logs for task {task_id}: {e}")
+            print(f"Error forwarding {self.channel_prefix} for task {task_id}: {e}")
         finally:
             try:
-                pubsub.close()
+                await pubsub.close()
+                await redis_client.close()
             except:
                 pass
 
 
-manager = ConnectionManager()
+manager = ConnectionManager(RedisChannels.LOGS_PREFIX)
+stats_manager = ConnectionManager(RedisChannels.STATS_PREFIX)
+metrics_manager = ConnectionManager(RedisChannels.METRICS_PREFIX)
 
 
-async def websocket_endpoint(websocket: WebSocket, task_id: str):
-    """WebSocket endpoint for log streaming."""
-    await manager.connect(websocket, task_id)
+async def _serve(connection_manager: ConnectionManager, websocket: WebSocket, task_id: str):
+    """Keep a WebSocket registered with a connection manager until it closes."""
+    await connection_manager.connect(websocket, task_id)
     try:
-        while True:
-            # Keep connection alive and handle ping/pong
-            await asyncio.sleep(1)
+        # The forwarder sends; reading here is what notices the client leaving
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
     except WebSocketDisconnect:
-        manager.disconnect(websocket, task_id)
+        pass
     except Exception as e:
         print(f"WebSocket error for task {task_id}: {e}")
-        manager.disconnect(websocket, task_id)
\ No newline at end of file
+    finally:
+        connection_manager.disconnect(websocket, task_id)
+
+
+async def websocket_endpoint(websocket: WebSocket, task_id: str):
+    """WebSocket endpoint for log streaming."""
+    await _serve(manager, websocket, task_id)
+
+
+async def stats_websocket_endpoint(websocket: WebSocket, task_id: str):
+    """WebSocket endpoint for live container resource samples."""
+    await _serve(stats_manager, websocket, task_id)
+
+
+async def metrics_websocket_endpoint(websocket: WebSocket, task_id: str):
+    """WebSocket endpoint for metrics and progress reported by task code."""
+    await _serve(metrics_manager, websocket, task_id)
\ No newline at end of file
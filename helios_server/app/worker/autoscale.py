@@ -0,0 +1,370 @@
+"""Queue-driven worker autoscaling for Helios."""
+
+import math
+import os
+import random
+import signal
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+from rq import Queue, Worker
+from rq.job import Job
+
+from app.core.constants import QueueNames
+from app.core.placement import live_nodes
+
+
+class HostResources:
+    """Snapshot of the resources available on this host."""
+
+    def __init__(self, cpu_count: int, load_average: float, available_memory: int):
+        """Initialize snapshot."""
+        self.cpu_count = cpu_count
+        self.load_average = load_average
+        self.available_memory = available_memory
+
+    @classmethod
+    def sample(cls) -> "HostResources":
+        """Read CPU count, 1-minute load average and available memory."""
+        cpu_count = os.cpu_count() or 1
+        try:
+            load_average = os.getloadavg()[0]
+        except OSError:
+            load_average = 0.0
+
+        available_memory = 0
+        try:
+            with open("/proc/meminfo", "r") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        available_memory = int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            pass
+
+        return cls(cpu_count, load_average, available_memory)
+
+
+class QueueSnapshot:
+    """Queue state seen by one host's workers."""
+
+    def __init__(self, queued: int, busy: int, oldest_wait: float):
+        """Initialize snapshot."""
+        self.queued = queued
+        self.busy = busy
+        self.oldest_wait = oldest_wait
+
+
+class AutoscalePolicy:
+    """Decides how many worker processes a host should run.
+
+    Scale-up is immediate: enough workers are added to start every queued
+    job, and at least one more while the oldest job has waited longer than
+    ``target_wait``. Additions stop when the host runs short of memory or is
+    already loaded above ``max_load`` per CPU. Scale-down starts once the
+    queue has been empty with idle workers for ``scale_down_delay`` seconds,
+    so short gaps between bursts do not cause churn, and then retires one
+    idle worker per decision.
+    """
+
+    def __init__(
+        self,
+        min_workers: int,
+        max_workers: int,
+        target_wait: float = 10.0,
+        scale_down_delay: float = 60.0,
+        worker_memory: int = 0,
+        max_load: float = 0.0
+    ):
+        """Initialize policy."""
+        self.min_workers = min_workers
+        self.max_workers = max(min_workers, max_workers)
+        self.target_wait = target_wait
+        self.scale_down_delay = scale_down_delay
+        self.worker_memory = worker_memory
+        self.max_load = max_load
+        self._idle_since: Optional[float] = None
+
+    def _host_headroom(self, host: Optional[HostResources]) -> int:
+        """How many more workers the host can take."""
+        if host is None:
+            return self.max_workers
+        if self.max_load and host.load_average / host.cpu_count > self.max_load:
+            return 0
+        if self.worker_memory and host.available_memory:
+            return host.available_memory // self.worker_memory
+        return self.max_workers
+
+    def desired_workers(
+        self,
+        now: float,
+        current: int,
+        queues: QueueSnapshot,
+        host: Optional[HostResources] = None
+    ) -> int:
+        """Return the target worker count for this decision."""
+        target = current
+
+        if queues.queued > 0:
+            self._idle_since = None
+            wanted = queues.busy + queues.queued
+            if queues.oldest_wait > self.target_wait:
+                wanted = max(wanted, current + 1)
+            if wanted > current:
+                target = current + min(wanted - current, self._host_headroom(host))
+        else:
+            idle = current - queues.busy
+            if idle > 0:
+                if self._idle_since is None:
+                    self._idle_since = now
+                if now - self._idle_since >= self.scale_down_delay:
+                    target = current - 1
+            else:
+                self._idle_since = None
+
+        return max(self.min_workers, min(self.max_workers, target))
+
+
+class FixedPolicy:
+    """Baseline policy keeping a constant pool size."""
+
+    def __init__(self, workers: int):
+        """Initialize policy."""
+        self.workers = workers
+
+    def desired_workers(self, now: float, current: int, queues: QueueSnapshot,
+                        host: Optional[HostResources] = None) -> int:
+        """Always return the fixed pool size."""
+        return self.workers
+
+
+def bursty_arrivals(
+    duration: int,
+    base_rate: float,
+    burst_rate: float,
+    burst_every: int,
+    burst_length: int,
+    seed: int = 7
+) -> List[float]:
+    """Poisson arrival times with periodic bursts."""
+    rng = random.Random(seed)
+    arrivals = []
+    t = 0.0
+    while t < duration:
+        in_burst = int(t) % burst_every < burst_length
+        rate = burst_rate if in_burst else base_rate
+        t += rng.expovariate(rate)
+        if t < duration:
+            arrivals.append(t)
+    return arrivals
+
+
+def simulate(
+    policy,
+    arrivals: List[float],
+    service_time: Callable[[random.Random], float],
+    interval: float = 5.0,
+    startup_delay: float = 3.0,
+    initial_workers: int = 1,
+    seed: int = 11
+) -> Dict[str, float]:
+    """Discrete-time simulation of a worker pool driven by ``policy``.
+
+    Time advances in one-second steps. New workers become available after
+    ``startup_delay``; retired workers finish their current job first, as
+    RQ's warm shutdown does.
+    """
+    rng = random.Random(seed)
+    queue: List[float] = []
+    waits: List[float] = []
+    workers: List[Dict[str, float]] = [
+        {"ready_at": 0.0, "busy_until": 0.0, "retiring": 0} for _ in range(initial_workers)
+    ]
+    idle_worker_seconds = 0.0
+    worker_seconds = 0.0
+    peak = len(workers)
+    next_arrival = 0
+    next_decision = 0.0
+    end = (arrivals[-1] if arrivals else 0.0) + 600
+
+    t = 0.0
+    while t < end and (next_arrival < len(arrivals) or queue or
+                       any(w["busy_until"] > t for w in workers)):
+        while next_arrival < len(arrivals) and arrivals[next_arrival] <= t:
+            queue.append(arrivals[next_arrival])
+            next_arrival += 1
+
+        # Drained workers leave once their job is done
+        workers = [w for w in workers if not (w["retiring"] and w["busy_until"] <= t)]
+
+        for w in workers:
+            if queue and not w["retiring"] and w["ready_at"] <= t and w["busy_until"] <= t:
+                enqueued_at = queue.pop(0)
+                waits.append(t - enqueued_at)
+                w["busy_until"] = t + service_time(rng)
+
+        if t >= next_decision:
+            active = [w for w in workers if not w["retiring"]]
+            busy = sum(1 for w in active if w["busy_until"] > t)
+            snapshot = QueueSnapshot(len(queue), busy, t - queue[0] if queue else 0.0)
+            target = policy.desired_workers(t, len(active), snapshot)
+            for _ in range(target - len(active)):
+                workers.append({"ready_at": t + startup_delay, "busy_until": 0.0, "retiring": 0})
+            if target < len(active):
+                # Retire idle workers first, then the ones finishing soonest
+                for w in sorted(active, key=lambda w: w["busy_until"])[:len(active) - target]:
+                    w["retiring"] = 1
+            next_decision = t + interval
+
+        peak = max(peak, len(workers))
+        worker_seconds += len(workers)
+        idle_worker_seconds += sum(1 for w in workers if w["busy_until"] <= t)
+        t += 1.0
+
+    waits.sort()
+    return {
+        "jobs": len(waits),
+        "mean_wait": sum(waits) / len(waits) if waits else 0.0,
+        "p95_wait": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+        "max_wait": waits[-1] if waits else 0.0,
+        "worker_seconds": worker_seconds,
+        "idle_worker_seconds": idle_worker_seconds,
+        "peak_workers": peak,
+    }
+
+
+class WorkerSupervisor:
+    """Spawns and retires ``worker.py`` processes on ``node`` according to a policy."""
+
+    def __init__(self, policy: AutoscalePolicy, redis_conn, node: str, queue_names: List[str],
+                 worker_script: str):
+        """Initialize supervisor."""
+        self.policy = policy
+        self.redis_conn = redis_conn
+        self.node = node
+        self.queue_names = queue_names
+        self.worker_script = worker_script
+        self.processes: Dict[int, subprocess.Popen] = {}
+        self.draining: Dict[int, subprocess.Popen] = {}
+        self._stopping = False
+
+    def queue_snapshot(self) -> QueueSnapshot:
+        """Count queued jobs, busy local workers and the oldest queued job's wait.
+
+        Jobs on this node's queues count in full. Shared queues are drained
+        by every live node, so each host only scales for its share of them;
+        otherwise every supervisor would add workers for the whole backlog.
+        """
+        node_queued = 0
+        shared_queued = 0
+        oldest_wait = 0.0
+        now = datetime.now(timezone.utc)
+        for name in self.queue_names:
+            queue = Queue(name, connection=self.redis_conn)
+            count = queue.count
+            if QueueNames.node_of(name):
+                node_queued += count
+            else:
+                shared_queued += count
+            if not count:
+                continue
+            job_ids = queue.get_job_ids(0, 0)
+            if not job_ids:
+                continue
+            try:
+                enqueued_at = Job.fetch(job_ids[0], connection=self.redis_conn).enqueued_at
+            except Exception:
+                continue
+            if enqueued_at is not None:
+                if enqueued_at.tzinfo is None:
+                    enqueued_at = enqueued_at.replace(tzinfo=timezone.utc)
+                oldest_wait = max(oldest_wait, (now - enqueued_at).total_seconds())
+
+        queued = node_queued
+        if shared_queued:
+            nodes = live_nodes(self.redis_conn) | {self.node}
+            queued += math.ceil(shared_queued / len(nodes))
+
+        busy = 0
+        for worker in Worker.all(connection=self.redis_conn):
+            if worker.pid in self.processes and worker.get_state() == "busy":
+                busy += 1
+
+        return QueueSnapshot(queued, busy, oldest_wait)
+
+    def _idle_pids(self) -> List[int]:
+        """PIDs of local workers currently waiting for a job."""
+        return [
+            worker.pid for worker in Worker.all(connection=self.redis_conn)
+            if worker.pid in self.processes and worker.get_state() != "busy"
+        ]
+
+    def spawn(self) -> None:
+        """Start one worker process."""
+        process = subprocess.Popen(
+            [sys.executable, self.worker_script],
+            cwd=os.path.dirname(os.path.abspath(self.worker_script))
+        )
+        self.processes[process.pid] = process
+        print(f"Started worker process {process.pid} ({len(self.processes)} running)")
+
+    def retire(self) -> None:
+        """Ask one worker to finish its current job and exit (RQ warm shutdown)."""
+        idle = self._idle_pids()
+        if not idle:
+            return
+        pid = idle[0]
+        process = self.processes.pop(pid)
+        process.send_signal(signal.SIGTERM)
+        self.draining[pid] = process
+        print(f"Draining worker process {pid} ({len(self.processes)} running)")
+
+    def reap(self) -> None:
+        """Forget processes that have exited."""
+        for pool in (self.processes, self.draining):
+            for pid, process in list(pool.items()):
+                if process.poll() is not None:
+                    del pool[pid]
+                    if pool is self.processes:
+                        print(f"Worker process {pid} exited unexpectedly with {process.returncode}")
+
+    def step(self, now: float) -> int:
+        """Run one scaling decision and return the new target."""
+        self.reap()
+        snapshot = self.queue_snapshot()
+        current = len(self.processes)
+        target = self.policy.desired_workers(now, current, snapshot, HostResources.sample())
+
+        for _ in range(target - current):
+            self.spawn()
+        for _ in range(current - target):
+            self.retire()
+        return target
+
+    def run(self, interval: float) -> None:
+        """Supervise until SIGTERM/SIGINT, then drain all workers."""
+        def request_stop(signum, frame):
+            self._stopping = True
+
+        signal.signal(signal.SIGTERM, request_stop)
+        signal.signal(signal.SIGINT, request_stop)
+
+        while not self._stopping:
+            try:
+                self.step(time.monotonic())
+            except Exception as e:
+                # A Redis hiccup must not take the supervisor and its workers down
+                print(f"Autoscaling step failed: {e}")
+            deadline = time.monotonic() + interval
+            while not self._stopping and time.monotonic() < deadline:
+                time.sleep(0.2)
+
+        print("Supervisor stopping, draining all workers...")
+        for pid, process in list(self.processes.items()):
+            process.send_signal(signal.SIGTERM)
+            self.draining[pid] = self.processes.pop(pid)
+        for process in self.draining.values():
+            process.wait()
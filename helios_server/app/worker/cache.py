@@ -0,0 +1,164 @@
+"""Node-local disk cache with LRU eviction for Helios worker."""
+
+import fcntl
+import json
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Tuple
+
+
+def directory_size(path: Path) -> int:
+    """Total size of the regular files under a directory."""
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.lstat(os.path.join(dirpath, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process exists."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+@contextmanager
+def _flock(path: Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on a file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class DiskCache:
+    """Directory of immutable entries, evicted least-recently-used by disk budget.
+
+    Several worker processes on a node share one cache. Each entry lives in
+    ``<root>/<key>/data`` and is filled at most once, under a per-key file
+    lock. Entries in use are pinned by the process holding them and are
+    never evicted; the budget is therefore soft when everything is pinned.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        budget: int,
+        on_evict: Optional[Callable[[str], None]] = None
+    ):
+        """Initialize cache rooted at a directory."""
+        self.root = Path(root)
+        self.budget = budget
+        self.on_evict = on_evict
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _entry(self, key: str) -> Path:
+        """Directory of a cache entry."""
+        return self.root / key
+
+    def _is_ready(self, key: str) -> bool:
+        """Whether an entry has been completely filled."""
+        return (self._entry(key) / "meta.json").exists()
+
+    def _pin(self, key: str, owner: str) -> None:
+        """Mark an entry as in use by this process."""
+        pins = self._entry(key) / ".pins"
+        pins.mkdir(exist_ok=True)
+        (pins / f"{os.getpid()}-{owner}").touch()
+        # Last use is tracked through the metadata file's mtime
+        os.utime(self._entry(key) / "meta.json")
+
+    def _is_pinned(self, key: str) -> bool:
+        """Whether any live process still uses an entry."""
+        pins = self._entry(key) / ".pins"
+        if not pins.exists():
+            return False
+        for pin in pins.iterdir():
+            pid = int(pin.name.split("-", 1)[0])
+            if _pid_alive(pid):
+                return True
+            pin.unlink(missing_ok=True)
+        return False
+
+    def entries(self) -> List[Tuple[str, int, float, bool]]:
+        """List ``(key, size, last_used, pinned)`` for every ready entry."""
+        result = []
+        for path in self.root.iterdir():
+            meta_path = path / "meta.json"
+            if path.name.startswith(".") or not meta_path.exists():
+                continue
+            with open(meta_path, "r") as f:
+                size = json.load(f)["size"]
+            result.append((path.name, size, meta_path.stat().st_mtime, self._is_pinned(path.name)))
+        return result
+
+    def _evict_for(self, needed: int, keep: str) -> None:
+        """Evict least recently used entries until ``needed`` bytes fit the budget."""
+        entries = [entry for entry in self.entries() if entry[0] != keep]
+        used = sum(size for _, size, _, _ in entries)
+
+        for key, size, _, pinned in sorted(entries, key=lambda entry: entry[2]):
+            if used + needed <= self.budget:
+                break
+            if pinned:
+                continue
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+            used -= size
+            print(f"Evicted {key} from cache {self.root} ({size} bytes)")
+            if self.on_evict:
+                self.on_evict(key)
+
+        if used + needed > self.budget:
+            print(f"Cache {self.root} over budget: {used + needed} > {self.budget} bytes in use")
+
+    def acquire(self, key: str, fill: Callable[[Path], None], owner: str) -> Path:
+        """Return the data directory of an entry, filling it on a miss, and pin it.
+
+        ``fill`` receives an empty directory to populate. It runs outside the
+        cache-wide lock so other keys stay usable while a large entry fills.
+        """
+        with _flock(self.root / ".locks" / f"{key}.lock"):
+            # Check and pin together so another process cannot evict the hit in between
+            with _flock(self.root / ".lock"):
+                if self._is_ready(key):
+                    self._pin(key, owner)
+                    return self._entry(key) / "data"
+
+            staging = self.root / ".tmp" / f"{key}-{uuid.uuid4().hex}"
+            (staging / "data").mkdir(parents=True)
+            try:
+                fill(staging / "data")
+                size = directory_size(staging / "data")
+                with open(staging / "meta.json", "w") as f:
+                    json.dump({"size": size, "filled_at": time.time()}, f)
+
+                with _flock(self.root / ".lock"):
+                    self._evict_for(size, keep=key)
+                    shutil.rmtree(self._entry(key), ignore_errors=True)
+                    staging.rename(self._entry(key))
+                    self._pin(key, owner)
+            except BaseException:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+
+        return self._entry(key) / "data"
+
+    def release(self, key: str, owner: str) -> None:
+        """Unpin an entry."""
+        pin = self._entry(key) / ".pins" / f"{os.getpid()}-{owner}"
+        pin.unlink(missing_ok=True)
@@ -0,0 +1,60 @@
+"""Worker-side dataset cache for Helios."""
+
+import zipfile
+from pathlib import Path
+
+import redis
+
+from app.core.config import get_settings
+from app.core.datasets import dataset_nodes_key
+from app.worker.cache import DiskCache
+
+
+def dataset_key(name: str, version: str) -> str:
+    """Cache key of a dataset version."""
+    return f"{name}@{version}"
+
+
+def dataset_archive_path(name: str, version: str) -> Path:
+    """Location of a registered dataset archive in shared storage."""
+    settings = get_settings()
+    return Path(settings.dataset_storage_path) / name / f"{version}.zip"
+
+
+def get_dataset_cache(redis_client: redis.Redis) -> DiskCache:
+    """Open this node's dataset cache, keeping the placement registry in sync."""
+    settings = get_settings()
+    
+    def on_evict(key: str) -> None:
+        name, version = key.rsplit("@", 1)
+        redis_client.srem(dataset_nodes_key(name, version), settings.worker_node)
+    
+    return DiskCache(settings.dataset_cache_path, settings.dataset_cache_budget, on_evict)
+
+
+def acquire_dataset(
+    cache: DiskCache,
+    redis_client: redis.Redis,
+    name: str,
+    version: str,
+    task_id: str
+) -> Path:
+    """Return the local directory of a dataset, extracting it into the cache on a miss."""
+    settings = get_settings()
+    
+    def fill(destination: Path) -> None:
+        print(f"Caching dataset {name}@{version} for task {task_id}")
+        with zipfile.ZipFile(dataset_archive_path(name, version), "r") as zip_ref:
+            zip_ref.extractall(destination)
+    
+    path = cache.acquire(dataset_key(name, version), fill, owner=task_id)
+    redis_client.sadd(dataset_nodes_key(name, version), settings.worker_node)
+    return path
+
+
+def register_cached_datasets(cache: DiskCache, redis_client: redis.Redis) -> None:
+    """Advertise datasets already in this node's cache, e.g. after a Redis restart."""
+    settings = get_settings()
+    for key, _, _, _ in cache.entries():
+        name, version = key.rsplit("@", 1)
+        redis_client.sadd(dataset_nodes_key(name, version), settings.worker_node)
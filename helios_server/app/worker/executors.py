@@ -0,0 +1,649 @@
+"""Task executors for Helios worker.
+
+An executor starts a task's entrypoint and returns a ``TaskProcess``
+handle the worker reads output from, waits on and cleans up. The Docker
+executor isolates every task in a fresh container; the subprocess
+executor trades that isolation for start-up latency and is meant for
+trusted, short tasks.
+"""
+
+import os
+import re
+import resource
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import docker
+import redis
+
+from app.core.config import get_settings
+from app.core.constants import DockerSettings, TaskExecutor
+from app.core.environments import environment_digest, environment_nodes_key, queue_executor
+from app.worker.cache import DiskCache
+from app.worker.telemetry import parse_docker_stats
+
+MEMORY_UNITS = {"": 1, "b": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3, "t": 1024 ** 4}
+
+
+class ExecutorError(Exception):
+    """Raised when an executor cannot start a task."""
+
+
+class TaskSpec:
+    """Everything an executor needs to start one task."""
+
+    def __init__(
+        self,
+        task_id: str,
+        task_path: str,
+        entrypoint: str,
+        resources: Dict[str, str],
+        datasets: Dict[str, Path],
+        helper_dir: str,
+        shared_workspace: bool = False
+    ):
+        """Initialize spec."""
+        self.task_id = task_id
+        self.task_path = task_path
+        self.entrypoint = entrypoint
+        self.resources = resources
+        self.datasets = datasets
+        self.helper_dir = helper_dir
+        self.shared_workspace = shared_workspace
+
+
+class TaskProcess:
+    """Handle on a started task."""
+
+    def output(self) -> Iterator[bytes]:
+        """Yield combined stdout/stderr lines until the task exits."""
+        raise NotImplementedError
+
+    def wait(self) -> int:
+        """Wait for the task to exit and return its exit code."""
+        raise NotImplementedError
+
+    def stats(self) -> Iterator[Optional[Dict[str, float]]]:
+        """Yield resource samples (see ``parse_docker_stats``) about once per second."""
+        raise NotImplementedError
+
+    def cleanup(self) -> None:
+        """Release everything the task still holds; safe to call more than once."""
+
+
+class Executor:
+    """Starts tasks of one kind.
+
+    Executors that install requirements ahead of the entrypoint keep the
+    result in a node-local ``DiskCache``, keyed ``<prefix>-<digest>``, and
+    advertise the node in ``environment_nodes_key`` for task placement.
+    """
+
+    name = ""
+    environment_prefix = ""
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        """Initialize executor; without Redis, cached environments are not advertised."""
+        self.redis_client = redis_client
+
+    def _open_cache(self, root: str, budget: int) -> DiskCache:
+        """Open an environment cache, keeping the placement registry in sync."""
+        settings = get_settings()
+
+        def on_evict(key: str) -> None:
+            if self.redis_client is not None:
+                digest = key.rsplit("-", 1)[1]
+                self.redis_client.srem(environment_nodes_key(self.name, digest), settings.worker_node)
+
+        return DiskCache(root, budget, on_evict)
+
+    def _acquire_environment(
+        self,
+        cache: DiskCache,
+        digest: str,
+        fill: Callable[[Path], None],
+        owner: str
+    ) -> Path:
+        """Pin an environment, building it on a miss, and advertise this node.
+
+        The node is advertised while the environment builds: a task placed
+        here meanwhile waits on the cache lock instead of building it again.
+        """
+        settings = get_settings()
+        nodes_key = environment_nodes_key(self.name, digest)
+        if self.redis_client is not None:
+            self.redis_client.sadd(nodes_key, settings.worker_node)
+        try:
+            return cache.acquire(f"{self.environment_prefix}-{digest}", fill, owner=owner)
+        except BaseException:
+            if self.redis_client is not None:
+                self.redis_client.srem(nodes_key, settings.worker_node)
+            raise
+
+    def caches(self) -> List[DiskCache]:
+        """Environment caches this executor uses on the node."""
+        return []
+
+    def register_cached(self) -> None:
+        """Advertise environments already cached on this node, e.g. after a Redis restart."""
+        settings = get_settings()
+        for cache in self.caches():
+            for key, _, _, _ in cache.entries():
+                self.redis_client.sadd(environment_nodes_key(self.name, key.rsplit("-", 1)[1]), settings.worker_node)
+
+    def prepare(self, requirements: bytes, owner: str) -> None:
+        """Build the environment for ``requirements`` before a task needs it."""
+
+    def start(self, spec: TaskSpec) -> TaskProcess:
+        """Start a task and return its handle."""
+        raise NotImplementedError
+
+
+def parse_memory(value: str) -> int:
+    """Parse a Docker-style memory size such as ``512m`` or ``4g`` into bytes."""
+    match = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([bkmgt]?)b?\s*", str(value).lower())
+    if not match:
+        raise ValueError(f"Invalid memory size: {value}")
+    return int(float(match.group(1)) * MEMORY_UNITS[match.group(2)])
+
+
+def read_requirements(task_path: str) -> bytes:
+    """Contents of a task's ``requirements.txt`` (empty when missing)."""
+    requirements = Path(task_path) / "requirements.txt"
+    return requirements.read_bytes() if requirements.exists() else b""
+
+
+def workspace_command(task_path: str, entrypoint: str) -> List[str]:
+    """Command running a stage in a reused workspace.
+
+    Requirements are installed into a Python user base inside the
+    workspace, once per distinct ``requirements.txt``; stages running
+    concurrently serialize on a lock file while checking it.
+    """
+    digest = environment_digest(read_requirements(task_path))
+    marker = f"{DockerSettings.USER_BASE_DIR}/requirements.sha256"
+    install = (
+        f'test "$(cat {marker} 2>/dev/null)" = {digest} || '
+        f'(pip install --user -r requirements.txt && echo {digest} > {marker})'
+    )
+    return [
+        "sh", "-c",
+        f"mkdir -p {DockerSettings.USER_BASE_DIR} && "
+        f"flock {DockerSettings.USER_BASE_DIR}.lock sh -c '{install}' && "
+        f"python -u {entrypoint}"
+    ]
+
+
+class DockerProcess(TaskProcess):
+    """Task running in a detached container."""
+
+    def __init__(self, container: Any, on_cleanup: Optional[Callable[[], None]] = None):
+        """Wrap a started container."""
+        self.container = container
+        self._on_cleanup = on_cleanup
+
+    def output(self) -> Iterator[bytes]:
+        """Follow the container's log stream."""
+        return self.container.logs(stream=True, follow=True)
+
+    def wait(self) -> int:
+        """Wait for the container and return its exit code."""
+        return self.container.wait()["StatusCode"]
+
+    def stats(self) -> Iterator[Optional[Dict[str, float]]]:
+        """Decode the container's stats stream."""
+        for raw in self.container.stats(stream=True, decode=True):
+            yield parse_docker_stats(raw)
+
+    def cleanup(self) -> None:
+        """Remove the container once logs and exit code are collected."""
+        if self.container is not None and DockerSettings.AUTO_REMOVE:
+            self.container.remove(force=True)
+            self.container = None
+        if self._on_cleanup:
+            self._on_cleanup()
+            self._on_cleanup = None
+
+
+class DockerExecutor(Executor):
+    """Runs each task in a fresh ``python:3.9-slim`` container.
+
+    Requirements are installed into a Python user base kept in the node's
+    environment cache and mounted read-only, so tasks with the same
+    ``requirements.txt`` skip ``pip install``. Pipeline stages instead
+    install into their shared workspace.
+    """
+
+    name = TaskExecutor.DOCKER.value
+    environment_prefix = "userbase"
+    image = "python:3.9-slim"
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        """Open the node's environment cache."""
+        super().__init__(redis_client)
+        settings = get_settings()
+        self.environment_cache = self._open_cache(settings.environment_cache_path, settings.environment_cache_budget)
+
+    def caches(self) -> List[DiskCache]:
+        """Environment caches this executor uses on the node."""
+        return [self.environment_cache]
+
+    def _acquire_user_base(self, requirements: bytes, owner: str) -> Optional[str]:
+        """Pin the user base for ``requirements``; ``None`` when nothing is required."""
+        if not requirements.strip():
+            return None
+        digest = environment_digest(requirements)
+
+        def fill(destination: Path) -> None:
+            print(f"Building environment {digest} for {owner}")
+            # Staging lives under the cache root, which the Docker host sees at the same path
+            (destination.parent / "requirements.txt").write_bytes(requirements)
+            container = docker.from_env().containers.run(
+                image=self.image,
+                command=["pip", "install", "--user", "--no-warn-script-location",
+                         "--disable-pip-version-check", "-r", "/helios-requirements/requirements.txt"],
+                volumes={
+                    str(destination): {"bind": DockerSettings.ENV_MOUNT_POINT, "mode": "rw"},
+                    str(destination.parent): {"bind": "/helios-requirements", "mode": "ro"},
+                },
+                environment={"PYTHONUSERBASE": DockerSettings.ENV_MOUNT_POINT},
+                detach=True
+            )
+            try:
+                exit_code = container.wait()["StatusCode"]
+                if exit_code != 0:
+                    tail = container.logs().decode("utf-8", errors="replace")[-2000:]
+                    raise ExecutorError(f"pip install failed:\n{tail}")
+            finally:
+                container.remove(force=True)
+
+        self._acquire_environment(self.environment_cache, digest, fill, owner)
+        return f"{self.environment_prefix}-{digest}"
+
+    def prepare(self, requirements: bytes, owner: str) -> None:
+        """Install ``requirements`` into the node's environment cache."""
+        key = self._acquire_user_base(requirements, owner)
+        if key:
+            self.environment_cache.release(key, owner)
+
+    def start(self, spec: TaskSpec) -> TaskProcess:
+        """Create and start the task's container."""
+        docker_client = docker.from_env()
+
+        environment_key = None
+        docker_params = {
+            "image": self.image,
+            "volumes": {spec.task_path: {"bind": DockerSettings.MOUNT_POINT, "mode": "rw"}},
+            "working_dir": DockerSettings.MOUNT_POINT,
+            "environment": {
+                "PYTHONPATH": f"{DockerSettings.MOUNT_POINT}/{spec.helper_dir}",
+                "HELIOS_DATASETS": DockerSettings.DATASETS_MOUNT_POINT,
+            },
+            "detach": True
+        }
+
+        # Pipeline stages reuse the environment installed in their workspace
+        if spec.shared_workspace:
+            docker_params["command"] = workspace_command(spec.task_path, spec.entrypoint)
+            docker_params["environment"]["PYTHONUSERBASE"] = (
+                f"{DockerSettings.MOUNT_POINT}/{DockerSettings.USER_BASE_DIR}"
+            )
+        else:
+            docker_params["command"] = ["python", "-u", spec.entrypoint]
+            environment_key = self._acquire_user_base(read_requirements(spec.task_path), spec.task_id)
+            if environment_key:
+                user_base = self.environment_cache.root / environment_key / "data"
+                docker_params["volumes"][str(user_base)] = {"bind": DockerSettings.ENV_MOUNT_POINT, "mode": "ro"}
+                docker_params["environment"]["PYTHONUSERBASE"] = DockerSettings.ENV_MOUNT_POINT
+
+        def release() -> None:
+            if environment_key:
+                self.environment_cache.release(environment_key, spec.task_id)
+
+        # Mount cached datasets read-only under /datasets/<name>
+        for dataset_name, dataset_path in spec.datasets.items():
+            docker_params["volumes"][str(dataset_path)] = {
+                "bind": f"{DockerSettings.DATASETS_MOUNT_POINT}/{dataset_name}",
+                "mode": "ro"
+            }
+
+        # Add resource limits if specified
+        if spec.resources.get("cpu"):
+            docker_params["nano_cpus"] = int(float(spec.resources["cpu"]) * 1e9)
+
+        if spec.resources.get("mem"):
+            docker_params["mem_limit"] = spec.resources["mem"]
+
+        print(f"Starting Docker container for task {spec.task_id}")
+        try:
+            container = docker_client.containers.run(**docker_params)
+        except BaseException:
+            release()
+            raise
+        return DockerProcess(container, release)
+
+
+def _read_int(path: Path, default: int = 0) -> int:
+    """Read an integer from a cgroup or proc file."""
+    try:
+        return int(path.read_text().split()[0])
+    except (OSError, ValueError, IndexError):
+        return default
+
+
+def _read_keyed(path: Path) -> Dict[str, int]:
+    """Read a ``key value`` per line file such as ``cpu.stat``."""
+    values = {}
+    try:
+        for line in path.read_text().splitlines():
+            key, _, value = line.partition(" ")
+            if value.strip().isdigit():
+                values[key] = int(value)
+    except OSError:
+        pass
+    return values
+
+
+class SubprocessProcess(TaskProcess):
+    """Task running as a child process of the worker."""
+
+    def __init__(
+        self,
+        process: subprocess.Popen,
+        cgroup: Optional[Path],
+        memory_limit: int,
+        on_cleanup
+    ):
+        """Wrap a started process."""
+        self.process = process
+        self.cgroup = cgroup
+        self.memory_limit = memory_limit
+        self._on_cleanup = on_cleanup
+
+    def output(self) -> Iterator[bytes]:
+        """Yield the process's output lines."""
+        return iter(self.process.stdout.readline, b"")
+
+    def wait(self) -> int:
+        """Wait for the process and return its exit code, shell-style for signals."""
+        returncode = self.process.wait()
+        return 128 - returncode if returncode < 0 else returncode
+
+    def _usage(self) -> Dict[str, float]:
+        """Read cumulative CPU seconds, memory and IO of the task."""
+        if self.cgroup is not None:
+            cpu = _read_keyed(self.cgroup / "cpu.stat")
+            io_read = io_write = 0
+            try:
+                for line in (self.cgroup / "io.stat").read_text().splitlines():
+                    fields = dict(field.split("=", 1) for field in line.split()[1:] if "=" in field)
+                    io_read += int(fields.get("rbytes", 0))
+                    io_write += int(fields.get("wbytes", 0))
+            except (OSError, ValueError):
+                pass
+            return {
+                "cpu_seconds": cpu.get("usage_usec", 0) / 1e6,
+                "mem_bytes": float(_read_int(self.cgroup / "memory.current")),
+                "io_read_bytes": float(io_read),
+                "io_write_bytes": float(io_write),
+                "throttled_periods": float(cpu.get("nr_throttled", 0)),
+                "throttled_time_ns": cpu.get("throttled_usec", 0) * 1000.0,
+            }
+
+        # Without a cgroup only the entrypoint process itself is visible
+        proc = Path("/proc") / str(self.process.pid)
+        try:
+            fields = (proc / "stat").read_text().rsplit(")", 1)[1].split()
+            cpu_seconds = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+        except (OSError, ValueError, IndexError):
+            cpu_seconds = 0.0
+        io = _read_keyed(proc / "io")
+        status = {}
+        try:
+            for line in (proc / "status").read_text().splitlines():
+                key, _, value = line.partition(":")
+                status[key] = value.split()
+        except OSError:
+            pass
+        rss_kb = int(status.get("VmRSS", ["0"])[0])
+        return {
+            "cpu_seconds": cpu_seconds,
+            "mem_bytes": float(rss_kb * 1024),
+            "io_read_bytes": float(io.get("read_bytes:", 0)),
+            "io_write_bytes": float(io.get("write_bytes:", 0)),
+            "throttled_periods": 0.0,
+            "throttled_time_ns": 0.0,
+        }
+
+    def stats(self) -> Iterator[Optional[Dict[str, float]]]:
+        """Sample usage once per second while the process runs."""
+        previous_at, previous_cpu = None, 0.0
+        while self.process.poll() is None:
+            now = time.monotonic()
+            usage = self._usage()
+            cpu_seconds = usage.pop("cpu_seconds")
+            if previous_at is None:
+                yield None
+            else:
+                cpu_percent = (cpu_seconds - previous_cpu) / max(now - previous_at, 1e-6) * 100.0
+                yield {
+                    "cpu_percent": round(cpu_percent, 2),
+                    "mem_limit_bytes": float(self.memory_limit),
+                    **usage,
+                }
+            previous_at, previous_cpu = now, cpu_seconds
+            time.sleep(1.0)
+
+    def cleanup(self) -> None:
+        """Kill anything the task left running and release its environment."""
+        # The task leads its own session, so this also reaches background children
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        self.process.wait()
+
+        if self.cgroup is not None:
+            # Catch processes that left the session but not the cgroup
+            try:
+                (self.cgroup / "cgroup.kill").write_text("1")
+            except OSError:
+                pass
+            for _ in range(50):
+                try:
+                    self.cgroup.rmdir()
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            self.cgroup = None
+
+        if self.process.stdout:
+            self.process.stdout.close()
+        if self._on_cleanup:
+            self._on_cleanup()
+            self._on_cleanup = None
+
+
+class SubprocessExecutor(Executor):
+    """Runs the entrypoint directly on the worker host inside a cached virtualenv.
+
+    Virtualenvs live in a node-local ``DiskCache`` keyed by the hash of
+    ``requirements.txt`` and the worker's Python version, so a repeated
+    task starts without creating containers or installing packages.
+    Limits come from a cgroup v2 child of ``subprocess_cgroup_root`` when
+    the worker may create one, otherwise from rlimits (memory only). This
+    is not a security boundary: tasks run as the worker's user.
+    """
+
+    name = TaskExecutor.SUBPROCESS.value
+    environment_prefix = f"venv-py{sys.version_info[0]}{sys.version_info[1]}"
+
+    def __init__(self, redis_client: Optional[redis.Redis] = None):
+        """Open the node's virtualenv cache."""
+        super().__init__(redis_client)
+        settings = get_settings()
+        self.venv_cache = self._open_cache(settings.venv_cache_path, settings.venv_cache_budget)
+
+    def caches(self) -> List[DiskCache]:
+        """Environment caches this executor uses on the node."""
+        return [self.venv_cache]
+
+    def _acquire_venv(self, requirements: bytes, owner: str) -> Path:
+        """Return a virtualenv with ``requirements`` installed, building it on a miss."""
+        digest = environment_digest(requirements)
+
+        def fill(destination: Path) -> None:
+            print(f"Building virtualenv {digest} for {owner}")
+            subprocess.run([sys.executable, "-m", "venv", str(destination)], check=True)
+            if requirements.strip():
+                requirements_path = destination / "requirements.txt"
+                requirements_path.write_bytes(requirements)
+                result = subprocess.run(
+                    [str(destination / "bin" / "python"), "-m", "pip", "install",
+                     "--no-input", "--disable-pip-version-check", "-r", str(requirements_path)],
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.STDOUT
+                )
+                if result.returncode != 0:
+                    tail = result.stdout.decode("utf-8", errors="replace")[-2000:]
+                    raise ExecutorError(f"pip install failed:\n{tail}")
+
+        # The interpreter resolves the venv from its own location, so the
+        # cache's rename after filling is safe; console-script shebangs are not
+        return self._acquire_environment(self.venv_cache, digest, fill, owner)
+
+    def prepare(self, requirements: bytes, owner: str) -> None:
+        """Build the virtualenv for ``requirements`` in the node's cache."""
+        venv = self._acquire_venv(requirements, owner)
+        self.venv_cache.release(venv.parent.name, owner)
+
+    def _create_cgroup(self, spec: TaskSpec, memory_limit: int) -> Optional[Path]:
+        """Create a cgroup v2 child with the task's limits, if possible."""
+        settings = get_settings()
+        root = Path(settings.subprocess_cgroup_root)
+        if not os.access(root / "cgroup.procs", os.W_OK):
+            return None
+
+        cgroup = root / f"task-{spec.task_id}"
+        try:
+            try:
+                (root / "cgroup.subtree_control").write_text("+cpu +memory +io")
+            except OSError:
+                pass
+            cgroup.mkdir(exist_ok=True)
+            if memory_limit:
+                (cgroup / "memory.max").write_text(str(memory_limit))
+                (cgroup / "memory.swap.max").write_text("0")
+            if spec.resources.get("cpu"):
+                period = 100000
+                (cgroup / "cpu.max").write_text(f"{int(float(spec.resources['cpu']) * period)} {period}")
+        except OSError as e:
+            print(f"cgroup limits unavailable for task {spec.task_id}: {e}")
+            try:
+                cgroup.rmdir()
+            except OSError:
+                pass
+            return None
+        return cgroup
+
+    def start(self, spec: TaskSpec) -> TaskProcess:
+        """Start the entrypoint in its virtualenv."""
+        settings = get_settings()
+        memory_limit = parse_memory(spec.resources["mem"]) if spec.resources.get("mem") else 0
+        venv = self._acquire_venv(read_requirements(spec.task_path), spec.task_id)
+        venv_key = venv.parent.name
+        cgroup = None
+
+        try:
+            cgroup = self._create_cgroup(spec, memory_limit)
+            cpu_seconds = int(settings.docker_timeout * max(1.0, float(spec.resources.get("cpu") or 1)))
+
+            def limit_child() -> None:
+                # Runs in the child between fork and exec
+                if cgroup is not None:
+                    (cgroup / "cgroup.procs").write_text(str(os.getpid()))
+                elif memory_limit:
+                    resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+                resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+                resource.setrlimit(resource.RLIMIT_CPU, (cpu_seconds, cpu_seconds + 5))
+
+            # Expose datasets under one directory, as /datasets does in containers
+            datasets_dir = Path(spec.task_path) / spec.helper_dir / "datasets"
+            datasets_dir.mkdir(parents=True, exist_ok=True)
+            for dataset_name, dataset_path in spec.datasets.items():
+                link = datasets_dir / dataset_name
+                if not link.exists():
+                    link.symlink_to(dataset_path, target_is_directory=True)
+
+            environment = {
+                "PATH": f"{venv / 'bin'}:/usr/local/bin:/usr/bin:/bin",
+                "VIRTUAL_ENV": str(venv),
+                "HOME": spec.task_path,
+                "LANG": "C.UTF-8",
+                "PYTHONUNBUFFERED": "1",
+                "PYTHONPATH": str(Path(spec.task_path) / spec.helper_dir),
+                "HELIOS_DATASETS": str(datasets_dir),
+            }
+
+            print(f"Starting subprocess for task {spec.task_id}")
+            process = subprocess.Popen(
+                [str(venv / "bin" / "python"), "-u", spec.entrypoint],
+                cwd=spec.task_path,
+                env=environment,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                start_new_session=True,
+                preexec_fn=limit_child
+            )
+        except BaseException:
+            if cgroup is not None:
+                try:
+                    cgroup.rmdir()
+                except OSError:
+                    pass
+            self.venv_cache.release(venv_key, spec.task_id)
+            raise
+
+        return SubprocessProcess(
+            process,
+            cgroup,
+            memory_limit,
+            lambda: self.venv_cache.release(venv_key, spec.task_id)
+        )
+
+
+def resolve_executor(task_executor: Optional[str], queue_name: Optional[str]) -> str:
+    """Pick the executor for a task: its own choice, else its queue's, else Docker.
+
+    Raises ``ExecutorError`` for unknown executors and when the subprocess
+    executor is requested on a worker that does not allow it.
+    """
+    settings = get_settings()
+    name = queue_executor(task_executor, queue_name)
+    if name not in (TaskExecutor.DOCKER, TaskExecutor.SUBPROCESS):
+        raise ExecutorError(f"Unknown executor: {name}")
+    if name == TaskExecutor.SUBPROCESS and not settings.allow_subprocess_executor:
+        raise ExecutorError("Subprocess executor is disabled on this worker")
+    return name
+
+
+def get_executor(name: str, redis_client: Optional[redis.Redis] = None) -> Executor:
+    """Instantiate an executor by name."""
+    if name == TaskExecutor.SUBPROCESS:
+        return SubprocessExecutor(redis_client)
+    return DockerExecutor(redis_client)
+
+
+def register_cached_environments(redis_client: redis.Redis) -> None:
+    """Advertise the environments cached on this node for every enabled executor."""
+    settings = get_settings()
+    names = [TaskExecutor.DOCKER.value]
+    if settings.allow_subprocess_executor:
+        names.append(TaskExecutor.SUBPROCESS.value)
+    for name in names:
+        get_executor(name, redis_client).register_cached()
@@ -0,0 +1,160 @@
+"""Structured task metrics and progress for Helios worker."""
+
+import json
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import redis
+
+from app.core.constants import MetricsProtocol, RedisChannels
+from app.worker.telemetry import DownsampledSeries
+
+METRICS_PREFIX_BYTES = MetricsProtocol.LINE_PREFIX.encode("utf-8")
+HELPER_SOURCE = Path(__file__).parent / "sdk" / "helios.py"
+
+
+def install_helper(task_path: str) -> str:
+    """Copy the ``helios`` helper module into the task directory.
+
+    Returns the directory to put on the container's ``PYTHONPATH``,
+    relative to the task directory.
+    """
+    helper_dir = Path(task_path) / MetricsProtocol.HELPER_DIR
+    helper_dir.mkdir(exist_ok=True)
+    shutil.copyfile(HELPER_SOURCE, helper_dir / "helios.py")
+    return MetricsProtocol.HELPER_DIR
+
+
+def parse_event(raw: bytes) -> Optional[Dict[str, Any]]:
+    """Decode a metrics line, or return ``None`` if it is malformed.
+
+    Callers check ``raw.startswith(METRICS_PREFIX_BYTES)`` first, so ordinary
+    log lines never pay for JSON decoding.
+    """
+    if len(raw) > MetricsProtocol.MAX_LINE_BYTES:
+        return None
+    try:
+        event = json.loads(raw[len(METRICS_PREFIX_BYTES):])
+    except ValueError:
+        return None
+    if not isinstance(event, dict):
+        return None
+
+    try:
+        if event.get("type") == "metric":
+            parsed = {"type": "metric", "name": str(event["name"])[:100], "value": float(event["value"])}
+            if event.get("step") is not None:
+                parsed["step"] = int(event["step"])
+            return parsed
+        if event.get("type") == "progress":
+            parsed = {"type": "progress", "current": float(event["current"])}
+            if event.get("total"):
+                parsed["total"] = float(event["total"])
+            if event.get("message"):
+                parsed["message"] = str(event["message"])[:200]
+            return parsed
+    except (KeyError, TypeError, ValueError):
+        return None
+    return None
+
+
+class MetricSeries:
+    """Bounded history and running aggregates of one metric."""
+
+    def __init__(self, max_points: int):
+        """Initialize an empty metric."""
+        self.series = DownsampledSeries(max_points)
+        self.count = 0
+        self.last = 0.0
+        self.min = float("inf")
+        self.max = float("-inf")
+
+    def add(self, value: float, step: float, t: float) -> None:
+        """Record one value."""
+        self.series.add({"step": step, "value": value, "t": t})
+        self.count += 1
+        self.last = value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return aggregates and the downsampled series."""
+        return {
+            "count": self.count,
+            "last": self.last,
+            "min": self.min,
+            "max": self.max,
+            "bucket": self.series.bucket,
+            "points": self.series.to_list(),
+        }
+
+
+class MetricsRecorder:
+    """Aggregates a task's metric and progress events and relays them live.
+
+    Memory is bounded by ``max_series`` metrics of ``max_points`` points
+    each; events for further metric names are counted as dropped. Live
+    updates of a metric are published at most every ``publish_interval``
+    seconds, while every value still goes into the stored aggregates.
+    """
+
+    def __init__(
+        self,
+        task_id: str,
+        redis_client: redis.Redis,
+        max_series: int = 64,
+        max_points: int = 240,
+        publish_interval: float = 0.5
+    ):
+        """Initialize recorder for a task."""
+        self.task_id = task_id
+        self.redis_client = redis_client
+        self.max_series = max_series
+        self.max_points = max_points
+        self.publish_interval = publish_interval
+        self.channel = f"{RedisChannels.METRICS_PREFIX}{task_id}"
+        self.metrics: Dict[str, MetricSeries] = {}
+        self.progress: Optional[Dict[str, Any]] = None
+        self.dropped = 0
+        self._started_at = time.monotonic()
+        self._last_published: Dict[str, float] = {}
+
+    def handle_line(self, raw: bytes) -> None:
+        """Parse and record one metrics line from the container output."""
+        event = parse_event(raw)
+        if event is None:
+            self.dropped += 1
+            return
+
+        now = time.monotonic()
+        event["t"] = round(now - self._started_at, 3)
+
+        if event["type"] == "metric":
+            name = event["name"]
+            metric = self.metrics.get(name)
+            if metric is None:
+                if len(self.metrics) >= self.max_series:
+                    self.dropped += 1
+                    return
+                metric = self.metrics[name] = MetricSeries(self.max_points)
+            metric.add(event["value"], event.get("step", metric.count), event["t"])
+            key = f"metric:{name}"
+        else:
+            self.progress = event
+            key = "progress"
+
+        # Always relay completed progress so the bar ends at 100%
+        finished = event["type"] == "progress" and event.get("total") and event["current"] >= event["total"]
+        if finished or now - self._last_published.get(key, float("-inf")) >= self.publish_interval:
+            self._last_published[key] = now
+            self.redis_client.publish(self.channel, json.dumps(event))
+
+    def summary(self) -> Dict[str, Any]:
+        """Return everything recorded, ready to be stored with the task."""
+        return {
+            "progress": self.progress,
+            "dropped_events": self.dropped,
+            "metrics": {name: metric.summary() for name, metric in self.metrics.items()},
+        }
@@ -0,0 +1,64 @@
+"""Report progress and metrics from a Helios task.
+
+This module is placed on ``PYTHONPATH`` inside every task container::
+
+    import helios
+
+    for step in range(steps):
+        loss = train_step()
+        helios.log_metric("loss", loss, step=step)
+        helios.progress(step + 1, steps)
+
+Events are written to stdout as single lines starting with ``@@helios ``.
+The worker separates them from the log stream, so they never show up in
+the task's logs. The module only uses the standard library and is a
+no-op when stdout is closed.
+"""
+
+import json
+import math
+import sys
+import threading
+from typing import Dict, Optional
+
+LINE_PREFIX = "@@helios "
+
+_lock = threading.Lock()
+
+
+def _emit(event: dict) -> None:
+    """Write one event line in a single call so it is never interleaved."""
+    line = LINE_PREFIX + json.dumps(event, separators=(",", ":")) + "\n"
+    with _lock:
+        try:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+        except (OSError, ValueError):
+            pass
+
+
+def log_metric(name: str, value: float, step: Optional[int] = None) -> None:
+    """Record one value of a numeric metric such as ``loss`` or ``throughput``."""
+    value = float(value)
+    if math.isnan(value) or math.isinf(value):
+        return
+    event = {"type": "metric", "name": str(name), "value": value}
+    if step is not None:
+        event["step"] = int(step)
+    _emit(event)
+
+
+def log_metrics(values: Dict[str, float], step: Optional[int] = None) -> None:
+    """Record several metrics at the same step."""
+    for name, value in values.items():
+        log_metric(name, value, step)
+
+
+def progress(current: float, total: Optional[float] = None, message: Optional[str] = None) -> None:
+    """Report how far the task has come, shown as a progress bar by the CLI."""
+    event = {"type": "progress", "current": float(current)}
+    if total:
+        event["total"] = float(total)
+    if message:
+        event["message"] = str(message)[:200]
+    _emit(event)
@@ -1,9 +1,8 @@
 """RQ task functions for Helios worker."""
 
+import json
 import os
 import shutil
-import subprocess
-import uuid
 from typing import Dict, Any
 
 import docker
@@ -11,11 +10,18 @@ import redis
 from rq import get_current_job
 
 from app.core.config import get_settings
-from app.core.constants import DockerSettings, TaskStatus, TaskSignals, RedisChannels
+from app.core.constants import TaskStatus, TaskSignals, RedisChannels
+from app.core.environments import environment_digest, environment_preparing_key
+from app.core.log_archive import LogArchiveWriter, archive_path
+from app.core.pipelines import finish_stage, start_stage
+from app.worker.datasets import acquire_dataset, dataset_key, get_dataset_cache
+from app.worker.executors import ExecutorError, TaskSpec, get_executor, resolve_executor
+from app.worker.metrics import METRICS_PREFIX_BYTES, MetricsRecorder, install_helper
+from app.worker.telemetry import ResourceSampler
 
 
-def run_task_in_docker(task_info: Dict[str, Any]) -> None:
-    """Execute task in Docker container with proper logging and cleanup."""
+def run_task(task_info: Dict[str, Any]) -> None:
+    """Execute task with its executor, with proper logging and cleanup."""
     
     job = get_current_job()
     settings = get_settings()
@@ -25,6 +31,9 @@ def run_task_in_docker(task_info: Dict[str, Any]) -> None:
     task_path = task_info["task_path"]
     entrypoint = task_info["entrypoint"]
     resources = task_info.get("resources", {})
+    datasets = task_info.get("datasets", {})
+    pipeline_id = task_info.get("pipeline_id")
+    stage = task_info.get("stage")
     
     # Initialize Redis client
     redis_client = redis.Redis(
@@ -35,55 +44,92 @@ def run_task_in_docker(task_info: Dict[str, Any]) -> None:
         decode_responses=True
     )
     
+    process = None
+    sampler = None
+    dataset_cache = None
+    acquired_datasets = []
+    succeeded = False
+    metrics = MetricsRecorder(
+        task_id,
+        redis_client,
+        settings.metrics_max_series,
+        settings.metrics_max_points,
+        settings.metrics_publish_interval
+    )
+    log_archive = None
+    
     try:
         # Update task status to running
         redis_client.set(f"task:{task_id}:status", TaskStatus.RUNNING)
         
-        # Initialize Docker client
-        docker_client = docker.from_env()
-        
-        # Build Docker command
-        docker_cmd = [
-            "sh", "-c",
-            f"pip install -r requirements.txt && python -u {entrypoint}"
-        ]
-        
-        # Prepare Docker run parameters
-        docker_params = {
-            "image": "python:3.9-slim",
-            "command": docker_cmd,
-            "volumes": {task_path: {"bind": DockerSettings.MOUNT_POINT, "mode": "rw"}},
-            "working_dir": DockerSettings.MOUNT_POINT,
-            "remove": DockerSettings.AUTO_REMOVE,
-            "detach": False,
-            "stdout": True,
-            "stderr": True,
-            "stream": True
-        }
-        
-        # Add resource limits if specified
-        if resources.get("cpu"):
-            docker_params["mem_limit"] = f"{resources['cpu']}g"
-        
-        if resources.get("mem"):
-            docker_params["mem_limit"] = resources["mem"]
-        
-        # Create and start container
-        print(f"Starting Docker container for task {task_id}")
-        container = docker_client.containers.run(**docker_params)
+        # Persist every published log line so it outlives the live stream
+        log_archive = LogArchiveWriter(
+            archive_path(task_id, settings.log_archive_path),
+            settings.log_archive_chunk_bytes
+        )
+        if pipeline_id:
+            start_stage(redis_client, pipeline_id, stage, settings.worker_node)
+        
+        # Make ``import helios`` available to the task for metrics and progress
+        helper_dir = install_helper(task_path)
+        
+        # Pin cached datasets for the executor to expose read-only
+        dataset_paths = {}
+        if datasets:
+            dataset_cache = get_dataset_cache(redis_client)
+            for dataset_name, version in datasets.items():
+                dataset_paths[dataset_name] = acquire_dataset(dataset_cache, redis_client, dataset_name, version, task_id)
+                acquired_datasets.append(dataset_key(dataset_name, version))
+        
+        # Start the task; pipeline stages reuse the workspace's environment
+        executor = get_executor(
+            resolve_executor(task_info.get("executor"), job.origin if job else None),
+            redis_client
+        )
+        process = executor.start(TaskSpec(
+            task_id,
+            task_path,
+            entrypoint,
+            resources,
+            dataset_paths,
+            helper_dir,
+            shared_workspace=bool(pipeline_id)
+        ))
+        
+        # Sample resource usage alongside the log stream
+        if settings.telemetry_interval > 0:
+            sampler = ResourceSampler(
+                process.stats(),
+                task_id,
+                redis_client,
+                settings.telemetry_interval,
+                settings.telemetry_max_points
+            )
+            sampler.start()
         
         # Stream logs and publish to Redis
-        for log_line in container.logs(stream=True):
+        for log_line in process.output():
+            # Metrics lines are diverted before decoding; other lines pay one prefix check
+            if log_line.startswith(METRICS_PREFIX_BYTES):
+                metrics.handle_line(log_line)
+                continue
+            
             log_text = log_line.decode("utf-8", errors="ignore").rstrip()
             if log_text:
                 redis_client.publish(f"{RedisChannels.LOGS_PREFIX}{task_id}", log_text)
+                log_archive.write_line(log_text)
+        
+        # Wait for the task to finish and get exit code
+        exit_code = process.wait()
         
-        # Wait for container to finish and get exit code
-        result = docker_client.containers.get(container.id).wait()
-        exit_code = result["StatusCode"]
+        # Store the downsampled resource series with the task
+        if sampler is not None:
+            sampler.stop()
+            redis_client.set(f"task:{task_id}:stats", json.dumps(sampler.summary()))
         
         # Publish completion signal
-        if exit_code == 0:
+        succeeded = exit_code == 0
+        if succeeded:
             redis_client.set(f"task:{task_id}:status", TaskStatus.SUCCEEDED)
             redis_client.publish(f"{RedisChannels.LOGS_PREFIX}{task_id}", TaskSignals.COMPLETE)
         else:
@@ -95,6 +141,16 @@ def run_task_in_docker(task_info: Dict[str, Any]) -> None:
         
         print(f"Task {task_id} completed with exit code {exit_code}")
         
+    except ExecutorError as e:
+        error_msg = f"Executor error: {str(e)}"
+        print(f"Task {task_id} failed: {error_msg}")
+        
+        redis_client.set(f"task:{task_id}:status", TaskStatus.FAILED)
+        redis_client.publish(f"{RedisChannels.LOGS_PREFIX}{task_id}", f"{TaskSignals.FAILED_PREFIX}:Executor error]")
+        redis_client.publish(f"{RedisChannels.LOGS_PREFIX}{task_id}", error_msg)
+        if log_archive is not None:
+            log_archive.write_line(error_msg)
+        
     except docker.errors.DockerException as e:
         error_msg = f"Docker error: {str(e)}"
         print(f"Task {task_id} failed: {error_msg}")
@@ -102,6 +158,8 @@ def run_task_in_docker(task_info: Dict[str, Any]) -> None:
         redis_client.set(f"task:{task_id}:status", TaskStatus.FAILED)
         redis_client.publish(f"{RedisChannels.LOGS_PREFIX}{task_id}", f"{TaskSignals.FAILED_PREFIX}:Docker error]")
         redis_client.publish(f"{RedisChannels.LOGS_PREFIX}{task_id}", error_msg)
+        if log_archive is not None:
+            log_archive.write_line(error_msg)
         
     except Exception as e:
         error_msg = f"Unexpected error: {str(e)}"
@@ -110,18 +168,93 @@ def run_task_in_docker(task_info: Dict[str, Any]) -> None:
         redis_client.set(f"task:{task_id}:status", TaskStatus.FAILED)
         redis_client.publish(f"{RedisChannels.LOGS_PREFIX}{task_id}", f"{TaskSignals.FAILED_PREFIX}:Runtime error]")
         redis_client.publish(f"{RedisChannels.LOGS_PREFIX}{task_id}", error_msg)
+        if log_archive is not None:
+            log_archive.write_line(error_msg)
         
     finally:
-        # Cleanup: remove task directory
-        try:
-            if os.path.exists(task_path):
-                shutil.rmtree(task_path)
-                print(f"Cleaned up task directory: {task_path}")
-        except Exception as e:
-            print(f"Failed to clean up task directory {task_path}: {e}")
+        # Seal the log archive
+        if log_archive is not None:
+            try:
+                log_archive.close()
+            except Exception as e:
+                print(f"Failed to finalize log archive for task {task_id}: {e}")
+        
+        # Keep reported metrics and progress, also for failed tasks
+        if metrics.metrics or metrics.progress or metrics.dropped:
+            try:
+                redis_client.set(f"task:{task_id}:metrics", json.dumps(metrics.summary()))
+            except Exception as e:
+                print(f"Failed to store metrics for task {task_id}: {e}")
+        
+        # Stop telemetry before the task's resources go away
+        if sampler is not None and sampler.is_alive():
+            sampler.stop()
+        
+        # Remove the container or leftover processes once logs and exit code are collected
+        if process is not None:
+            try:
+                process.cleanup()
+            except Exception as e:
+                print(f"Failed to clean up executor for task {task_id}: {e}")
+        
+        # Unpin cached datasets so they become evictable again
+        for key in acquired_datasets:
+            try:
+                dataset_cache.release(key, task_id)
+            except Exception as e:
+                print(f"Failed to release dataset {key} for task {task_id}: {e}")
+        
+        if pipeline_id:
+            # The workspace outlives the stage; hand over to the stages it unblocks
+            try:
+                finish_stage(redis_client, pipeline_id, stage, succeeded, settings.worker_node)
+            except Exception as e:
+                print(f"Failed to advance pipeline {pipeline_id} after stage {stage}: {e}")
+        else:
+            # Cleanup: remove task directory
+            try:
+                if os.path.exists(task_path):
+                    shutil.rmtree(task_path)
+                    print(f"Cleaned up task directory: {task_path}")
+            except Exception as e:
+                print(f"Failed to clean up task directory {task_path}: {e}")
         
         # Close Redis connection
         try:
             redis_client.close()
         except:
-            pass
\ No newline at end of file
+            pass
+
+
+def prepare_environment(requirements: str, executor: str) -> None:
+    """Build a task environment into this node's cache before the task arrives.
+    
+    Enqueued speculatively when a client announces a submission, so
+    dependencies install while the project is still uploading. Failures
+    are only logged; the task itself will retry and report them.
+    """
+    job = get_current_job()
+    settings = get_settings()
+    owner = f"prepare-{job.id}" if job else "prepare"
+    digest = environment_digest(requirements.encode("utf-8"))
+    
+    redis_client = redis.Redis(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        db=settings.redis_db,
+        password=settings.redis_password,
+        decode_responses=True
+    )
+    
+    try:
+        get_executor(resolve_executor(executor, None), redis_client).prepare(requirements.encode("utf-8"), owner)
+        print(f"Prepared {executor} environment {digest}")
+    except Exception as e:
+        print(f"Failed to prepare {executor} environment {digest}: {e}")
+    finally:
+        redis_client.delete(environment_preparing_key(executor, digest))
+        redis_client.close()
+
+
+# Jobs enqueued before the executor split still reference the old name
+run_task_in_docker = run_task
@@ -0,0 +1,185 @@
+"""Task resource telemetry for Helios worker."""
+
+import json
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+import redis
+
+from app.core.constants import RedisChannels
+
+
+class DownsampledSeries:
+    """Fixed-size time series that halves its resolution when full.
+
+    Every stored point is the mean of ``bucket`` consecutive samples. Once
+    ``max_points`` points are held, adjacent pairs are merged and the bucket
+    doubles, so memory stays bounded no matter how long the task runs.
+    """
+
+    def __init__(self, max_points: int = 240):
+        """Initialize an empty series."""
+        self.max_points = max(2, max_points)
+        self.bucket = 1
+        self.points: List[Dict[str, float]] = []
+        self._pending: List[Dict[str, float]] = []
+
+    def add(self, sample: Dict[str, float]) -> None:
+        """Add a sample, merging into the current bucket."""
+        self._pending.append(sample)
+        if len(self._pending) < self.bucket:
+            return
+
+        self.points.append(self._mean(self._pending))
+        self._pending = []
+
+        if len(self.points) >= self.max_points:
+            self.points = [
+                self._mean(self.points[i:i + 2])
+                for i in range(0, len(self.points), 2)
+            ]
+            self.bucket *= 2
+
+    def to_list(self) -> List[Dict[str, float]]:
+        """Return stored points including the partially filled bucket."""
+        if self._pending:
+            return self.points + [self._mean(self._pending)]
+        return list(self.points)
+
+    @staticmethod
+    def _mean(samples: List[Dict[str, float]]) -> Dict[str, float]:
+        """Average numeric fields of a group of samples."""
+        keys = samples[0].keys()
+        return {key: sum(s.get(key, 0.0) for s in samples) / len(samples) for key in keys}
+
+
+def parse_docker_stats(raw: Dict[str, Any]) -> Optional[Dict[str, float]]:
+    """Convert a raw Docker stats document into a flat sample.
+
+    Returns ``None`` for the first document of a stream, which has no
+    previous CPU reading to diff against.
+    """
+    cpu_stats = raw.get("cpu_stats") or {}
+    precpu_stats = raw.get("precpu_stats") or {}
+    if not precpu_stats.get("system_cpu_usage"):
+        return None
+
+    # CPU usage relative to a single core (200.0 == two cores busy)
+    cpu_delta = (
+        cpu_stats.get("cpu_usage", {}).get("total_usage", 0)
+        - precpu_stats.get("cpu_usage", {}).get("total_usage", 0)
+    )
+    system_delta = cpu_stats.get("system_cpu_usage", 0) - precpu_stats.get("system_cpu_usage", 0)
+    online_cpus = cpu_stats.get("online_cpus") or len(
+        cpu_stats.get("cpu_usage", {}).get("percpu_usage") or [1]
+    )
+    cpu_percent = 0.0
+    if cpu_delta > 0 and system_delta > 0:
+        cpu_percent = cpu_delta / system_delta * online_cpus * 100.0
+
+    # Memory usage excluding page cache (cgroup v1 "cache", v2 "inactive_file")
+    memory_stats = raw.get("memory_stats") or {}
+    details = memory_stats.get("stats") or {}
+    cache = details.get("inactive_file", details.get("cache", 0))
+    mem_usage = max(0, memory_stats.get("usage", 0) - cache)
+
+    # Block IO totals (cgroup v2 reports lowercase op names)
+    io_read = io_write = 0
+    for entry in (raw.get("blkio_stats") or {}).get("io_service_bytes_recursive") or []:
+        op = entry.get("op", "").lower()
+        if op == "read":
+            io_read += entry.get("value", 0)
+        elif op == "write":
+            io_write += entry.get("value", 0)
+
+    throttling = cpu_stats.get("throttling_data") or {}
+
+    return {
+        "cpu_percent": round(cpu_percent, 2),
+        "mem_bytes": float(mem_usage),
+        "mem_limit_bytes": float(memory_stats.get("limit", 0)),
+        "io_read_bytes": float(io_read),
+        "io_write_bytes": float(io_write),
+        "throttled_periods": float(throttling.get("throttled_periods", 0)),
+        "throttled_time_ns": float(throttling.get("throttled_time", 0)),
+    }
+
+
+class ResourceSampler(threading.Thread):
+    """Background thread sampling resource usage while a task runs.
+
+    Executors yield a sample roughly once per second (Docker over a single
+    long-lived stats connection); the sampler only publishes one every
+    ``interval`` seconds. Its overhead is the CPU time of the sampling
+    thread, which covers reading and decoding every sample (including
+    the ones it skips) and publishing, but not waiting for the next one.
+    """
+
+    def __init__(
+        self,
+        stats: Iterator[Optional[Dict[str, float]]],
+        task_id: str,
+        redis_client: redis.Redis,
+        interval: float,
+        max_points: int
+    ):
+        """Initialize sampler on a running task's stats iterator."""
+        super().__init__(name=f"helios-telemetry-{task_id}", daemon=True)
+        self.stats = stats
+        self.task_id = task_id
+        self.redis_client = redis_client
+        self.interval = interval
+        self.series = DownsampledSeries(max_points)
+        self.samples = 0
+        self.busy_seconds = 0.0
+        self._started_at = 0.0
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        """Consume the stats iterator until the task exits."""
+        channel = f"{RedisChannels.STATS_PREFIX}{self.task_id}"
+        self._started_at = time.monotonic()
+        next_sample_at = self._started_at
+        cpu_started = time.thread_time()
+
+        try:
+            for sample in self.stats:
+                # The executor's iterator reads and decodes in this thread
+                self.busy_seconds = time.thread_time() - cpu_started
+                if self._stop_event.is_set():
+                    break
+
+                now = time.monotonic()
+                if now < next_sample_at:
+                    continue
+                if sample is None:
+                    continue
+                next_sample_at = now + self.interval
+
+                sample["t"] = round(now - self._started_at, 3)
+                self.series.add(sample)
+                self.samples += 1
+                self.redis_client.publish(channel, json.dumps(sample))
+        except Exception as e:
+            # Telemetry must never take the task down with it
+            print(f"Telemetry stopped for task {self.task_id}: {e}")
+        finally:
+            self.busy_seconds = time.thread_time() - cpu_started
+
+    def stop(self, timeout: float = 2.0) -> None:
+        """Stop sampling and wait briefly for the thread to exit."""
+        self._stop_event.set()
+        self.join(timeout)
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the stored series and sampling overhead."""
+        elapsed = max(time.monotonic() - self._started_at, 1e-9) if self._started_at else 0.0
+        return {
+            "interval": self.interval,
+            "bucket": self.series.bucket,
+            "samples": self.samples,
+            "overhead_seconds": round(self.busy_seconds, 6),
+            "overhead_ratio": round(self.busy_seconds / elapsed, 6) if elapsed else 0.0,
+            "points": self.series.to_list(),
+        }
@@ -0,0 +1,111 @@
+"""Measure time to first output of the subprocess executor.
+
+Starts a trivial task on this host and reports the time until its first
+output line:
+
+* cold: the virtualenv is built when the task starts
+* warm: the virtualenv is already cached
+* serial vs prefetch: a simulated upload of ``--upload-seconds`` runs
+  before the task, and the environment is built either afterwards (as
+  without pre-submit) or concurrently with the upload (as with
+  ``/api/v1/environments/prepare``); times are measured from the start
+  of the upload
+
+No Redis or Docker is needed.
+
+Usage: python bench_executor.py [--runs 10] [--upload-seconds 5] [--requirements "six==1.16.0"]
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from pathlib import Path
+
+# Add the app directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.core.config import get_settings
+from app.worker.executors import SubprocessExecutor, TaskSpec
+from app.worker.metrics import install_helper
+
+
+def run_once(executor: SubprocessExecutor, workdir: Path, requirements: str) -> float:
+    """Run one task and return seconds until its first output line."""
+    task_path = workdir / uuid.uuid4().hex
+    task_path.mkdir()
+    (task_path / "requirements.txt").write_text(requirements)
+    (task_path / "main.py").write_text("print('ready')\n")
+
+    started = time.monotonic()
+    process = executor.start(TaskSpec(
+        task_path.name,
+        str(task_path),
+        "main.py",
+        {"mem": "1g"},
+        {},
+        install_helper(str(task_path))
+    ))
+    try:
+        next(iter(process.output()))
+        first_output = time.monotonic() - started
+        process.wait()
+    finally:
+        process.cleanup()
+    return first_output
+
+
+def fresh_executor(workdir: Path) -> SubprocessExecutor:
+    """Executor with an empty virtualenv cache."""
+    settings = get_settings()
+    settings.venv_cache_path = str(workdir / f"venvs-{uuid.uuid4().hex}")
+    return SubprocessExecutor()
+
+
+def submit_to_first_output(workdir: Path, requirements: str, upload_seconds: float, prefetch: bool) -> float:
+    """Simulate upload then run, optionally preparing the environment meanwhile."""
+    executor = fresh_executor(workdir)
+    started = time.monotonic()
+
+    prefetcher = None
+    if prefetch:
+        prefetcher = threading.Thread(target=executor.prepare, args=(requirements.encode("utf-8"), "prefetch"))
+        prefetcher.start()
+    time.sleep(upload_seconds)
+
+    # The task waits on the cache lock if the prefetch is still running
+    run_once(executor, workdir, requirements)
+    if prefetcher is not None:
+        prefetcher.join()
+    return time.monotonic() - started
+
+
+def main():
+    """Run the benchmark and print start-up times."""
+    parser = argparse.ArgumentParser(description="Benchmark subprocess executor start-up")
+    parser.add_argument("--runs", type=int, default=10, help="warm runs after the cold one")
+    parser.add_argument("--upload-seconds", type=float, default=5.0, help="simulated upload time")
+    parser.add_argument("--requirements", default="", help="requirements.txt contents, ';' separated")
+    args = parser.parse_args()
+    requirements = args.requirements.replace(";", "\n")
+
+    with tempfile.TemporaryDirectory() as workdir:
+        executor = fresh_executor(Path(workdir))
+        cold = run_once(executor, Path(workdir), requirements)
+        warm = [run_once(executor, Path(workdir), requirements) for _ in range(args.runs)]
+        serial = submit_to_first_output(Path(workdir), requirements, args.upload_seconds, prefetch=False)
+        prefetched = submit_to_first_output(Path(workdir), requirements, args.upload_seconds, prefetch=True)
+
+    print(f"cold (builds virtualenv): {cold * 1000:8.1f}ms")
+    print(f"warm p50:                 {statistics.median(warm) * 1000:8.1f}ms")
+    print(f"warm max:                 {max(warm) * 1000:8.1f}ms")
+    print(f"upload {args.upload_seconds:g}s, then install: {serial:8.2f}s to first output")
+    print(f"upload {args.upload_seconds:g}s with prefetch: {prefetched:8.2f}s to first output "
+          f"({(serial - prefetched) / serial:.0%} less)")
+
+
+if __name__ == "__main__":
+    main()
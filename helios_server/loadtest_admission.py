@@ -0,0 +1,137 @@
+"""Load test for manager admission control.
+
+Floods the submit endpoint from many threads while other threads poll
+task status and logs, then reports how submissions were shed and how
+read latency held up. Accepted submissions are real (trivial) tasks, so
+run it against a test deployment.
+
+Usage: python loadtest_admission.py --manager-url http://localhost:8000 --submitters 50 --duration 30
+"""
+
+import argparse
+import io
+import json
+import threading
+import time
+import zipfile
+from collections import Counter
+from typing import Dict, List
+
+import requests
+
+
+def make_bundle() -> bytes:
+    """Build a minimal project zip in memory."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("main.py", "print('load test')\n")
+        zf.writestr("requirements.txt", "")
+    return buffer.getvalue()
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return a percentile of a list of latencies."""
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def submit(session: requests.Session, manager_url: str, bundle: bytes) -> requests.Response:
+    """Submit one load test task."""
+    metadata = {"entrypoint": "main.py", "priority": "default", "name": "load-test", "resources": {}}
+    return session.post(
+        f"{manager_url}/api/v1/tasks/submit",
+        files={
+            "file": ("project.zip", bundle, "application/zip"),
+            "metadata": (None, json.dumps(metadata), "application/json"),
+        },
+        timeout=60
+    )
+
+
+def main():
+    """Run the load test and print a summary."""
+    parser = argparse.ArgumentParser(description="Load test manager admission control")
+    parser.add_argument("--manager-url", default="http://localhost:8000")
+    parser.add_argument("--submitters", type=int, default=50, help="threads submitting as fast as they can")
+    parser.add_argument("--readers", type=int, default=10, help="threads polling status and logs")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    args = parser.parse_args()
+
+    manager_url = args.manager_url.rstrip("/")
+    bundle = make_bundle()
+
+    # A task for the readers to poll
+    response = submit(requests.Session(), manager_url, bundle)
+    response.raise_for_status()
+    task_id = response.json()["task_id"]
+
+    stop = threading.Event()
+    lock = threading.Lock()
+    submit_codes: Counter = Counter()
+    submit_latency: Dict[str, List[float]] = {"accepted": [], "shed": []}
+    read_latency: Dict[str, List[float]] = {"status": [], "logs": []}
+    read_errors: Counter = Counter()
+
+    def submitter() -> None:
+        session = requests.Session()
+        while not stop.is_set():
+            started = time.monotonic()
+            try:
+                code = submit(session, manager_url, bundle).status_code
+            except requests.exceptions.RequestException:
+                code = "error"
+            elapsed = time.monotonic() - started
+            with lock:
+                submit_codes[code] += 1
+                submit_latency["accepted" if code == 200 else "shed"].append(elapsed)
+
+    def reader() -> None:
+        session = requests.Session()
+        endpoints = {
+            "status": f"{manager_url}/api/v1/tasks/{task_id}/status",
+            "logs": f"{manager_url}/api/v1/tasks/{task_id}/logs?from_line=-50",
+        }
+        while not stop.is_set():
+            for kind, url in endpoints.items():
+                started = time.monotonic()
+                try:
+                    code = session.get(url, timeout=30).status_code
+                except requests.exceptions.RequestException:
+                    code = "error"
+                elapsed = time.monotonic() - started
+                with lock:
+                    read_latency[kind].append(elapsed)
+                    # A missing log archive (404) still proves the manager answered
+                    if code not in (200, 404):
+                        read_errors[f"{kind}:{code}"] += 1
+            time.sleep(0.1)
+
+    threads = [threading.Thread(target=submitter, daemon=True) for _ in range(args.submitters)]
+    threads += [threading.Thread(target=reader, daemon=True) for _ in range(args.readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    total = sum(submit_codes.values())
+    print(f"Submissions: {total} in {args.duration:g}s from {args.submitters} threads")
+    for code, count in sorted(submit_codes.items(), key=lambda item: str(item[0])):
+        print(f"  {code}: {count} ({count / max(total, 1):.1%})")
+    for kind, values in submit_latency.items():
+        print(f"  {kind:<8} p50 {percentile(values, 0.5) * 1000:7.1f}ms  p95 {percentile(values, 0.95) * 1000:7.1f}ms")
+
+    print(f"Reads while flooded ({args.readers} threads):")
+    for kind, values in read_latency.items():
+        print(f"  {kind:<8} n={len(values):<6} p50 {percentile(values, 0.5) * 1000:7.1f}ms  "
+              f"p95 {percentile(values, 0.95) * 1000:7.1f}ms  p99 {percentile(values, 0.99) * 1000:7.1f}ms  "
+              f"max {max(values or [0]) * 1000:7.1f}ms")
+    if read_errors:
+        print(f"  errors: {dict(read_errors)}")
+
+
+if __name__ == "__main__":
+    main()
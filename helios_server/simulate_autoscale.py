@@ -0,0 +1,42 @@
+"""Compare autoscaled and fixed worker pools under bursty load.
+
+Usage: python simulate_autoscale.py [--max-workers 8] [--hours 1]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# Add the app directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.worker.autoscale import AutoscalePolicy, FixedPolicy, bursty_arrivals, simulate
+
+
+def main():
+    """Run the simulation and print a comparison table."""
+    parser = argparse.ArgumentParser(description="Simulate worker autoscaling under bursty load")
+    parser.add_argument("--max-workers", type=int, default=8)
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    
+    # Quiet background traffic (1 job/min) with a 1-minute burst (1 job/4s) every 10 minutes
+    arrivals = bursty_arrivals(int(args.hours * 3600), 1 / 60, 1 / 4, 600, 60, seed=args.seed)
+    service_time = lambda rng: rng.uniform(20, 60)
+    
+    pools = [(f"fixed-{n}", FixedPolicy(n), n) for n in (2, args.max_workers // 2, args.max_workers)]
+    pools.append((f"auto-1..{args.max_workers}", AutoscalePolicy(1, args.max_workers), 1))
+    
+    print(f"{len(arrivals)} jobs over {args.hours:g}h, 20-60s each\n")
+    print(f"{'pool':<12} {'mean wait':>10} {'p95 wait':>10} {'max wait':>10} "
+          f"{'worker-s':>10} {'idle worker-s':>14} {'peak':>5}")
+    for name, policy, initial in pools:
+        result = simulate(policy, arrivals, service_time, initial_workers=initial)
+        print(f"{name:<12} {result['mean_wait']:>9.1f}s {result['p95_wait']:>9.1f}s "
+              f"{result['max_wait']:>9.1f}s {result['worker_seconds']:>10.0f} "
+              f"{result['idle_worker_seconds']:>14.0f} {result['peak_workers']:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""Autoscaling supervisor entry point for Helios workers."""
+
+import logging
+import sys
+from pathlib import Path
+
+# Add the app directory to Python path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from redis import Redis
+
+from app.core.config import get_settings
+from app.core.constants import QueueNames
+from app.worker.autoscale import AutoscalePolicy, WorkerSupervisor
+
+
+def main():
+    """Run worker processes on this host, scaled by queue depth and wait time."""
+    settings = get_settings()
+    
+    # Configure logging
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper()),
+        format=settings.log_format
+    )
+    
+    logger = logging.getLogger(__name__)
+    logger.info(
+        f"Starting Helios worker supervisor on node {settings.worker_node} "
+        f"({settings.autoscale_min_workers}-{settings.autoscale_max_workers} workers)"
+    )
+    
+    # Create Redis connection
+    redis_conn = Redis(
+        host=settings.redis_host,
+        port=settings.redis_port,
+        db=settings.redis_db,
+        password=settings.redis_password
+    )
+    
+    policy = AutoscalePolicy(
+        min_workers=settings.autoscale_min_workers,
+        max_workers=settings.autoscale_max_workers,
+        target_wait=settings.autoscale_target_wait,
+        scale_down_delay=settings.autoscale_scale_down_delay,
+        worker_memory=settings.autoscale_worker_memory,
+        max_load=settings.autoscale_max_load
+    )
+    supervisor = WorkerSupervisor(
+        policy,
+        redis_conn,
+        settings.worker_node,
+        QueueNames.for_worker(settings.worker_node),
+        str(Path(__file__).parent / "worker.py")
+    )
+    supervisor.run(settings.autoscale_interval)
+
+
+if __name__ == "__main__":
+    main()
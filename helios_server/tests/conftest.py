@@ -0,0 +1,52 @@
+"""Shared fixtures for Helios server tests."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add the app directory to Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.config import get_settings
+
+
+@pytest.fixture
+def settings(tmp_path, monkeypatch):
+    """Settings with every storage path under a temporary directory."""
+    settings = get_settings()
+    for name in (
+        "task_storage_path",
+        "dataset_storage_path",
+        "dataset_cache_path",
+        "log_archive_path",
+        "venv_cache_path",
+        "environment_cache_path",
+    ):
+        path = tmp_path / name
+        path.mkdir()
+        monkeypatch.setattr(settings, name, str(path))
+    monkeypatch.setattr(settings, "admission_enabled", False)
+    return settings
+
+
+@pytest.fixture
+def redis_client():
+    """In-memory Redis with the decoding the manager uses."""
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def client(settings, redis_client):
+    """Manager API client backed by the in-memory Redis."""
+    from fastapi.testclient import TestClient
+
+    from app.core.admission import AdmissionController
+    from app.core.redis import get_redis_client
+    from app.main import app
+
+    app.dependency_overrides[get_redis_client] = lambda: redis_client
+    app.state.admission = AdmissionController(redis_client)
+    yield TestClient(app)
+    app.dependency_overrides.clear()
@@ -0,0 +1,102 @@
+"""Tests for admission control and its middleware."""
+
+import time
+
+import pytest
+
+from app.core.admission import AdmissionController
+
+pytest.importorskip("lupa", reason="the token bucket is a Lua script")
+
+
+@pytest.fixture
+def limited(settings, redis_client, monkeypatch):
+    """Enable admission with a fast-refilling bucket of two tokens."""
+    # The in-memory Redis has no INFO; report an unlimited, empty server
+    monkeypatch.setattr(redis_client, "info", lambda section=None: {"used_memory": 0, "maxmemory": 0})
+    monkeypatch.setattr(settings, "admission_enabled", True)
+    monkeypatch.setattr(settings, "admission_rate", 20.0)
+    monkeypatch.setattr(settings, "admission_burst", 2)
+    monkeypatch.setattr(settings, "admission_min_free_disk", 0)
+    return settings
+
+
+def open_upload(client):
+    """Open an upload session, a rate-limited submission."""
+    return client.post("/api/v1/uploads", json={"filename": "p.zip", "total_size": 10})
+
+
+def test_burst_then_reject(limited, redis_client):
+    controller = AdmissionController(redis_client)
+    assert controller.rate_limit("a") is None
+    assert controller.rate_limit("a") is None
+
+    rejection = controller.rate_limit("a")
+    assert rejection.status_code == 429
+    assert 0 < rejection.retry_after <= 1 / limited.admission_rate
+    # Buckets are per client
+    assert controller.rate_limit("b") is None
+
+
+def test_bucket_refills(limited, redis_client):
+    controller = AdmissionController(redis_client)
+    for _ in range(2):
+        controller.rate_limit("a")
+    assert controller.rate_limit("a") is not None
+
+    time.sleep(2 / limited.admission_rate)
+    assert controller.rate_limit("a") is None
+
+
+def test_rate_zero_disables_limit(limited, redis_client, monkeypatch):
+    monkeypatch.setattr(limited, "admission_rate", 0)
+    controller = AdmissionController(redis_client)
+    assert all(controller.rate_limit("a") is None for _ in range(10))
+    assert not redis_client.keys("admission:*")
+
+
+def test_middleware_answers_429_with_retry_after(limited, client):
+    assert open_upload(client).status_code == 200
+    assert open_upload(client).status_code == 200
+
+    response = open_upload(client)
+    assert response.status_code == 429
+    assert response.json() == {"detail": "Submission rate limit exceeded"}
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_exempt_requests_are_not_limited(limited, client):
+    upload_id = open_upload(client).json()["upload_id"]
+    open_upload(client)
+    assert open_upload(client).status_code == 429
+
+    # Reads, chunk uploads and paths outside ADMISSION_PATHS skip admission
+    for _ in range(3):
+        assert client.get("/health").status_code == 200
+        assert client.get(f"/api/v1/uploads/{upload_id}").status_code == 200
+        assert client.post("/api/v1/environments/prepare", json={"requirements": ""}).status_code == 200
+
+
+def test_overload_is_503_and_spends_no_tokens(limited, client, redis_client, monkeypatch):
+    monkeypatch.setattr(limited, "admission_max_queued", 0)
+    response = open_upload(client)
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == str(int(limited.admission_retry_after))
+    assert not redis_client.keys("admission:client:*")
+
+
+def test_overload_check_is_cached(limited, redis_client, monkeypatch):
+    controller = AdmissionController(redis_client)
+    assert controller.overload() is None
+
+    monkeypatch.setattr(limited, "admission_max_queued", 0)
+    assert controller.overload() is None
+    controller._checked_at -= limited.admission_cache_seconds
+    assert controller.overload().status_code == 503
+
+
+def test_redis_memory_overload(limited, redis_client, monkeypatch):
+    monkeypatch.setattr(redis_client, "info", lambda section=None: {"used_memory": 95, "maxmemory": 100})
+    rejection = AdmissionController(redis_client).overload()
+    assert rejection.status_code == 503
+    assert "Redis memory" in rejection.detail
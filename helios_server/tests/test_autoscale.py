@@ -0,0 +1,69 @@
+"""Tests for worker autoscaling decisions."""
+
+import pytest
+
+from app.core.constants import QueueNames
+from app.worker.autoscale import AutoscalePolicy, QueueSnapshot, WorkerSupervisor
+
+
+@pytest.fixture
+def redis_conn():
+    """In-memory Redis without response decoding, as the supervisor uses."""
+    fakeredis = pytest.importorskip("fakeredis")
+    return fakeredis.FakeRedis()
+
+
+def register_node(redis_conn, node):
+    """Register an idle worker consuming ``node``'s queues."""
+    from rq import Queue, Worker
+
+    queues = [Queue(name, connection=redis_conn) for name in QueueNames.for_worker(node)]
+    Worker(queues, connection=redis_conn, name=f"worker-{node}").register_birth()
+
+
+def enqueue(redis_conn, queue_name, count):
+    """Put ``count`` jobs on a queue."""
+    from rq import Queue
+
+    queue = Queue(queue_name, connection=redis_conn)
+    for _ in range(count):
+        queue.enqueue("os.getcwd")
+
+
+def supervisor(redis_conn, node):
+    """Supervisor for ``node`` that never starts processes."""
+    return WorkerSupervisor(AutoscalePolicy(0, 8), redis_conn, node, QueueNames.for_worker(node), "worker.py")
+
+
+def test_shared_backlog_is_split_between_live_nodes(redis_conn):
+    for node in ("a", "b", "c"):
+        register_node(redis_conn, node)
+    enqueue(redis_conn, QueueNames.DEFAULT, 7)
+    enqueue(redis_conn, QueueNames.for_node("a", QueueNames.DEFAULT), 2)
+
+    assert supervisor(redis_conn, "a").queue_snapshot().queued == 2 + 3
+    assert supervisor(redis_conn, "b").queue_snapshot().queued == 3
+
+
+def test_node_without_workers_counts_itself(redis_conn):
+    register_node(redis_conn, "b")
+    enqueue(redis_conn, QueueNames.HIGH, 4)
+
+    snapshot = supervisor(redis_conn, "a").queue_snapshot()
+    assert snapshot.queued == 2
+    assert snapshot.busy == 0
+    assert snapshot.oldest_wait >= 0
+
+
+def test_policy_scales_up_to_queued_work():
+    policy = AutoscalePolicy(1, 4)
+    assert policy.desired_workers(0, 1, QueueSnapshot(queued=2, busy=1, oldest_wait=0)) == 3
+    assert policy.desired_workers(0, 1, QueueSnapshot(queued=10, busy=1, oldest_wait=0)) == 4
+
+
+def test_policy_scales_down_after_delay():
+    policy = AutoscalePolicy(1, 4, scale_down_delay=60)
+    idle = QueueSnapshot(queued=0, busy=0, oldest_wait=0)
+    assert policy.desired_workers(0, 3, idle) == 3
+    assert policy.desired_workers(59, 3, idle) == 3
+    assert policy.desired_workers(60, 3, idle) == 2
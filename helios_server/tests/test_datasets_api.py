@@ -0,0 +1,52 @@
+"""Tests for the dataset registry endpoints."""
+
+import hashlib
+import io
+import zipfile
+
+
+def upload_bundle(client, data: bytes) -> str:
+    """Upload ``data`` through a one-chunk upload session and return its ID."""
+    response = client.post("/api/v1/uploads", json={"filename": "data.zip", "total_size": len(data)})
+    assert response.status_code == 200
+    upload_id = response.json()["upload_id"]
+    response = client.put(
+        f"/api/v1/uploads/{upload_id}/chunks/0",
+        content=data,
+        headers={"X-Chunk-SHA256": hashlib.sha256(data).hexdigest()}
+    )
+    assert response.status_code == 200
+    return upload_id
+
+
+def make_zip() -> bytes:
+    """Build a small dataset archive."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("train.csv", "a,b\n1,2\n")
+    return buffer.getvalue()
+
+
+def test_dataset_lifecycle(client):
+    data = make_zip()
+    upload_id = upload_bundle(client, data)
+
+    response = client.post("/api/v1/datasets", json={"name": "mnist", "upload_id": upload_id})
+    assert response.status_code == 200
+    created = response.json()
+    assert created["name"] == "mnist"
+    assert created["size"] == len(data)
+
+    response = client.get("/api/v1/datasets/mnist")
+    assert response.status_code == 200
+    assert response.json()["version"] == created["version"]
+
+    response = client.get("/api/v1/datasets")
+    assert [dataset["name"] for dataset in response.json()] == ["mnist"]
+
+    assert client.delete("/api/v1/datasets/mnist").status_code == 200
+    assert client.get("/api/v1/datasets/mnist").status_code == 404
+
+
+def test_unknown_dataset_is_404(client):
+    assert client.get("/api/v1/datasets/missing").status_code == 404
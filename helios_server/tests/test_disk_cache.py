@@ -0,0 +1,73 @@
+"""Tests for the node-local disk cache."""
+
+import os
+
+from app.worker.cache import DiskCache
+
+
+def fill_bytes(size):
+    """Fill function writing ``size`` bytes into an entry."""
+    def fill(path):
+        (path / "blob").write_bytes(b"x" * size)
+    return fill
+
+
+def test_hit_does_not_refill(tmp_path):
+    cache = DiskCache(str(tmp_path), budget=100)
+    calls = []
+
+    def fill(path):
+        calls.append(path)
+        (path / "blob").write_bytes(b"x")
+
+    first = cache.acquire("a", fill, "t1")
+    second = cache.acquire("a", fill, "t2")
+    assert first == second
+    assert (first / "blob").read_bytes() == b"x"
+    assert len(calls) == 1
+
+
+def test_evicts_least_recently_used_unpinned(tmp_path):
+    evicted = []
+    cache = DiskCache(str(tmp_path), budget=100, on_evict=evicted.append)
+    cache.acquire("old", fill_bytes(40), "t")
+    cache.release("old", "t")
+    cache.acquire("pinned", fill_bytes(40), "t")
+    os.utime(tmp_path / "old" / "meta.json", (0, 0))
+
+    cache.acquire("new", fill_bytes(40), "t")
+    assert evicted == ["old"]
+    assert {key for key, _, _, _ in cache.entries()} == {"pinned", "new"}
+
+
+def test_pinned_entries_survive_over_budget(tmp_path):
+    cache = DiskCache(str(tmp_path), budget=50)
+    cache.acquire("a", fill_bytes(40), "t")
+    cache.acquire("b", fill_bytes(40), "t")
+    assert {key for key, _, _, pinned in cache.entries() if pinned} == {"a", "b"}
+
+
+def test_evicted_entry_is_refilled(tmp_path):
+    cache = DiskCache(str(tmp_path), budget=50)
+    cache.acquire("a", fill_bytes(40), "t")
+    cache.release("a", "t")
+    cache.acquire("b", fill_bytes(40), "t")
+    assert not (tmp_path / "a").exists()
+
+    path = cache.acquire("a", fill_bytes(40), "t")
+    assert (path / "blob").stat().st_size == 40
+    assert any(key == "a" and pinned for key, _, _, pinned in cache.entries())
+
+
+def test_failed_fill_leaves_no_entry(tmp_path):
+    cache = DiskCache(str(tmp_path), budget=100)
+
+    def fill(path):
+        raise RuntimeError("boom")
+
+    try:
+        cache.acquire("a", fill, "t")
+    except RuntimeError:
+        pass
+    assert cache.entries() == []
+    assert list((tmp_path / ".tmp").iterdir()) == []
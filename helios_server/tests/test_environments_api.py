@@ -0,0 +1,102 @@
+"""Tests for environment prefetch: the prepare endpoint and its worker job."""
+
+import subprocess
+
+import pytest
+from rq import Queue
+
+from app.core.constants import EnvironmentStatus, QueueNames
+from app.core.environments import environment_digest, environment_nodes_key, environment_preparing_key
+from app.worker import executors, tasks
+
+REQUIREMENTS = "six==1.16.0\n"
+
+
+@pytest.fixture
+def worker(settings, redis_client, monkeypatch):
+    """Run prefetch jobs on node ``node-a`` against the in-memory Redis, without pip."""
+    monkeypatch.setattr(settings, "allow_subprocess_executor", True)
+    monkeypatch.setattr(settings, "worker_node", "node-a")
+    monkeypatch.setattr(tasks.redis, "Redis", lambda **kwargs: redis_client)
+    monkeypatch.setattr(redis_client, "close", lambda: None)
+
+    builds = []
+
+    def fake_run(command, **kwargs):
+        if command[1:3] == ["-m", "venv"]:
+            builds.append(command[-1])
+            (executors.Path(command[-1]) / "bin").mkdir(parents=True)
+        return subprocess.CompletedProcess(command, 0, stdout=b"")
+
+    monkeypatch.setattr(executors.subprocess, "run", fake_run)
+    return builds
+
+
+def prepare(client, requirements=REQUIREMENTS):
+    """Announce ``requirements`` for the subprocess executor."""
+    response = client.post(
+        "/api/v1/environments/prepare", json={"requirements": requirements, "executor": "subprocess"}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def run_jobs(redis_client):
+    """Run and remove every queued prefetch job, as a worker would."""
+    import fakeredis
+
+    # Job payloads are pickled, so read them without response decoding
+    connection = redis_client.connection_pool.connection_kwargs
+    raw_client = fakeredis.FakeRedis(host=connection["host"], port=connection["port"])
+    queue = Queue(QueueNames.PREPARE, connection=raw_client)
+    jobs = queue.jobs
+    queue.empty()
+    for job in jobs:
+        tasks.prepare_environment(*job.args)
+    return len(jobs)
+
+
+def test_empty_requirements_need_no_prefetch(client, redis_client, worker):
+    assert prepare(client, " \n")["status"] == EnvironmentStatus.EMPTY
+    assert Queue(QueueNames.PREPARE, connection=redis_client).count == 0
+
+
+def test_concurrent_announcements_enqueue_once(client, redis_client, worker):
+    first = prepare(client)
+    second = prepare(client)
+    assert first["status"] == second["status"] == EnvironmentStatus.PREPARING
+    assert first["environment"] == environment_digest(REQUIREMENTS.encode())
+    assert Queue(QueueNames.PREPARE, connection=redis_client).count == 1
+
+
+def test_prepared_environment_is_a_cache_hit(client, redis_client, worker):
+    prepare(client)
+    assert run_jobs(redis_client) == 1
+    assert len(worker) == 1
+
+    digest = environment_digest(REQUIREMENTS.encode())
+    assert not redis_client.exists(environment_preparing_key("subprocess", digest))
+    assert redis_client.smembers(environment_nodes_key("subprocess", digest)) == {"node-a"}
+
+    response = prepare(client)
+    assert response["status"] == EnvironmentStatus.READY
+    assert response["nodes"] == ["node-a"]
+    assert run_jobs(redis_client) == 0
+
+    # A repeated prefetch on the node reuses the cached virtualenv
+    tasks.prepare_environment(REQUIREMENTS, "subprocess")
+    assert len(worker) == 1
+
+
+def test_failed_prefetch_can_be_requested_again(client, redis_client, worker, monkeypatch):
+    def broken_run(command, **kwargs):
+        raise OSError("no venv module")
+
+    monkeypatch.setattr(executors.subprocess, "run", broken_run)
+    prepare(client)
+    run_jobs(redis_client)
+
+    digest = environment_digest(REQUIREMENTS.encode())
+    assert not redis_client.exists(environment_nodes_key("subprocess", digest))
+    assert prepare(client)["status"] == EnvironmentStatus.PREPARING
+    assert Queue(QueueNames.PREPARE, connection=redis_client).count == 1
@@ -0,0 +1,235 @@
+"""Tests for executor selection and the subprocess executor."""
+
+import subprocess
+import sys
+
+import pytest
+
+from app.core.environments import environment_digest, environment_nodes_key
+from app.worker import executors
+from app.worker.executors import (
+    DockerExecutor,
+    ExecutorError,
+    SubprocessExecutor,
+    SubprocessProcess,
+    TaskSpec,
+    resolve_executor,
+)
+
+LIMITS_SCRIPT = """\
+import os
+import resource
+print(os.getpid())
+for limit in ("RLIMIT_AS", "RLIMIT_CORE", "RLIMIT_CPU"):
+    print(limit, *resource.getrlimit(getattr(resource, limit)))
+"""
+
+
+@pytest.fixture
+def subprocess_settings(settings, tmp_path, monkeypatch):
+    """Settings allowing the subprocess executor without a writable cgroup."""
+    monkeypatch.setattr(settings, "allow_subprocess_executor", True)
+    monkeypatch.setattr(settings, "subprocess_cgroup_root", str(tmp_path / "no-cgroup"))
+    monkeypatch.setattr(settings, "worker_node", "node-a")
+    return settings
+
+
+def fake_environment(destination):
+    """Fill a virtualenv cache entry whose interpreter is the test's own."""
+    (destination / "bin").mkdir()
+    (destination / "bin" / "python").symlink_to(sys.executable)
+
+
+def seed_venv(executor, requirements=b""):
+    """Put a ready virtualenv for ``requirements`` in the executor's cache."""
+    key = f"{executor.environment_prefix}-{environment_digest(requirements)}"
+    executor.venv_cache.acquire(key, fake_environment, owner="seed")
+    executor.venv_cache.release(key, "seed")
+    return key
+
+
+def task(tmp_path, script=LIMITS_SCRIPT, **resources):
+    """Task spec for a project containing ``main.py``."""
+    task_path = tmp_path / "task"
+    task_path.mkdir()
+    (task_path / "main.py").write_text(script)
+    return TaskSpec("t1", str(task_path), "main.py", resources, {}, ".helios")
+
+
+def run(process):
+    """Collect a process's output lines and exit code."""
+    lines = [line.decode().split() for line in process.output()]
+    return lines, process.wait()
+
+
+def pinned(cache):
+    """Keys of the cache entries currently pinned."""
+    return {key for key, _, _, is_pinned in cache.entries() if is_pinned}
+
+
+def test_resolve_executor_prefers_task_then_queue(subprocess_settings, monkeypatch):
+    monkeypatch.setattr(subprocess_settings, "queue_executors", {"high": "subprocess"})
+    assert resolve_executor("docker", "high") == "docker"
+    assert resolve_executor(None, "high") == "subprocess"
+    # Node queues fall back to the executor of their shared queue
+    assert resolve_executor(None, "node:a:high") == "subprocess"
+    assert resolve_executor(None, "default") == "docker"
+    assert resolve_executor(None, None) == "docker"
+
+
+def test_resolve_executor_rejects_unknown_and_disabled(subprocess_settings, monkeypatch):
+    with pytest.raises(ExecutorError, match="Unknown executor"):
+        resolve_executor("podman", None)
+    monkeypatch.setattr(subprocess_settings, "allow_subprocess_executor", False)
+    with pytest.raises(ExecutorError, match="disabled"):
+        resolve_executor("subprocess", None)
+
+
+def test_rlimits_without_cgroup(subprocess_settings, tmp_path):
+    executor = SubprocessExecutor()
+    key = seed_venv(executor)
+
+    process = executor.start(task(tmp_path, mem="256m", cpu="2"))
+    assert pinned(executor.venv_cache) == {key}
+    try:
+        lines, exit_code = run(process)
+    finally:
+        process.cleanup()
+
+    assert exit_code == 0
+    limits = {line[0]: (int(line[1]), int(line[2])) for line in lines[1:]}
+    cpu_seconds = subprocess_settings.docker_timeout * 2
+    assert limits["RLIMIT_AS"] == (256 * 1024 ** 2, 256 * 1024 ** 2)
+    assert limits["RLIMIT_CORE"] == (0, 0)
+    assert limits["RLIMIT_CPU"] == (cpu_seconds, cpu_seconds + 5)
+    assert pinned(executor.venv_cache) == set()
+
+
+def test_cgroup_limits_replace_memory_rlimit(subprocess_settings, tmp_path, monkeypatch):
+    root = tmp_path / "cgroup"
+    root.mkdir()
+    (root / "cgroup.procs").write_text("")
+    monkeypatch.setattr(subprocess_settings, "subprocess_cgroup_root", str(root))
+    # A plain directory cannot be removed while its control files exist
+    monkeypatch.setattr(executors.time, "sleep", lambda seconds: None)
+    executor = SubprocessExecutor()
+    seed_venv(executor)
+
+    process = executor.start(task(tmp_path, mem="1g", cpu="0.5"))
+    cgroup = root / "task-t1"
+    try:
+        lines, exit_code = run(process)
+        assert exit_code == 0
+        assert (cgroup / "cgroup.procs").read_text() == lines[0][0]
+        assert (cgroup / "memory.max").read_text() == str(1024 ** 3)
+        assert (cgroup / "memory.swap.max").read_text() == "0"
+        assert (cgroup / "cpu.max").read_text() == "50000 100000"
+        assert (root / "cgroup.subtree_control").read_text() == "+cpu +memory +io"
+        assert int(lines[1][1]) == -1  # RLIMIT_AS left unlimited
+    finally:
+        process.cleanup()
+    assert (cgroup / "cgroup.kill").read_text() == "1"
+    assert process.cgroup is None
+
+
+def test_failed_start_releases_environment(subprocess_settings, tmp_path):
+    executor = SubprocessExecutor()
+    key = seed_venv(executor)
+    (executor.venv_cache.root / key / "data" / "bin" / "python").unlink()
+
+    with pytest.raises(OSError):
+        executor.start(task(tmp_path))
+    assert pinned(executor.venv_cache) == set()
+
+
+def test_prepare_advertises_and_unpins(subprocess_settings, redis_client):
+    executor = SubprocessExecutor(redis_client)
+    key = seed_venv(executor, b"six\n")
+
+    executor.prepare(b"six\n", "prefetch")
+    nodes_key = environment_nodes_key("subprocess", environment_digest(b"six\n"))
+    assert redis_client.smembers(nodes_key) == {"node-a"}
+    assert pinned(executor.venv_cache) == set()
+    assert [entry[0] for entry in executor.venv_cache.entries()] == [key]
+
+
+def test_failed_build_withdraws_advertisement(subprocess_settings, redis_client):
+    executor = SubprocessExecutor(redis_client)
+
+    def fill(destination):
+        raise ExecutorError("pip install failed")
+
+    with pytest.raises(ExecutorError):
+        executor._acquire_environment(executor.venv_cache, "abc", fill, "t1")
+    assert not redis_client.exists(environment_nodes_key("subprocess", "abc"))
+    assert executor.venv_cache.entries() == []
+
+
+def test_eviction_withdraws_advertisement(subprocess_settings, redis_client, monkeypatch):
+    monkeypatch.setattr(subprocess_settings, "venv_cache_budget", 1)
+    executor = SubprocessExecutor(redis_client)
+
+    def fill(destination):
+        (destination / "blob").write_bytes(b"x")
+
+    executor._acquire_environment(executor.venv_cache, "old", fill, "t1")
+    executor.venv_cache.release(f"{executor.environment_prefix}-old", "t1")
+    executor._acquire_environment(executor.venv_cache, "new", fill, "t2")
+    assert not redis_client.exists(environment_nodes_key("subprocess", "old"))
+    assert redis_client.smembers(environment_nodes_key("subprocess", "new")) == {"node-a"}
+
+
+def test_docker_user_base_pin_and_release(subprocess_settings, redis_client):
+    executor = DockerExecutor(redis_client)
+    assert executor._acquire_user_base(b"  \n", "t1") is None
+
+    requirements = b"six\n"
+    key = f"userbase-{environment_digest(requirements)}"
+    executor.environment_cache.acquire(key, lambda destination: None, owner="seed")
+    executor.environment_cache.release(key, "seed")
+
+    assert executor._acquire_user_base(requirements, "t1") == key
+    assert pinned(executor.environment_cache) == {key}
+    executor.environment_cache.release(key, "t1")
+    executor.prepare(requirements, "prefetch")
+    assert pinned(executor.environment_cache) == set()
+    nodes_key = environment_nodes_key("docker", environment_digest(requirements))
+    assert redis_client.smembers(nodes_key) == {"node-a"}
+
+
+def test_stats_from_proc(subprocess_settings):
+    process = subprocess.Popen(
+        [sys.executable, "-c", "import time\nend = time.time() + 2.5\nwhile time.time() < end: pass"],
+        stdout=subprocess.PIPE,
+        start_new_session=True
+    )
+    wrapped = SubprocessProcess(process, None, 1024, None)
+    try:
+        samples = wrapped.stats()
+        assert next(samples) is None
+        sample = next(samples)
+    finally:
+        wrapped.cleanup()
+    assert sample["cpu_percent"] > 10
+    assert sample["mem_bytes"] > 0
+    assert sample["mem_limit_bytes"] == 1024
+
+
+def test_usage_from_cgroup(tmp_path):
+    cgroup = tmp_path / "task"
+    cgroup.mkdir()
+    (cgroup / "cpu.stat").write_text("usage_usec 2500000\nnr_throttled 3\nthrottled_usec 40\n")
+    (cgroup / "memory.current").write_text("4096\n")
+    (cgroup / "io.stat").write_text("8:0 rbytes=100 wbytes=20 rios=1\n8:16 rbytes=1 wbytes=2\n")
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+
+    usage = SubprocessProcess(process, cgroup, 0, None)._usage()
+    assert usage == {
+        "cpu_seconds": 2.5,
+        "mem_bytes": 4096.0,
+        "io_read_bytes": 101.0,
+        "io_write_bytes": 22.0,
+        "throttled_periods": 3.0,
+        "throttled_time_ns": 40000.0,
+    }
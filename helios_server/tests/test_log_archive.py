@@ -0,0 +1,48 @@
+"""Tests for the compressed log archive."""
+
+from app.core.log_archive import LogArchiveReader, LogArchiveWriter
+
+
+def write_archive(path, lines, chunk_bytes=64):
+    """Write lines to an archive with small chunks and close it."""
+    writer = LogArchiveWriter(path, chunk_bytes)
+    for line in lines:
+        writer.write_line(line)
+    writer.close()
+    return writer
+
+
+def test_read_ranges_across_chunks(tmp_path):
+    lines = [f"line {i}" for i in range(100)]
+    write_archive(tmp_path / "log", lines)
+    reader = LogArchiveReader(tmp_path / "log")
+
+    assert reader.complete
+    assert reader.chunks > 1
+    assert reader.total_lines == 100
+    assert reader.read_lines(10, 13) == [(10, "line 10"), (11, "line 11"), (12, "line 12")]
+    assert reader.read_lines(-2) == [(98, "line 98"), (99, "line 99")]
+    assert reader.read_lines(5, 50, limit=2) == [(5, "line 5"), (6, "line 6")]
+    assert reader.read_lines(200, 300) == []
+
+
+def test_multiline_write_counts_each_line(tmp_path):
+    writer = write_archive(tmp_path / "log", ["first", "error:\ndetail one\ndetail two", "last"])
+    reader = LogArchiveReader(tmp_path / "log")
+
+    assert writer.total_lines == 5
+    assert reader.read_lines() == [
+        (0, "first"), (1, "error:"), (2, "detail one"), (3, "detail two"), (4, "last")
+    ]
+    assert reader.read_lines(2, 4) == [(2, "detail one"), (3, "detail two")]
+
+
+def test_grep_finds_literal_matches(tmp_path):
+    lines = [f"step {i} loss" for i in range(200)]
+    lines[150] = "Traceback: ValueError raised"
+    write_archive(tmp_path / "log", lines)
+    reader = LogArchiveReader(tmp_path / "log")
+
+    assert reader.grep("ValueError") == [(150, "Traceback: ValueError raised")]
+    assert reader.grep("ValueError", to_line=100) == []
+    assert len(reader.grep("loss", limit=5)) == 5
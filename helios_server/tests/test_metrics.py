@@ -0,0 +1,90 @@
+"""Tests for task metrics parsing and aggregation."""
+
+import json
+
+import pytest
+
+from app.core.constants import MetricsProtocol
+from app.worker.metrics import METRICS_PREFIX_BYTES, MetricsRecorder, parse_event
+from app.worker.sdk import helios
+
+
+class Publisher:
+    """Records messages published to Redis channels."""
+
+    def __init__(self):
+        self.messages = []
+
+    def publish(self, channel, message):
+        self.messages.append((channel, json.loads(message)))
+
+
+def line(event):
+    """Encode an event the way the task helper does."""
+    return METRICS_PREFIX_BYTES + json.dumps(event).encode("utf-8")
+
+
+def test_helper_prefix_matches_protocol():
+    assert helios.LINE_PREFIX == MetricsProtocol.LINE_PREFIX
+
+
+def test_helper_output_parses(capsys):
+    helios.log_metric("loss", 0.5, step=3)
+    helios.log_metric("loss", float("nan"))
+    helios.progress(2, 10, "epoch 2")
+    lines = capsys.readouterr().out.encode("utf-8").splitlines()
+    assert [parse_event(raw) for raw in lines] == [
+        {"type": "metric", "name": "loss", "value": 0.5, "step": 3},
+        {"type": "progress", "current": 2.0, "total": 10.0, "message": "epoch 2"},
+    ]
+
+
+@pytest.mark.parametrize("raw", [
+    METRICS_PREFIX_BYTES + b"not json",
+    line([1, 2]),
+    line({"type": "metric", "name": "loss"}),
+    line({"type": "metric", "name": "loss", "value": "high"}),
+    line({"type": "progress"}),
+    line({"type": "other"}),
+    METRICS_PREFIX_BYTES + b" " * MetricsProtocol.MAX_LINE_BYTES,
+])
+def test_malformed_events_are_rejected(raw):
+    assert parse_event(raw) is None
+
+
+def test_event_fields_are_normalized():
+    event = parse_event(line({"type": "metric", "name": "n" * 500, "value": "1.5", "step": "7", "extra": 1}))
+    assert event == {"type": "metric", "name": "n" * 100, "value": 1.5, "step": 7}
+
+
+def test_recorder_aggregates_metrics():
+    recorder = MetricsRecorder("t1", Publisher(), max_points=4)
+    for step, value in enumerate([3.0, 1.0, 2.0, 5.0, 4.0]):
+        recorder.handle_line(line({"type": "metric", "name": "loss", "value": value, "step": step}))
+    recorder.handle_line(b"@@helios garbage")
+
+    summary = recorder.summary()
+    loss = summary["metrics"]["loss"]
+    assert (loss["count"], loss["last"], loss["min"], loss["max"]) == (5, 4.0, 1.0, 5.0)
+    assert len(loss["points"]) <= 4
+    assert summary["dropped_events"] == 1
+
+
+def test_recorder_bounds_series():
+    recorder = MetricsRecorder("t1", Publisher(), max_series=2)
+    for name in ("a", "b", "c"):
+        recorder.handle_line(line({"type": "metric", "name": name, "value": 1}))
+    assert sorted(recorder.summary()["metrics"]) == ["a", "b"]
+    assert recorder.dropped == 1
+
+
+def test_recorder_throttles_publishing_but_relays_completion():
+    publisher = Publisher()
+    recorder = MetricsRecorder("t1", publisher, publish_interval=3600)
+    for current in range(5):
+        recorder.handle_line(line({"type": "progress", "current": current, "total": 5}))
+    recorder.handle_line(line({"type": "progress", "current": 5, "total": 5}))
+
+    assert [message["current"] for _, message in publisher.messages] == [0.0, 5.0]
+    assert all(channel == "metrics:t1" for channel, _ in publisher.messages)
+    assert recorder.summary()["progress"]["current"] == 5.0
@@ -0,0 +1,129 @@
+"""Tests for pipeline stage scheduling."""
+
+import json
+
+import pytest
+
+from app.core.constants import QueueNames, StageStatus, TaskStatus
+from app.core.pipelines import (
+    advance_pipeline,
+    create_pipeline,
+    finish_stage,
+    load_stages,
+    pipeline_key,
+    pipeline_lock,
+    retry_pipeline,
+    start_stage,
+    topological_order,
+)
+
+
+def stage(*depends_on, **extra):
+    """Stage spec with no resources or datasets."""
+    return {"entrypoint": "main.py", "depends_on": list(depends_on), "resources": {}, "datasets": {}, **extra}
+
+
+@pytest.fixture
+def pipeline(settings, redis_client, tmp_path):
+    """Create a diamond pipeline ``prep -> (train, eval) -> report``."""
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    create_pipeline(redis_client, "p1", "demo", "default", str(workspace), {
+        "prep": stage(),
+        "train": stage("prep"),
+        "eval": stage("prep"),
+        "report": stage("train", "eval"),
+    })
+    return workspace
+
+
+def statuses(redis_client):
+    """Current status of every stage."""
+    return {name: state["status"] for name, state in load_stages(redis_client, "p1").items()}
+
+
+def queued_tasks(redis_client):
+    """Task IDs waiting on the shared default queue."""
+    return redis_client.lrange(f"rq:queue:{QueueNames.DEFAULT}", 0, -1)
+
+
+def test_topological_order():
+    order = topological_order({"report": ["train", "eval"], "train": ["prep"], "eval": ["prep"], "prep": []})
+    assert order[0] == "prep" and order[-1] == "report"
+
+
+@pytest.mark.parametrize("dependencies, message", [
+    ({"a": ["missing"]}, "unknown stage"),
+    ({"a": ["b"], "b": ["a"], "c": []}, "cycle between stages: a, b"),
+    ({"a": ["a"]}, "cycle"),
+])
+def test_topological_order_rejects_invalid_graphs(dependencies, message):
+    with pytest.raises(ValueError, match=message):
+        topological_order(dependencies)
+
+
+def test_create_enqueues_root_stages(pipeline, redis_client):
+    assert statuses(redis_client) == {
+        "prep": StageStatus.PENDING,
+        "train": StageStatus.WAITING,
+        "eval": StageStatus.WAITING,
+        "report": StageStatus.WAITING,
+    }
+    prep = load_stages(redis_client, "p1")["prep"]
+    assert queued_tasks(redis_client) == [prep["task_id"]]
+    assert redis_client.get(f"task:{prep['task_id']}:status") == TaskStatus.PENDING
+
+
+def test_successful_run_removes_workspace(pipeline, redis_client):
+    start_stage(redis_client, "p1", "prep", "node-a")
+    assert finish_stage(redis_client, "p1", "prep", True, "node-a") == TaskStatus.RUNNING
+    assert statuses(redis_client)["train"] == StageStatus.PENDING
+    assert statuses(redis_client)["eval"] == StageStatus.PENDING
+
+    finish_stage(redis_client, "p1", "train", True, "node-a")
+    assert statuses(redis_client)["report"] == StageStatus.WAITING
+    finish_stage(redis_client, "p1", "eval", True, "node-b")
+    assert statuses(redis_client)["report"] == StageStatus.PENDING
+
+    assert finish_stage(redis_client, "p1", "report", True, "node-a") == TaskStatus.SUCCEEDED
+    assert redis_client.hget(pipeline_key("p1"), "status") == TaskStatus.SUCCEEDED
+    assert not pipeline.exists()
+    assert len(queued_tasks(redis_client)) == 4
+
+
+def test_failure_blocks_downstream_and_retry_resumes(pipeline, redis_client):
+    finish_stage(redis_client, "p1", "prep", True, "node-a")
+    finish_stage(redis_client, "p1", "train", False, "node-a")
+    assert finish_stage(redis_client, "p1", "eval", True, "node-a") == TaskStatus.FAILED
+    assert statuses(redis_client)["report"] == StageStatus.BLOCKED
+    assert pipeline.exists()
+
+    assert retry_pipeline(redis_client, "p1") == TaskStatus.RUNNING
+    stages = load_stages(redis_client, "p1")
+    assert stages["train"]["status"] == StageStatus.PENDING
+    assert stages["train"]["attempts"] == 2
+    assert stages["eval"]["status"] == StageStatus.SUCCEEDED
+    assert stages["report"]["status"] == StageStatus.WAITING
+
+
+def test_retry_refuses_while_stages_run(pipeline, redis_client):
+    # The job of the pending root stage is still queued
+    with pytest.raises(ValueError):
+        retry_pipeline(redis_client, "p1")
+
+
+def test_retry_fails_stages_whose_job_vanished(pipeline, redis_client):
+    prep = load_stages(redis_client, "p1")["prep"]
+    redis_client.delete(f"rq:job:{prep['task_id']}")
+
+    assert retry_pipeline(redis_client, "p1") == TaskStatus.RUNNING
+    stages = load_stages(redis_client, "p1")
+    assert stages["prep"]["status"] == StageStatus.PENDING
+    assert stages["prep"]["task_id"] != prep["task_id"]
+
+
+def test_advance_is_idempotent(pipeline, redis_client):
+    with pipeline_lock(redis_client, "p1"):
+        advance_pipeline(redis_client, "p1")
+    assert len(queued_tasks(redis_client)) == 1
+    assert json.loads(redis_client.hget(pipeline_key("p1"), "order"))[0] == "prep"
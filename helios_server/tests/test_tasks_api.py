@@ -0,0 +1,39 @@
+"""Tests for the task submission endpoint."""
+
+import io
+import json
+import zipfile
+from pathlib import Path
+
+
+def submit(client, **metadata):
+    """Submit a one-file project with the given metadata overrides."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("main.py", "print('hi')\n")
+    return client.post(
+        "/api/v1/tasks/submit",
+        files={"file": ("p.zip", buffer.getvalue(), "application/zip")},
+        data={"metadata": json.dumps({"entrypoint": "main.py", "name": "t", **metadata})}
+    )
+
+
+def test_submit_enqueues_task(client, redis_client):
+    response = submit(client)
+    assert response.status_code == 200
+    task_id = response.json()["task_id"]
+    assert redis_client.get(f"task:{task_id}:status") == "pending"
+
+
+def test_unknown_dataset_is_400(client, settings):
+    response = submit(client, datasets=["nope"])
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Unknown dataset: nope"
+    assert list(Path(settings.task_storage_path).iterdir()) == []
+
+
+def test_disabled_subprocess_executor_is_400(client, settings, monkeypatch):
+    monkeypatch.setattr(settings, "allow_subprocess_executor", False)
+    response = submit(client, executor="subprocess")
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Subprocess executor is disabled"
@@ -0,0 +1,142 @@
+"""Tests for resource telemetry sampling and streaming."""
+
+import json
+import time
+
+import pytest
+
+from app.worker.telemetry import DownsampledSeries, ResourceSampler, parse_docker_stats
+
+
+class Publisher:
+    """Records messages published to Redis channels."""
+
+    def __init__(self):
+        self.messages = []
+
+    def publish(self, channel, message):
+        self.messages.append((channel, json.loads(message)))
+
+
+def burn(seconds):
+    """Keep the CPU busy for ``seconds`` of thread time."""
+    end = time.thread_time() + seconds
+    while time.thread_time() < end:
+        pass
+
+
+def test_series_halves_resolution_when_full():
+    series = DownsampledSeries(max_points=4)
+    for value in range(1, 10):
+        series.add({"v": float(value)})
+
+    assert series.bucket == 4
+    assert [point["v"] for point in series.to_list()] == [2.5, 6.5, 9.0]
+
+
+def test_series_stays_bounded():
+    series = DownsampledSeries(max_points=8)
+    for value in range(10000):
+        series.add({"v": float(value)})
+    assert len(series.points) < 8
+    assert series.to_list()[0]["v"] == pytest.approx((series.bucket - 1) / 2)
+
+
+def run_sampler(samples, interval=0.0):
+    """Run a sampler over ``samples`` to completion."""
+    publisher = Publisher()
+    sampler = ResourceSampler(iter(samples), "t1", publisher, interval, max_points=16)
+    sampler.start()
+    sampler.join(10)
+    return sampler, publisher
+
+
+def test_sampler_publishes_and_records_samples():
+    sampler, publisher = run_sampler([None, {"cpu_percent": 50.0}, {"cpu_percent": 100.0}])
+
+    assert [message["cpu_percent"] for _, message in publisher.messages] == [50.0, 100.0]
+    assert all(channel == "stats:t1" for channel, _ in publisher.messages)
+    summary = sampler.summary()
+    assert summary["samples"] == 2
+    assert [point["cpu_percent"] for point in summary["points"]] == [50.0, 100.0]
+
+
+def test_sampler_throttles_to_interval():
+    sampler, publisher = run_sampler([{"cpu_percent": float(i)} for i in range(5)], interval=3600)
+    assert [message["cpu_percent"] for _, message in publisher.messages] == [0.0]
+    assert sampler.samples == 1
+
+
+def test_overhead_includes_reading_samples():
+    def stats():
+        for _ in range(5):
+            burn(0.02)  # e.g. decoding a Docker stats document
+            yield {"cpu_percent": 1.0}
+
+    sampler, _ = run_sampler(stats(), interval=3600)
+    # Skipped samples were still read and decoded
+    assert sampler.busy_seconds >= 0.09
+    assert sampler.summary()["overhead_ratio"] > 0
+
+
+def test_overhead_excludes_waiting_for_samples():
+    def stats():
+        for _ in range(3):
+            time.sleep(0.05)
+            yield {"cpu_percent": 1.0}
+
+    sampler, _ = run_sampler(stats())
+    assert sampler.busy_seconds < 0.05
+
+
+def test_docker_stats_first_document_is_skipped():
+    assert parse_docker_stats({"cpu_stats": {}, "precpu_stats": {}}) is None
+
+
+def test_docker_stats_sample():
+    sample = parse_docker_stats({
+        "cpu_stats": {"cpu_usage": {"total_usage": 300}, "system_cpu_usage": 2000, "online_cpus": 2,
+                      "throttling_data": {"throttled_periods": 4, "throttled_time": 500}},
+        "precpu_stats": {"cpu_usage": {"total_usage": 100}, "system_cpu_usage": 1000},
+        "memory_stats": {"usage": 1000, "limit": 4096, "stats": {"inactive_file": 200}},
+        "blkio_stats": {"io_service_bytes_recursive": [
+            {"op": "Read", "value": 10}, {"op": "write", "value": 5}, {"op": "read", "value": 1},
+        ]},
+    })
+    assert sample == {
+        "cpu_percent": 40.0,
+        "mem_bytes": 800.0,
+        "mem_limit_bytes": 4096.0,
+        "io_read_bytes": 11.0,
+        "io_write_bytes": 5.0,
+        "throttled_periods": 4.0,
+        "throttled_time_ns": 500.0,
+    }
+
+
+def test_stats_websocket_relays_samples(settings, monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.websocket import manager
+
+    server = fakeredis.FakeServer()
+    publisher = fakeredis.FakeRedis(server=server, decode_responses=True)
+    monkeypatch.setattr(
+        manager, "get_async_redis_client",
+        lambda: fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    )
+
+    with TestClient(app).websocket_connect("/ws/stats/t1") as websocket:
+        deadline = time.monotonic() + 5
+        while not publisher.pubsub_numsub("stats:t1")[0][1]:
+            assert time.monotonic() < deadline, "stats channel never subscribed"
+            time.sleep(0.01)
+        publisher.publish("stats:t1", json.dumps({"cpu_percent": 12.5}))
+        assert json.loads(websocket.receive_text()) == {"cpu_percent": 12.5}
+
+    deadline = time.monotonic() + 5
+    while "t1" in manager.stats_manager.active_connections:
+        assert time.monotonic() < deadline, "closed socket still registered"
+        time.sleep(0.01)
@@ -0,0 +1,195 @@
+"""Tests for the chunked upload endpoints."""
+
+import hashlib
+import io
+import uuid
+import zipfile
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.uploads import upload_dir
+
+
+def test_abort_rejects_ids_outside_staging(client, settings):
+    task_dir = Path(settings.task_storage_path) / "some-task"
+    task_dir.mkdir()
+
+    for upload_id in ("..", "%2e%2e", "not-a-uuid"):
+        assert client.delete(f"/api/v1/uploads/{upload_id}").status_code == 404
+    assert task_dir.exists()
+
+
+def test_abort_unknown_session_is_404(client):
+    assert client.delete(f"/api/v1/uploads/{uuid.uuid4()}").status_code == 404
+
+
+def test_abort_removes_staging(client, settings, redis_client):
+    response = client.post("/api/v1/uploads", json={"filename": "p.zip", "total_size": 10})
+    upload_id = response.json()["upload_id"]
+    staging = Path(settings.task_storage_path) / ".uploads" / upload_id
+    assert staging.exists()
+
+    assert client.delete(f"/api/v1/uploads/{upload_id}").status_code == 200
+    assert not staging.exists()
+    assert not redis_client.exists(f"upload:{upload_id}")
+
+
+def test_chunk_for_invalid_id_is_404(client):
+    response = client.put("/api/v1/uploads/../chunks/0", content=b"x", headers={"X-Chunk-SHA256": "0"})
+    assert response.status_code == 404
+
+
+def test_upload_dir_only_accepts_uuids(settings):
+    for upload_id in ("..", "../..", "", "a/b"):
+        with pytest.raises(HTTPException):
+            upload_dir(upload_id)
+    upload_id = str(uuid.uuid4())
+    assert upload_dir(upload_id) == Path(settings.task_storage_path) / ".uploads" / upload_id
+
+
+def project_zip():
+    """Bytes of a small project bundle with ``main.py``."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        zf.writestr("main.py", "print('hi')\n" * 50)
+    return buffer.getvalue()
+
+
+def upload(client, data, chunk_size=100):
+    """Upload ``data`` in chunks and return the upload ID."""
+    response = client.post(
+        "/api/v1/uploads", json={"filename": "p.zip", "total_size": len(data), "chunk_size": chunk_size}
+    )
+    upload_id = response.json()["upload_id"]
+    for index in range(response.json()["total_chunks"]):
+        piece = data[index * chunk_size:(index + 1) * chunk_size]
+        response = client.put(
+            f"/api/v1/uploads/{upload_id}/chunks/{index}",
+            content=piece,
+            headers={"X-Chunk-SHA256": hashlib.sha256(piece).hexdigest()}
+        )
+        assert response.status_code == 200
+    return upload_id
+
+
+def test_chunks_reassemble_into_task(client, settings, monkeypatch):
+    from app.api import uploads
+
+    monkeypatch.setattr(uploads, "WRITE_BATCH_BYTES", 7)
+    monkeypatch.setattr(uploads, "extract_and_enqueue", lambda *args: None)
+    data = project_zip()
+    upload_id = upload(client, data)
+
+    metadata = {"metadata": {"entrypoint": "main.py", "name": "t"}}
+    response = client.post(f"/api/v1/uploads/{upload_id}/complete", json=metadata)
+    assert response.status_code == 200
+    task_dir = Path(settings.task_storage_path) / response.json()["task_id"]
+    assert (task_dir / "project.zip").read_bytes() == data
+
+    # A second completion of the same upload loses the claim cleanly
+    response = client.post(f"/api/v1/uploads/{upload_id}/complete", json=metadata)
+    assert response.status_code in (404, 409)
+
+
+@pytest.mark.parametrize("metadata, detail", [
+    ({"entrypoint": "main.py", "name": "t", "datasets": ["nope"]}, "Unknown dataset: nope"),
+    ({"entrypoint": "missing.py", "name": "t"}, "Entrypoint not found"),
+    ({"entrypoint": "main.py", "name": "t", "executor": "subprocess"}, "Subprocess executor is disabled"),
+])
+def test_invalid_completion_keeps_upload(client, settings, metadata, detail):
+    upload_id = upload(client, project_zip())
+
+    response = client.post(f"/api/v1/uploads/{upload_id}/complete", json={"metadata": metadata})
+    assert response.status_code == 400
+    assert detail in response.json()["detail"]
+    assert client.get(f"/api/v1/uploads/{upload_id}").status_code == 200
+    assert [path.name for path in Path(settings.task_storage_path).iterdir()] == [".uploads"]
+
+    response = client.post(f"/api/v1/uploads/{upload_id}/complete", json={"metadata": {"entrypoint": "main.py", "name": "t"}})
+    assert response.status_code == 200
+
+
+def test_concurrent_completions_move_once(settings, redis_client, tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+
+    from app.api.uploads import take_assembled_bundle
+
+    upload_id = str(uuid.uuid4())
+    staging = upload_dir(upload_id)
+    staging.mkdir(parents=True)
+    (staging / "bundle.part").write_bytes(b"zip")
+    redis_client.hset(f"upload:{upload_id}", mapping={"total_size": 3, "chunk_size": 3, "total_chunks": 1})
+    redis_client.sadd(f"upload:{upload_id}:chunks", 0)
+
+    def complete(n):
+        try:
+            take_assembled_bundle(upload_id, redis_client, tmp_path / f"dest{n}" / "project.zip")
+            return 200
+        except HTTPException as e:
+            return e.status_code
+
+    with ThreadPoolExecutor(4) as pool:
+        codes = sorted(pool.map(complete, range(4)))
+    assert codes[0] == 200 and all(code in (404, 409) for code in codes[1:])
+    assert len(list(tmp_path.glob("dest*"))) == 1
+
+
+def test_invalid_pipeline_keeps_upload(client):
+    upload_id = upload(client, project_zip())
+    metadata = {"name": "p", "stages": [{"name": "a", "entrypoint": "main.py", "datasets": ["nope"]}]}
+
+    response = client.post(f"/api/v1/pipelines/from-upload/{upload_id}", json={"metadata": metadata})
+    assert response.status_code == 400
+    assert client.get(f"/api/v1/uploads/{upload_id}").status_code == 200
+
+
+def stage(upload_id, age):
+    """Staging directory with a bundle last written ``age`` seconds ago."""
+    import os
+    import time
+
+    staging = upload_dir(upload_id)
+    staging.mkdir(parents=True)
+    (staging / "bundle.part").write_bytes(b"zip")
+    for path in (staging / "bundle.part", staging):
+        os.utime(path, (time.time() - age, time.time() - age))
+    return staging
+
+
+def test_cleanup_removes_only_expired_uploads(settings, redis_client):
+    from app.api.uploads import cleanup_stale_uploads
+
+    ttl = settings.upload_session_ttl
+    expired = stage(str(uuid.uuid4()), ttl + 10)
+    recent = stage(str(uuid.uuid4()), 10)
+    live = stage(str(uuid.uuid4()), ttl + 10)
+    redis_client.hset(f"upload:{live.name}", "total_size", 3)
+
+    assert cleanup_stale_uploads(redis_client) == 1
+    assert not expired.exists()
+    assert recent.exists() and live.exists()
+
+
+def test_sweep_repeats_until_cancelled(settings, redis_client, monkeypatch):
+    import asyncio
+
+    from app.api import uploads
+
+    calls = []
+    monkeypatch.setattr(uploads, "cleanup_stale_uploads", lambda client: calls.append(client) or 0)
+
+    async def sweep_briefly():
+        sweeper = asyncio.create_task(uploads.sweep_stale_uploads(redis_client, 0.01))
+        while len(calls) < 3:
+            await asyncio.sleep(0.01)
+        sweeper.cancel()
+
+    asyncio.run(asyncio.wait_for(sweep_briefly(), 5))
+    assert calls[0] is redis_client
+
+    # Without an interval it sweeps once and returns
+    calls.clear()
+    asyncio.run(uploads.sweep_stale_uploads(redis_client, 0))
+    assert len(calls) == 1
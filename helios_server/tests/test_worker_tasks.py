@@ -0,0 +1,100 @@
+"""Tests for the worker's task function."""
+
+import pytest
+
+from app.core.constants import TaskStatus
+from app.worker import tasks
+from app.worker.executors import Executor, TaskProcess
+
+
+class FakeProcess(TaskProcess):
+    """Task that prints fixed lines and exits."""
+
+    def __init__(self, lines, exit_code=0):
+        self.lines = lines
+        self.exit_code = exit_code
+        self.cleaned_up = False
+
+    def output(self):
+        return iter(self.lines)
+
+    def wait(self):
+        return self.exit_code
+
+    def stats(self):
+        return iter([])
+
+    def cleanup(self):
+        self.cleaned_up = True
+
+
+class FakeExecutor(Executor):
+    """Executor handing out a prepared ``FakeProcess``."""
+
+    def __init__(self, process):
+        super().__init__()
+        self.process = process
+
+    def start(self, spec):
+        return self.process
+
+
+class FakeCache:
+    """Dataset cache whose release always fails."""
+
+    def release(self, key, owner):
+        raise OSError("lock unavailable")
+
+
+@pytest.fixture
+def worker(settings, redis_client, monkeypatch):
+    """Run ``run_task`` against the in-memory Redis, without telemetry."""
+    monkeypatch.setattr(tasks.redis, "Redis", lambda **kwargs: redis_client)
+    monkeypatch.setattr(redis_client, "close", lambda: None)
+    monkeypatch.setattr(settings, "telemetry_interval", 0)
+    return redis_client
+
+
+def task_info(tmp_path, **extra):
+    """Task info for a project directory under ``tmp_path``."""
+    task_path = tmp_path / "task"
+    task_path.mkdir()
+    return {"task_id": "t1", "task_path": str(task_path), "entrypoint": "main.py", "resources": {}, **extra}
+
+
+def test_successful_task_archives_output(worker, tmp_path, monkeypatch):
+    process = FakeProcess([b"hello\n", b"@@helios {\"type\": \"progress\", \"current\": 1}\n"])
+    monkeypatch.setattr(tasks, "get_executor", lambda name, redis_client: FakeExecutor(process))
+
+    info = task_info(tmp_path)
+    tasks.run_task(info)
+
+    assert worker.get("task:t1:status") == TaskStatus.SUCCEEDED
+    assert worker.get("task:t1:metrics") is not None
+    assert process.cleaned_up
+    assert not (tmp_path / "task").exists()
+
+
+def test_archive_failure_marks_task_failed(worker, tmp_path, monkeypatch):
+    def broken_archive(*args):
+        raise OSError("read-only file system")
+
+    monkeypatch.setattr(tasks, "LogArchiveWriter", broken_archive)
+    tasks.run_task(task_info(tmp_path))
+
+    assert worker.get("task:t1:status") == TaskStatus.FAILED
+
+
+def test_failing_dataset_release_still_finishes_stage(worker, tmp_path, monkeypatch):
+    finished = []
+    process = FakeProcess([b"done\n"])
+    monkeypatch.setattr(tasks, "get_executor", lambda name, redis_client: FakeExecutor(process))
+    monkeypatch.setattr(tasks, "get_dataset_cache", lambda redis_client: FakeCache())
+    monkeypatch.setattr(tasks, "acquire_dataset", lambda *args: tmp_path)
+    monkeypatch.setattr(tasks, "start_stage", lambda *args: None)
+    monkeypatch.setattr(tasks, "finish_stage", lambda *args: finished.append(args))
+
+    tasks.run_task(task_info(tmp_path, datasets={"mnist": "v1"}, pipeline_id="p1", stage="train"))
+
+    assert worker.get("task:t1:status") == TaskStatus.SUCCEEDED
+    assert len(finished) == 1 and finished[0][3] is True
@@ -14,6 +14,8 @@ from redis import Redis
 
 from app.core.config import get_settings
 from app.core.constants import QueueNames
+from app.worker.datasets import get_dataset_cache, register_cached_datasets
+from app.worker.executors import register_cached_environments
 
 
 def main():
@@ -37,9 +39,15 @@ def main():
         password=settings.redis_password
     )
     
+    # Advertise datasets and environments already cached on this node for locality-aware placement
+    register_cached_datasets(get_dataset_cache(redis_conn), redis_conn)
+    register_cached_environments(redis_conn)
+    
+    queues = QueueNames.for_worker(settings.worker_node)
+    
     # Create worker with queues
-    worker = Worker([QueueNames.HIGH, QueueNames.DEFAULT], connection=redis_conn)
-    logger.info(f"Worker started, listening to queues: {QueueNames.HIGH}, {QueueNames.DEFAULT}")
+    worker = Worker(queues, connection=redis_conn)
+    logger.info(f"Worker started on node {settings.worker_node}, listening to queues: {', '.join(queues)}")
     worker.work()
 
 